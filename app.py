@@ -1,7 +1,30 @@
+import time
+
+STARTUP_START = time.perf_counter()
+
+import sys
 import tkinter as tk
 from pages.main_page import MainPage
 
+# Modules that must not be imported before the upload screen is shown
+HEAVY_MODULES = ['pandas', 'numpy', 'sklearn', 'mlxtend', 'matplotlib', 'pyarrow']
+
+
+def report_startup(root, exit_after):
+    elapsed_ms = (time.perf_counter() - STARTUP_START) * 1000
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+    print(f"Startup time: {elapsed_ms:.0f} ms; heavy modules loaded: {', '.join(loaded) or 'none'}")
+    if exit_after:
+        root.destroy()
+
+
 if __name__ == '__main__':
     root = tk.Tk()
-    app = MainPage(root)
+    app = MainPage(root, persist_results='--persist-results' in sys.argv)
+
+    # `python app.py --measure-startup` prints the time to the first idle upload screen and exits
+    measure_startup = '--measure-startup' in sys.argv
+    if measure_startup:
+        root.after_idle(report_startup, root, True)
+
     root.mainloop()
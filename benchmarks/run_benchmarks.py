@@ -0,0 +1,149 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.synthetic import write_fisheries_csv
+from utils.perf import peak_rss, watch_rss
+
+# Times every stage of each tab's pipeline on synthetic fisheries tables and
+# writes the results as JSON so runs can be compared across commits.
+#
+# Usage: python benchmarks/run_benchmarks.py --sizes 1e3 1e4 1e5 --years 4 --output bench.json
+
+PIPELINES = ['classification', 'regression', 'clustering', 'association']
+
+
+class StageTimer:
+    def __init__(self, rows, years):
+        self.rows = rows
+        self.years = years
+        self.pipeline = None
+        self.records = []
+
+    @contextmanager
+    def stage(self, name):
+        # Peak memory comes from sampling the RSS, so timings run without allocation tracing
+        watch = watch_rss()
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start
+            cpu = time.process_time() - cpu_start
+            peak = peak_rss(watch)
+            self.records.append({
+                'rows': self.rows,
+                'years': self.years,
+                'pipeline': self.pipeline,
+                'stage': name,
+                'wall_s': round(wall, 6),
+                'cpu_s': round(cpu, 6),
+                'peak_mb': round(max(peak, 0) / 1024 ** 2, 3),
+            })
+            print(f"  {self.pipeline:<15} {name:<10} {wall:9.3f} s  {peak / 1024 ** 2:9.1f} MB", flush=True)
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT, text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_plot(draw, result):
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(6, 4))
+    draw(fig.add_subplot(), result)
+    fig.savefig(os.devnull, format='png')
+
+
+def run_size(rows, years, pipelines, workdir):
+    from utils.loader import load_dataset
+    from utils.feature_store import FeatureStore
+    from utils import pipelines as pl, plots
+
+    year_list = list(range(2025 - years, 2025))
+    csv_path = os.path.join(workdir, f"synthetic_{rows}.csv")
+    write_fisheries_csv(csv_path, rows, years=year_list)
+
+    timer = StageTimer(rows, years)
+    annual = [f"{year} Annual" for year in year_list]
+    target = annual[-1]
+    history = annual[:-1]
+
+    timer.pipeline = 'dataset'
+    with timer.stage("load"):
+        df = load_dataset(csv_path)
+    with timer.stage("encode"):
+        store = FeatureStore(df)
+
+    if 'classification' in pipelines:
+        timer.pipeline = 'classification'
+        result = pl.run_classification(store, ['Geolocation', 'Species'] + history, target, stages=timer)
+        with timer.stage("plot"):
+            save_plot(plots.plot_feature_importances, result)
+
+    if 'regression' in pipelines:
+        timer.pipeline = 'regression'
+        result = pl.run_regression(store, history, target, stages=timer)
+        with timer.stage("plot"):
+            save_plot(plots.plot_regression, result)
+
+    if 'clustering' in pipelines:
+        timer.pipeline = 'clustering'
+        result = pl.run_clustering(store, annual[-2:], 3, stages=timer)
+        with timer.stage("plot"):
+            save_plot(plots.plot_clusters, result)
+
+    if 'association' in pipelines:
+        timer.pipeline = 'association'
+        with timer.stage("preprocess"):
+            transactions = pl.build_transactions(store.df)
+        items = [col for col in transactions.columns if col.endswith('_High') or col.endswith('_Low')]
+        pl.run_association(transactions, items, 0.1, stages=timer)
+
+    os.remove(csv_path)
+    return timer.records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dashboard pipelines on synthetic fisheries data.")
+    parser.add_argument('--sizes', nargs='+', type=float, default=[1e3, 1e4], help="row counts, e.g. 1e3 1e5 1e7")
+    parser.add_argument('--years', type=int, default=4, help="number of years of quarterly columns")
+    parser.add_argument('--pipelines', nargs='+', choices=PIPELINES, default=PIPELINES)
+    parser.add_argument('--output', default="benchmark_results.json")
+    args = parser.parse_args(argv)
+
+    records = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes:
+            rows = int(size)
+            print(f"{rows:,} rows × {args.years} years", flush=True)
+            records += run_size(rows, args.years, args.pipelines, workdir)
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': records,
+    }
+    with open(args.output, 'w') as handle:
+        json.dump(report, handle, indent=2)
+    print(f"Wrote {len(records)} measurements to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+import math
+import numpy as np
+import pandas as pd
+
+# Synthetic tables shaped like data/fisheries-raw-dataset.csv: one row per
+# Geolocation × Species pair, with "YYYY Quarter N" and "YYYY Annual" columns.
+
+MISSING_SHARE = 0.02
+
+
+def quarter_columns(years):
+    columns = []
+    for year in years:
+        columns += [f"{year} Quarter {q}" for q in range(1, 5)]
+        columns.append(f"{year} Annual")
+    return columns
+
+
+def make_fisheries_frame(n_rows, years=range(2021, 2025), seed=42):
+    rng = np.random.default_rng(seed)
+    years = list(years)
+
+    # Species grow with the table so wide extracts also get more distinct items
+    n_species = int(min(n_rows, max(30, math.sqrt(n_rows))))
+    n_regions = math.ceil(n_rows / n_species)
+
+    row_ids = np.arange(n_rows)
+    data = {
+        'Geolocation': pd.Categorical.from_codes(
+            row_ids // n_species, [f"Region {i:05d}" for i in range(n_regions)]
+        ),
+        'Species': pd.Categorical.from_codes(
+            row_ids % n_species, [f"Species {i:05d} (Sp{i})" for i in range(n_species)]
+        ),
+    }
+
+    # Log-normal base production with seasonality and a mild yearly trend
+    base = rng.lognormal(mean=7.5, sigma=1.6, size=n_rows)
+    seasonality = np.array([0.9, 1.25, 1.05, 0.8])
+    for y, year in enumerate(years):
+        growth = (1 + rng.normal(0.01, 0.05, size=n_rows)) ** y
+        annual = np.zeros(n_rows)
+        for q in range(4):
+            noise = rng.lognormal(mean=0.0, sigma=0.25, size=n_rows)
+            values = np.round(base * growth * seasonality[q] * noise / 4, 2)
+            annual += values
+            data[f"{year} Quarter {q + 1}"] = values
+        data[f"{year} Annual"] = np.round(annual, 2)
+
+    # Only quarterly cells go missing; annual totals stay complete like the source tables
+    df = pd.DataFrame(data)
+    for col in quarter_columns(years):
+        if 'Quarter' not in col:
+            continue
+        mask = rng.random(n_rows) < MISSING_SHARE
+        df.loc[mask, col] = np.nan
+    return df
+
+
+def write_fisheries_csv(path, n_rows, years=range(2021, 2025), seed=42):
+    df = make_fisheries_frame(n_rows, years=years, seed=seed)
+    df.to_csv(path, index=False)
+    return df.shape
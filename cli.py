@@ -0,0 +1,230 @@
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Headless runner for the dashboard pipelines. A job spec lists the runs to
+# perform on every dataset, for example:
+#
+#   {"jobs": [
+#       {"name": "cls", "type": "classification", "features": ["Species", "2023 Annual"], "target": "2024 Annual"},
+#       {"type": "classification", "features": ["2023 Annual"], "target": "2024 Annual", "cv_folds": 5},
+#       {"type": "regression", "features": ["2022 Annual", "2023 Annual"], "target": "2024 Annual"},
+#       {"type": "regression", "features": ["2023 Annual"], "target": "2024 Annual", "streaming": true},
+#       {"type": "clustering", "features": ["2023 Annual", "2024 Annual"], "k": 3},
+#       {"type": "association", "items": ["2023_Annual_High", "2024_Annual_High"], "min_support": 0.3}
+#   ]}
+#
+# Usage: python cli.py SPEC DATASET [DATASET ...] --output DIR [--workers N]
+
+JOB_TYPES = ['classification', 'regression', 'clustering', 'association']
+
+
+def load_spec(path):
+    with open(path) as handle:
+        if os.path.splitext(path)[-1].lower() in ['.yml', '.yaml']:
+            try:
+                import yaml
+            except ImportError:
+                raise SystemExit("PyYAML is required for YAML job specs; use JSON instead.")
+            spec = yaml.safe_load(handle)
+        else:
+            spec = json.load(handle)
+
+    jobs = spec.get('jobs', []) if isinstance(spec, dict) else spec
+    for i, job in enumerate(jobs):
+        if job.get('type') not in JOB_TYPES:
+            raise SystemExit(f"Job {i}: type must be one of {', '.join(JOB_TYPES)}.")
+        job.setdefault('name', f"{i:02d}_{job['type']}")
+    return jobs
+
+
+def save_figure(draw, result, path, figsize):
+    from matplotlib.figure import Figure
+
+    # A bare Figure renders with Agg and is never registered with pyplot
+    fig = Figure(figsize=figsize)
+    draw(fig.add_subplot(), result)
+    fig.tight_layout()
+    fig.savefig(path)
+
+
+def dataset_store(state):
+    from utils.loader import load_dataset
+    from utils.feature_store import FeatureStore
+
+    # Loaded on first use, so a spec of streaming jobs never holds the whole table
+    if 'store' not in state:
+        state['store'] = FeatureStore(load_dataset(state['path']), source=state['path'])
+    return state['store']
+
+
+def job_key(job, state):
+    from utils.dataset_cache import content_hash
+    from utils.result_cache import result_key
+
+    # Keyed on the file's content, so streaming jobs never need the table loaded
+    if 'hash' not in state:
+        state['hash'] = content_hash(state['path'])
+    params = {name: value for name, value in job.items() if name not in ['name', 'type', 'features', 'target']}
+    return result_key(state['hash'], job['type'], job.get('features') or job.get('items') or [], job.get('target'), **params)
+
+
+def compute_job(job, state, results=None):
+    # Returns (result, cached); with a ResultCache, a repeated job is served from it
+    if results is None:
+        return pipeline_result(job, state), False
+    return results.get_or_compute(job_key(job, state), lambda: pipeline_result(job, state))
+
+
+def pipeline_result(job, state):
+    from utils import pipelines
+
+    if job['type'] == 'regression' and job.get('streaming'):
+        from utils.streaming import run_streaming_regression
+
+        return run_streaming_regression(state['path'], job['features'], job['target'])
+
+    store = dataset_store(state)
+
+    if job['type'] == 'classification' and job.get('cv_folds'):
+        return pipelines.run_classification_cv(store, job['features'], job['target'], int(job['cv_folds']))
+    if job['type'] == 'classification':
+        return pipelines.run_classification(store, job['features'], job['target'])
+    if job['type'] == 'regression':
+        return pipelines.run_regression(store, job['features'], job['target'])
+    if job['type'] == 'clustering':
+        return pipelines.run_clustering(store, job['features'], int(job['k']))
+
+    # Association: the transaction matrix is built once per dataset and shared by its jobs
+    if 'transactions' not in state:
+        state['transactions'] = pipelines.build_transactions(store.df)
+    transactions = state['transactions']
+    items = job.get('items') or list(transactions.columns)
+    return pipelines.run_association(transactions, items, float(job.get('min_support', 0.3)))
+
+
+def save_outputs(job, result, out_prefix):
+    from utils import plots
+
+    if job['type'] == 'association':
+        rules_out = result['rules'].copy()
+        for col in ['antecedents', 'consequents']:
+            rules_out[col] = rules_out[col].map(lambda itemset: ', '.join(sorted(itemset)))
+        rules_out.to_csv(out_prefix + "_rules.csv", index=False)
+    elif job['type'] == 'classification':
+        save_figure(plots.plot_feature_importances, result, out_prefix + ".png", (8, 6))
+    elif job['type'] == 'regression':
+        save_figure(plots.plot_regression, result, out_prefix + ".png", (6, 4))
+    else:
+        save_figure(plots.plot_clusters, result, out_prefix + ".png", (6, 4))
+
+
+def job_metrics(job, result):
+    # The JSON-ready part of a pipeline result
+    if job['type'] == 'regression' and job.get('streaming'):
+        return {name: result[name] for name in ['mse', 'r2', 'mae', 'rmse', 'corr_coeff', 'rae', 'rrse', 'n',
+                                                'n_train', 'rows_skipped']}
+
+    if job['type'] == 'classification' and job.get('cv_folds'):
+        return {name: result[name] for name in ['n_folds', 'accuracy', 'accuracy_std', 'kappa', 'kappa_std',
+                                                'fold_accuracies', 'report']}
+
+    if job['type'] == 'classification':
+        return {
+            'accuracy': result['accuracy'],
+            'report': result['report'],
+            **result['metrics'],
+        }
+
+    if job['type'] == 'regression':
+        return {name: result[name] for name in ['mse', 'r2', 'mae', 'rmse', 'corr_coeff', 'rae', 'rrse', 'n']}
+
+    if job['type'] == 'clustering':
+        return {
+            'mode': result['mode'],
+            'silhouette': result['silhouette'],
+            'silhouette_sample': result['silhouette_sample'],
+            'inertia': result['inertia'],
+            'n_iter': result['n_iter'],
+            'cluster_sizes': result['cluster_sizes'],
+            'centroids': result['centroids'].tolist(),
+        }
+
+    return {
+        'rules': len(result['rules']),
+        'itemsets': result['n_itemsets'],
+        'truncated': result['truncated'],
+        'min_support': float(job.get('min_support', 0.3)),
+    }
+
+
+def run_job(job, out_prefix, state):
+    result, _ = compute_job(job, state)
+    save_outputs(job, result, out_prefix)
+    return job_metrics(job, result)
+
+
+def to_json(value):
+    # numpy scalars and arrays in metrics
+    return value.tolist() if hasattr(value, 'tolist') else str(value)
+
+
+def run_dataset(path, jobs, output_dir):
+    name = os.path.splitext(os.path.basename(path))[0]
+    dataset_dir = os.path.join(output_dir, name)
+    os.makedirs(dataset_dir, exist_ok=True)
+
+    summary = {'dataset': path, 'rows': None, 'jobs': {}}
+    state = {'path': path}
+
+    for job in jobs:
+        out_prefix = os.path.join(dataset_dir, job['name'])
+        try:
+            metrics = run_job(job, out_prefix, state)
+            summary['jobs'][job['name']] = {'status': 'ok', 'type': job['type'], 'metrics': metrics}
+        except Exception as e:
+            summary['jobs'][job['name']] = {'status': 'error', 'type': job['type'], 'error': str(e)}
+
+    if 'store' in state:
+        summary['rows'] = len(state['store'].df)
+    with open(os.path.join(dataset_dir, "summary.json"), 'w') as handle:
+        json.dump(summary, handle, indent=2, default=to_json)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run dashboard pipelines without a display.")
+    parser.add_argument('spec', help="JSON or YAML job spec")
+    parser.add_argument('datasets', nargs='+', help="CSV or Excel files to process")
+    parser.add_argument('--output', default="results", help="directory for metrics, rules and plots")
+    parser.add_argument('--workers', type=int, default=1, help="datasets processed in parallel")
+    args = parser.parse_args(argv)
+
+    jobs = load_spec(args.spec)
+    os.makedirs(args.output, exist_ok=True)
+
+    summaries = []
+    if args.workers > 1 and len(args.datasets) > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = {pool.submit(run_dataset, path, jobs, args.output): path for path in args.datasets}
+            for future in as_completed(futures):
+                summaries.append(report(future.result()))
+    else:
+        for path in args.datasets:
+            summaries.append(report(run_dataset(path, jobs, args.output)))
+
+    failed = sum(job['status'] != 'ok' for summary in summaries for job in summary['jobs'].values())
+    return 1 if failed else 0
+
+
+def report(summary):
+    statuses = ', '.join(f"{name}: {job['status']}" for name, job in summary['jobs'].items())
+    rows = f"{summary['rows']} rows" if summary['rows'] is not None else "streamed"
+    print(f"{summary['dataset']} ({rows}) -> {statuses}")
+    return summary
+
+
+if __name__ == '__main__':
+    sys.exit(main())
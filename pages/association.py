@@ -1,48 +1,77 @@
 import tkinter as tk
-from tkinter import messagebox, ttk
-from mlxtend.frequent_patterns import apriori, association_rules
-import pandas as pd
+from tkinter import messagebox
+from utils.pipelines import (
+    build_transactions, update_transactions, run_association, MIN_CONFIDENCE,
+    LOW_PRODUCTION, HIGH_PRODUCTION
+)
+from utils.association_miner import MAX_ITEMSETS
+from pages.rule_viewer import RuleViewer
+from utils.progressive import preview_note, progressive_association
+from utils.result_cache import result_key
 
 class AssociationTab:
-    def __init__(self, notebook, raw_df):
-        self.original_df = raw_df
+    JOB_KEY = "association"
+
+    def __init__(self, parent, store, jobs, results):
+        self.store = store
+        self.results = results
+        self.original_df = store.df
+        self.jobs = jobs
         self.df = None
-        self.create_tab(notebook)
+        self.thresholds = None
+        self.last_config = None
+        self.last_preview = None
+        self.create_tab(parent)
 
     def preprocess_data(self):
         try:
-            def bucketize(val):
-                if val < 5000:
-                    return 'Low'
-                elif val < 15000:
-                    return 'Med'
-                else:
-                    return 'High'
-
-            species_encoded = pd.get_dummies(
-                self.original_df['Species'].str.replace(r"[^\w]", "_", regex=True),
-                prefix="Species"
-            )
-
-            annual_cols = [col for col in self.original_df.columns if 'Annual' in col]
-            bucketized = self.original_df[annual_cols].applymap(bucketize)
-
-            renamed = bucketized.copy()
-            for col in bucketized.columns:
-                year = col.split()[0]
-                renamed.rename(columns={col: f"{year}_Annual"}, inplace=True)
-
-            annual_encoded = pd.get_dummies(renamed)
+            thresholds = (float(self.low_entry.get()), float(self.high_entry.get()))
+            if not thresholds[0] < thresholds[1]:
+                messagebox.showerror("Error", "The Low threshold must be below the High threshold.")
+                return
 
-            self.df = pd.concat([species_encoded, annual_encoded], axis=1).astype(bool)
+            # Runs on the Tk thread, so it is recorded as a run of its own
+            with self.jobs.perf.run("association-preprocess"), self.jobs.perf.stage("transactions"):
+                self.df = build_transactions(self.original_df, thresholds)
+            self.thresholds = thresholds
             messagebox.showinfo("Success", f"Preprocessing complete. {self.df.shape[1]} features ready.")
-            print(self.df)
         except Exception as e:
             messagebox.showerror("Preprocessing Error", str(e))
 
-    def create_tab(self, notebook):
-        main_frame = tk.Frame(notebook)
-        notebook.add(main_frame, text="Association")
+    def refresh(self, store, delta):
+        # Transactions already built are extended with the delta instead of rebuilt
+        self.store = store
+        self.original_df = store.df
+        if self.df is not None:
+            with self.jobs.perf.run("association-update"), self.jobs.perf.stage("transactions"):
+                self.df = update_transactions(self.df, self.original_df, delta, self.thresholds)
+
+    def recompute(self, store, job):
+        # Worker thread: rebuilds the transactions and repeats the last mining run on a reloaded dataset
+        if self.thresholds is None:
+            return None
+        with job.stage("transactions"):
+            transactions = build_transactions(store.df, self.thresholds)
+        outcome = None
+        if self.last_config is not None:
+            outcome = self.run_cached(job, **self.last_config, store=store, transactions=transactions)
+        return transactions, outcome
+
+    def reload(self, store, recomputed):
+        self.store = store
+        self.original_df = store.df
+        if recomputed is None:
+            # Transactions built from the old table no longer match it
+            self.df = None
+            return
+
+        self.df, outcome = recomputed
+        if outcome is not None and not self.jobs.is_running(self.JOB_KEY):
+            self.show_rules(outcome[0], self.last_config['min_support'], outcome[1])
+
+    def create_tab(self, parent):
+        main_frame = tk.Frame(parent)
+        main_frame.pack(fill="both", expand=True)
 
         canvas = tk.Canvas(main_frame)
         scrollbar = tk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
@@ -58,45 +87,61 @@ class AssociationTab:
         title_label = tk.Label(scroll_frame, text="Association Rule Mining", font=('helvetica', 16, 'bold'))
         title_label.pack(pady=10)
 
+        # Production buckets for the Annual columns: below Low, below High, otherwise High
+        threshold_frame = tk.Frame(scroll_frame)
+        threshold_frame.pack(pady=5)
+
+        tk.Label(threshold_frame, text="Low below:", font=('helvetica', 12)).pack(side="left")
+        self.low_entry = tk.Entry(threshold_frame, font=('helvetica', 12), width=10)
+        self.low_entry.insert(0, str(LOW_PRODUCTION))
+        self.low_entry.pack(side="left", padx=5)
+
+        tk.Label(threshold_frame, text="High from:", font=('helvetica', 12)).pack(side="left")
+        self.high_entry = tk.Entry(threshold_frame, font=('helvetica', 12), width=10)
+        self.high_entry.insert(0, str(HIGH_PRODUCTION))
+        self.high_entry.pack(side="left", padx=5)
+
         preprocess_btn = tk.Button(
             scroll_frame, text="Preprocess Raw Data", bg="green", fg="white",
             font=('helvetica', 12, 'bold'), command=self.preprocess_data
         )
         preprocess_btn.pack(pady=5)
 
-        tk.Label(scroll_frame, text="Select Features (comma-separated):", font=('helvetica', 12)).pack(anchor="w", padx=10)
+        tk.Label(scroll_frame, text="Select Features (comma-separated, blank for all):", font=('helvetica', 12)).pack(anchor="w", padx=10)
         self.features_entry = tk.Entry(scroll_frame, font=('helvetica', 12), width=50)
         self.features_entry.pack(fill="x", padx=10, pady=5)
 
-        tk.Label(scroll_frame, text="Enter Minimum Support (0.1 - 1.0):", font=('helvetica', 12)).pack(anchor="w", padx=10)
+        tk.Label(scroll_frame, text="Enter Minimum Support (0.0 - 1.0):", font=('helvetica', 12)).pack(anchor="w", padx=10)
         self.support_entry = tk.Entry(scroll_frame, font=('helvetica', 12), width=50)
         self.support_entry.insert(0, "0.3")
         self.support_entry.pack(fill="x", padx=10, pady=5)
 
-        generate_button = tk.Button(
-            scroll_frame, text="Generate Rules", bg="purple", fg="white",
+        self.progressive = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            scroll_frame, text="Progressive preview (sample first, refine in the background)",
+            variable=self.progressive, font=('helvetica', 11)
+        ).pack(anchor="w", padx=10)
+
+        button_frame = tk.Frame(scroll_frame)
+        button_frame.pack(pady=10)
+
+        self.generate_button = tk.Button(
+            button_frame, text="Generate Rules", bg="purple", fg="white",
             font=('helvetica', 12, 'bold'), command=self.generate_rules
         )
-        generate_button.pack(pady=10)
+        self.generate_button.pack(side="left", padx=5)
+
+        self.cancel_button = tk.Button(
+            button_frame, text="Cancel", state=tk.DISABLED,
+            font=('helvetica', 12), command=self.cancel_rules
+        )
+        self.cancel_button.pack(side="left", padx=5)
 
         self.results_label = tk.Label(scroll_frame, text="Results will appear below:", font=('helvetica', 12), wraplength=600, justify="left")
         self.results_label.pack(pady=5)
 
-        # Updated Treeview with additional columns
-        self.tree = ttk.Treeview(scroll_frame, columns=('Antecedents', 'Consequents', 'Support', 'Confidence', 'Lift', 'Conviction'), show='headings')
-        self.tree.heading('Antecedents', text='Antecedents')
-        self.tree.heading('Consequents', text='Consequents')
-        self.tree.heading('Support', text='Support')
-        self.tree.heading('Confidence', text='Confidence')
-        self.tree.heading('Lift', text='Lift')
-        self.tree.heading('Conviction', text='Conviction')
-        self.tree.column('Antecedents', width=150)
-        self.tree.column('Consequents', width=150)
-        self.tree.column('Support', width=80)
-        self.tree.column('Confidence', width=90)
-        self.tree.column('Lift', width=70)
-        self.tree.column('Conviction', width=90)
-        self.tree.pack(fill="both", expand=True)
+        # Rule table; only the visible rows are materialized
+        self.viewer = RuleViewer(scroll_frame)
 
         # Summary Label
         self.summary_label = tk.Label(scroll_frame, text="", font=('helvetica', 12, 'italic'), wraplength=600, justify="left")
@@ -106,58 +151,142 @@ class AssociationTab:
         canvas.bind("<Configure>", lambda e: canvas.itemconfig(self.scrollable_window, width=e.width))
 
     def generate_rules(self):
+        if self.jobs.is_running(self.JOB_KEY):
+            return
+
         try:
             if self.df is None:
                 messagebox.showerror("Error", "Please preprocess the data first.")
                 return
 
-            self.results_label.config(text="Generating rules... Please wait.")
-            self.tree.delete(*self.tree.get_children())
-            self.summary_label.config(text="")
-
             raw_input = self.features_entry.get()
-            input_cols = [col.strip() for col in raw_input.split(',')]
-            valid_cols = [col for col in input_cols if col in self.df.columns]
+            if raw_input.strip():
+                input_cols = [col.strip() for col in raw_input.split(',')]
+                valid_cols = [col for col in input_cols if col in self.df.columns]
+            else:
+                valid_cols = list(self.df.columns)
 
             if not valid_cols:
                 messagebox.showerror("Error", "None of the selected features matched available columns. Please check spelling.")
                 return
 
             min_support = float(self.support_entry.get())
-            if not (0.1 <= min_support <= 1.0):
-                messagebox.showerror("Error", "Support must be between 0.1 and 1.0.")
+            if not (0.0 < min_support <= 1.0):
+                messagebox.showerror("Error", "Support must be greater than 0 and at most 1.0.")
                 return
 
-            if len(valid_cols) > 30:
-                messagebox.showwarning("Warning", f"Too many features selected ({len(valid_cols)}). Try selecting fewer.")
-                return
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
 
-            df_subset = self.df[valid_cols].copy()
-            frequent_itemsets = apriori(df_subset, min_support=min_support, use_colnames=True)
-            rules = association_rules(frequent_itemsets, metric="confidence", min_threshold=0.5)
+        self.results_label.config(text="Generating rules... Please wait.")
+        self.viewer.clear()
+        self.summary_label.config(text="")
 
-            if rules.empty:
-                self.results_label.config(text="No rules found with the given support and features.")
-                return
+        self.last_config = {'valid_cols': valid_cols, 'min_support': min_support}
+        self.set_running(True)
+        self.last_preview = None
+        if self.progressive.get():
+            self.jobs.submit(
+                self.JOB_KEY,
+                lambda job: self.run_progressive(job, valid_cols, min_support),
+                on_done=lambda outcome: self.show_rules(outcome[0], min_support, outcome[1]),
+                on_error=self.on_job_error,
+                on_progress=self.on_preview,
+                on_cancel=self.on_preview_stopped
+            )
+            return
+
+        self.jobs.submit(
+            self.JOB_KEY,
+            lambda job: self.run_cached(job, valid_cols, min_support),
+            on_done=lambda outcome: self.show_rules(outcome[0], min_support, outcome[1]),
+            on_error=self.on_job_error,
+            on_progress=lambda message: self.results_label.config(text=message),
+            on_cancel=self.on_job_cancelled
+        )
 
-            for _, rule in rules.iterrows():
-                self.tree.insert('', 'end', values=(
-                    ', '.join(list(rule['antecedents'])),
-                    ', '.join(list(rule['consequents'])),
-                    f"{rule['support']:.3f}",
-                    f"{rule['confidence']:.3f}",
-                    f"{rule['lift']:.3f}",
-                    f"{rule['conviction']:.3f}"
-                ))
-
-            # Display summary
-            self.results_label.config(text=f"Found {len(rules)} rules.")
-            self.summary_label.config(text=(
-                f"Summary:\n"
-                f"- Number of Rules: {len(rules)}\n"
-                f"- Minimum Confidence: 0.5\n"
-                f"- Support Threshold: {min_support}"
-            ))
+    def cancel_rules(self):
+        self.jobs.cancel(self.JOB_KEY)
 
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+    def set_running(self, running):
+        self.generate_button.config(state=tk.DISABLED if running else tk.NORMAL)
+        self.cancel_button.config(state=tk.NORMAL if running else tk.DISABLED)
+
+    def on_job_error(self, error):
+        self.set_running(False)
+        self.results_label.config(text="")
+        messagebox.showerror("Error", str(error))
+
+    def on_job_cancelled(self):
+        self.set_running(False)
+        self.results_label.config(text="Rule generation cancelled.")
+
+    def run_cached(self, job, valid_cols, min_support, store=None, transactions=None):
+        # The transaction matrix is derived from the dataset and the bucket thresholds
+        store = store if store is not None else self.store
+        transactions = transactions if transactions is not None else self.df
+        key = self.cache_key(store, valid_cols, min_support)
+        return self.results.get_or_compute(
+            key, lambda: run_association(transactions, valid_cols, min_support, progress=job.report, stages=job)
+        )
+
+    def run_progressive(self, job, valid_cols, min_support):
+        # The finished run is the full-data result, so it shares the regular cache entry
+        transactions = self.df
+        return self.results.get_or_compute(
+            self.cache_key(self.store, valid_cols, min_support),
+            lambda: progressive_association(transactions, valid_cols, min_support, progress=job.report, stages=job)
+        )
+
+    def cache_key(self, store, valid_cols, min_support):
+        return result_key(
+            store.fingerprint, self.JOB_KEY, valid_cols, thresholds=self.thresholds,
+            min_support=min_support, min_confidence=MIN_CONFIDENCE, max_itemsets=MAX_ITEMSETS
+        )
+
+    def on_preview(self, payload):
+        # A progressive run's intermediate results; the run carries on, so the tab stays busy
+        if isinstance(payload, dict):
+            self.last_preview = payload
+            self.show_rules(payload, self.last_config['min_support'])
+            self.set_running(True)
+
+    def on_preview_stopped(self):
+        if self.last_preview is None:
+            self.on_job_cancelled()
+            return
+        # Stopping early keeps the last preview on screen
+        self.last_preview['stopped'] = True
+        self.show_rules(self.last_preview, self.last_config['min_support'])
+
+    def show_rules(self, result, min_support, cached=False):
+        self.set_running(False)
+        rules = result['rules']
+
+        # Previews are refined anyway, so only the final run warns about its budget
+        if result['truncated'] and not result.get('preview'):
+            messagebox.showwarning(
+                "Warning",
+                "Mining stopped at its time/itemset budget; the rules shown are incomplete. "
+                "Raise the support threshold or select fewer features for a complete result."
+            )
+
+        if rules.empty:
+            self.results_label.config(text="No rules found with the given support and features.")
+            return
+
+        self.viewer.set_rules(rules)
+
+        # Display summary
+        cached_note = " (cached result)" if cached else ""
+        if preview_note(result):
+            cached_note += f"\n{preview_note(result)}"
+        self.results_label.config(text=f"Found {len(rules)} rules.{cached_note}")
+        self.summary_label.config(text=(
+            f"Summary:\n"
+            f"- Number of Rules: {len(rules)}\n"
+            f"- Frequent Itemsets: {result['n_itemsets']}\n"
+            f"- Minimum Confidence: {MIN_CONFIDENCE}\n"
+            f"- Support Threshold: {min_support}"
+        ))
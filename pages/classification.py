@@ -1,26 +1,38 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import (
-    accuracy_score, classification_report,
-    cohen_kappa_score, mean_absolute_error,
-    mean_squared_error
-)
-from sklearn.preprocessing import LabelEncoder
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import pandas as pd
-import numpy as np
+from pages.figure_panel import FigurePanel
+from pages.scoring import save_model_dialog
+from pages.search_panel import SearchPanel
+from utils.pipelines import run_classification, run_classification_cv, CLASSIFICATION_PARAMS
+from utils.plots import plot_feature_importances
+from utils.result_cache import result_key
+from utils.progressive import preview_note, progressive_classification
+from utils.search import format_params
+
+# Evaluation modes: None scores one hold-out split, an int is the number of CV folds
+EVALUATIONS = {
+    'Hold-out split (70/30)': None,
+    'Stratified 5-fold CV': 5,
+    'Stratified 10-fold CV': 10,
+}
 
-class ClassificationTab:
-    def __init__(self, notebook, df):
-        self.df = df
-        self.create_tab(notebook)
 
-    def create_tab(self, notebook):
-        main_frame = tk.Frame(notebook)
-        notebook.add(main_frame, text="Classification")
+class ClassificationTab:
+    JOB_KEY = "classification"
+
+    def __init__(self, parent, store, jobs, results):
+        self.store = store
+        self.results = results
+        self.df = store.df
+        self.jobs = jobs
+        self.last_result = None
+        self.last_config = None
+        self.last_preview = None
+        self.create_tab(parent)
+
+    def create_tab(self, parent):
+        main_frame = tk.Frame(parent)
+        main_frame.pack(fill="both", expand=True)
 
         canvas = tk.Canvas(main_frame)
         scrollbar = tk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
@@ -53,8 +65,33 @@ class ClassificationTab:
         self.target_dropdown = ttk.Combobox(scroll_frame, values=self.feature_list, font=('helvetica', 12), width=50)
         self.target_dropdown.pack(fill="x", padx=10, pady=5)
 
-        train_button = tk.Button(scroll_frame, text='Train Model', command=self.train_model, bg='blue', fg='white', font=('helvetica', 12, 'bold'))
-        train_button.pack(pady=15)
+        evaluation_label = tk.Label(scroll_frame, text="Evaluation:", font=('helvetica', 12))
+        evaluation_label.pack(anchor="w", padx=10)
+
+        self.evaluation_dropdown = ttk.Combobox(scroll_frame, values=list(EVALUATIONS), state="readonly", font=('helvetica', 12), width=50)
+        self.evaluation_dropdown.set('Hold-out split (70/30)')
+        self.evaluation_dropdown.pack(fill="x", padx=10, pady=5)
+
+        # Progressive mode fits a small stratified sample first, then refines on growing samples
+        self.progressive = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            scroll_frame, text="Progressive preview (sample first, refine in the background)",
+            variable=self.progressive, font=('helvetica', 11)
+        ).pack(anchor="w", padx=10)
+
+        button_frame = tk.Frame(scroll_frame)
+        button_frame.pack(pady=15)
+
+        self.train_button = tk.Button(button_frame, text='Train Model', command=self.train_model, bg='blue', fg='white', font=('helvetica', 12, 'bold'))
+        self.train_button.pack(side="left", padx=5)
+
+        self.cancel_button = tk.Button(button_frame, text='Cancel', command=self.cancel_training, state=tk.DISABLED, font=('helvetica', 12))
+        self.cancel_button.pack(side="left", padx=5)
+
+        self.save_button = tk.Button(button_frame, text='Save Model', command=self.save_model, state=tk.DISABLED, font=('helvetica', 12))
+        self.save_button.pack(side="left", padx=5)
+
+        self.search = SearchPanel(scroll_frame, self, 'classification')
 
         self.results_label = tk.Label(scroll_frame, text="", font=('helvetica', 12), wraplength=600, justify="left")
         self.results_label.pack(padx=10, pady=10)
@@ -67,6 +104,7 @@ class ClassificationTab:
 
         self.canvas_frame = tk.Frame(scroll_frame)
         self.canvas_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.figure = FigurePanel(self.canvas_frame, figsize=(8, 6))
 
         spacer = tk.Frame(scroll_frame, height=50)
         spacer.pack()
@@ -74,94 +112,191 @@ class ClassificationTab:
         canvas.bind("<Configure>", lambda e: canvas.itemconfig(self.scrollable_window, width=e.width))
 
     def train_model(self):
-        try:
-            features = [f.strip() for f in self.features_entry.get().split(",")]
-            target = self.target_dropdown.get()
-
-            if not features or target == "" or target not in self.df.columns:
-                messagebox.showerror("Error", "Please select valid features and target.")
-                return
-
-            X = self.df[features].copy()
-            y = self.df[target].copy()
-
-            for col in X.columns:
-                if X[col].dtype == 'object':
-                    le = LabelEncoder()
-                    X[col] = le.fit_transform(X[col].astype(str))
-
-            def categorize_production(value):
-                if value < 5000:
-                    return 'Low'
-                elif value < 15000:
-                    return 'Medium'
-                else:
-                    return 'High'
-
-            y = y.apply(categorize_production)
-            target_encoder = LabelEncoder()
-            y = target_encoder.fit_transform(y)
-
-            X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.3, random_state=42)
-
-            model = RandomForestClassifier(n_estimators=100, random_state=42)
-            model.fit(X_train, y_train)
-            predictions = model.predict(X_test)
-
-            accuracy = accuracy_score(y_test, predictions)
-            report = classification_report(y_test, predictions)
-
-            # Additional Metrics
-            correct = np.sum(predictions == y_test)
-            incorrect = np.sum(predictions != y_test)
-            kappa = cohen_kappa_score(y_test, predictions)
-            mae = mean_absolute_error(y_test, predictions)
-            rmse = np.sqrt(mean_squared_error(y_test, predictions))
-            mean_actual = np.mean(y_test)
-            rae = np.sum(np.abs(y_test - predictions)) / np.sum(np.abs(y_test - mean_actual))
-            rrse = np.sqrt(np.sum((y_test - predictions) ** 2) / np.sum((y_test - mean_actual) ** 2))
-
-            metrics_text = (
-                f"Correctly Classified Instances: {correct}\n"
-                f"Incorrectly Classified Instances: {incorrect}\n"
-                f"Kappa Statistic: {kappa:.3f}\n"
-                f"Mean Absolute Error: {mae:.3f}\n"
-                f"Root Mean Squared Error: {rmse:.3f}\n"
-                f"Relative Absolute Error: {rae * 100:.2f}%\n"
-                f"Root Relative Squared Error: {rrse * 100:.2f}%\n"
+        if self.jobs.is_running(self.JOB_KEY):
+            return
+
+        inputs = self.selected_inputs()
+        if inputs is None:
+            return
+        features, target = inputs
+
+        n_folds = EVALUATIONS[self.evaluation_dropdown.get()]
+        self.last_config = {'features': features, 'target': target, 'n_folds': n_folds}
+        self.set_running(True)
+        self.results_label.config(text="Training model... Please wait.")
+        self.last_preview = None
+        if self.progressive.get() and not n_folds:
+            self.jobs.submit(
+                self.JOB_KEY,
+                lambda job: self.run_progressive(job, features, target),
+                on_done=lambda outcome: self.show_results(*outcome),
+                on_error=self.on_job_error,
+                on_progress=self.on_preview,
+                on_cancel=self.on_preview_stopped
+            )
+            return
+
+        self.jobs.submit(
+            self.JOB_KEY,
+            lambda job: self.run_cached(job, features, target, n_folds),
+            on_done=lambda outcome: self.show_outcome(outcome, n_folds),
+            on_error=self.on_job_error,
+            on_progress=lambda message: self.results_label.config(text=message),
+            on_cancel=self.on_job_cancelled
+        )
+
+    def refresh(self, store, delta):
+        # Swap in the merged table; new columns become selectable without rebuilding the tab
+        self.store = store
+        self.df = store.df
+        self.feature_list = list(self.df.columns)
+        self.target_dropdown.config(values=self.feature_list)
+
+    def recompute(self, store, job):
+        # Worker thread: repeats the last run on a reloaded dataset
+        if self.last_config is None:
+            return None
+        return self.run_cached(job, **self.last_config, store=store)
+
+    def reload(self, store, outcome):
+        self.refresh(store, None)
+        if outcome is not None and not self.jobs.is_running(self.JOB_KEY):
+            self.show_outcome(outcome, self.last_config['n_folds'])
+
+    def selected_inputs(self):
+        features = [f.strip() for f in self.features_entry.get().split(",")]
+        target = self.target_dropdown.get()
+
+        if not features or target == "" or target not in self.df.columns:
+            messagebox.showerror("Error", "Please select valid features and target.")
+            return None
+        return features, target
+
+    def cancel_training(self):
+        self.jobs.cancel(self.JOB_KEY)
+
+    def set_running(self, running):
+        self.train_button.config(state=tk.DISABLED if running else tk.NORMAL)
+        self.cancel_button.config(state=tk.NORMAL if running else tk.DISABLED)
+
+    def on_job_error(self, error):
+        self.set_running(False)
+        self.results_label.config(text="")
+        messagebox.showerror("Error", str(error))
+
+    def on_job_cancelled(self):
+        self.set_running(False)
+        self.results_label.config(text="Training cancelled.")
+
+    def run_cached(self, job, features, target, n_folds=None, store=None):
+        # Runs on a worker thread: no Tk calls in here, only job.report()
+        store = store if store is not None else self.store
+        key = self.cache_key(store, features, target, n_folds)
+        if n_folds:
+            return self.results.get_or_compute(
+                key, lambda: run_classification_cv(store, features, target, n_folds, progress=job.report, stages=job)
             )
+        return self.results.get_or_compute(
+            key, lambda: run_classification(store, features, target, progress=job.report, stages=job)
+        )
+
+    def run_progressive(self, job, features, target):
+        # The finished run is the full-data result, so it shares the regular cache entry
+        return self.results.get_or_compute(
+            self.cache_key(self.store, features, target),
+            lambda: progressive_classification(self.store, features, target, progress=job.report, stages=job)
+        )
 
-            # Feature Importances
-            feature_importances = model.feature_importances_
-            fig, ax = plt.subplots(figsize=(8, 6))
-            ax.bar(features, feature_importances, color='teal')
-            ax.set_xlabel("Features")
-            ax.set_ylabel("Importance")
-            ax.set_title("Feature Importances")
-            plt.xticks(rotation=45, ha="right")
-            fig.tight_layout()
-
-            for widget in self.canvas_frame.winfo_children():
-                widget.destroy()
-
-            canvas = FigureCanvasTkAgg(fig, master=self.canvas_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
-            self.results_label.config(text=f"Accuracy: {accuracy:.2f}\n\n{report}")
-            self.metrics_label.config(text=metrics_text)
-
-            if accuracy >= 0.9:
-                comment = "Excellent classification accuracy! The model is performing very well."
-            elif accuracy >= 0.7:
-                comment = "Good classification accuracy. The model is performing well."
-            elif accuracy >= 0.5:
-                comment = "Moderate classification accuracy. The model's performance could be improved."
-            else:
-                comment = "Low classification accuracy. The model may not be suitable for this data."
-
-            interpretation = f"Accuracy: {accuracy:.2f} → {comment}"
-            self.interpretation_label.config(text=interpretation)
-
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+    def cache_key(self, store, features, target, n_folds=None):
+        return result_key(store.fingerprint, self.JOB_KEY, features, target, n_folds=n_folds, **CLASSIFICATION_PARAMS)
+
+    def on_preview(self, payload):
+        # A progressive run's intermediate results; the run carries on, so the tab stays busy
+        if isinstance(payload, dict):
+            self.last_preview = payload
+            self.show_results(payload)
+            self.set_running(True)
+
+    def on_preview_stopped(self):
+        if self.last_preview is None:
+            self.on_job_cancelled()
+            return
+        # Stopping early keeps the last preview on screen
+        self.last_preview['stopped'] = True
+        self.show_results(self.last_preview)
+
+    def show_outcome(self, outcome, n_folds):
+        if n_folds:
+            self.show_cv_results(*outcome)
+        else:
+            self.show_results(*outcome)
+
+    def save_model(self):
+        if self.last_result is not None:
+            save_model_dialog(self.last_result, 'classification', self.store)
+
+    def show_results(self, result, cached=False):
+        self.set_running(False)
+        # A preview's model saw only a sample, so it cannot be saved
+        preview = result.get('preview', False)
+        self.last_result = None if preview else result
+        self.save_button.config(state=tk.DISABLED if preview else tk.NORMAL)
+        accuracy = result['accuracy']
+        metrics = result['metrics']
+
+        # Feature Importances
+        self.figure.show(plot_feature_importances, result)
+
+        cached_note = " (cached result)" if cached else ""
+        if result.get('model_params'):
+            cached_note += f"\nBest search parameters: {format_params(result['model_params'])}"
+        if preview_note(result):
+            cached_note += f"\n{preview_note(result)}"
+        self.results_label.config(text=f"Accuracy: {accuracy:.2f}{cached_note}\n\n{result['report']}")
+        self.metrics_label.config(text=(
+            f"Correctly Classified Instances: {metrics['correct']}\n"
+            f"Incorrectly Classified Instances: {metrics['incorrect']}\n"
+            f"Kappa Statistic: {metrics['kappa']:.3f}\n"
+            f"Mean Absolute Error: {metrics['mae']:.3f}\n"
+            f"Root Mean Squared Error: {metrics['rmse']:.3f}\n"
+            f"Relative Absolute Error: {metrics['rae'] * 100:.2f}%\n"
+            f"Root Relative Squared Error: {metrics['rrse'] * 100:.2f}%\n"
+        ))
+
+        self.show_interpretation(accuracy)
+
+    def show_cv_results(self, result, cached=False):
+        self.set_running(False)
+        # Cross-validation fits one model per fold and keeps none of them
+        self.last_result = None
+        self.save_button.config(state=tk.DISABLED)
+        accuracy = result['accuracy']
+
+        # Mean feature importances, with the spread across folds as error bars
+        self.figure.show(plot_feature_importances, result)
+
+        cached_note = " (cached result)" if cached else ""
+        self.results_label.config(text=(
+            f"Accuracy: {accuracy:.2f} ± {result['accuracy_std']:.2f} over {result['n_folds']} folds{cached_note}\n\n"
+            f"{result['report']}"
+        ))
+        fold_scores = ', '.join(f"{score:.2f}" for score in result['fold_accuracies'])
+        self.metrics_label.config(text=(
+            f"Kappa Statistic: {result['kappa']:.3f} ± {result['kappa_std']:.3f}\n"
+            f"Fold Accuracies: {fold_scores}\n"
+        ))
+
+        self.show_interpretation(accuracy)
+
+    def show_interpretation(self, accuracy):
+        if accuracy >= 0.9:
+            comment = "Excellent classification accuracy! The model is performing very well."
+        elif accuracy >= 0.7:
+            comment = "Good classification accuracy. The model is performing well."
+        elif accuracy >= 0.5:
+            comment = "Moderate classification accuracy. The model's performance could be improved."
+        else:
+            comment = "Low classification accuracy. The model may not be suitable for this data."
+
+        interpretation = f"Accuracy: {accuracy:.2f} → {comment}"
+        self.interpretation_label.config(text=interpretation)
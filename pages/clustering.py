@@ -1,19 +1,37 @@
 import tkinter as tk
 from tkinter import Button, messagebox, ttk
-import matplotlib.pyplot as plt
-from sklearn.cluster import KMeans
-from sklearn.metrics import silhouette_score
-from sklearn.preprocessing import LabelEncoder, StandardScaler
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from pages.figure_panel import FigurePanel
+from pages.scoring import save_model_dialog
+from utils.pipelines import (
+    run_clustering, run_k_sweep, CLUSTERING_PARAMS, MINIBATCH_PARAMS,
+    CLUSTERING_ROW_THRESHOLD, SILHOUETTE_SAMPLE_SIZE
+)
+from utils.plots import plot_clusters
+from utils.progressive import preview_note, progressive_clustering
+from utils.result_cache import result_key
+
+MODES = {'Auto': 'auto', 'Full K-Means': 'full', 'Mini-batch K-Means': 'minibatch'}
+MODE_NAMES = {'full': 'Full K-Means', 'minibatch': 'Mini-batch K-Means'}
 
-class ClusteringTab:
-    def __init__(self, notebook, df):
-        self.df = df.copy()
-        self.create_tab(notebook)
 
-    def create_tab(self, notebook):
-        main_frame = tk.Frame(notebook)
-        notebook.add(main_frame, text="Clustering")
+class ClusteringTab:
+    JOB_KEY = "clustering"
+    SWEEP_JOB_KEY = "clustering-sweep"
+
+    def __init__(self, parent, store, jobs, results):
+        self.store = store
+        self.results = results
+        self.df = store.df
+        self.jobs = jobs
+        self.last_result = None
+        self.last_config = None
+        self.last_preview = None
+        self.sweep_points = []
+        self.create_tab(parent)
+
+    def create_tab(self, parent):
+        main_frame = tk.Frame(parent)
+        main_frame.pack(fill="both", expand=True)
 
         canvas = tk.Canvas(main_frame)
         scrollbar = tk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
@@ -45,8 +63,54 @@ class ClusteringTab:
         self.cluster_entry = tk.Entry(scroll_frame, font=('helvetica', 12), width=50)
         self.cluster_entry.pack(fill="x", padx=10, pady=5)
 
-        process_button = Button(scroll_frame, text='Run K-Means', command=self.run_kmeans, bg='brown', fg='white', font=('helvetica', 12, 'bold'))
-        process_button.pack(pady=20)
+        mode_label = tk.Label(scroll_frame, text=f"Mode (Auto uses mini-batch above {CLUSTERING_ROW_THRESHOLD:,} rows):", font=('helvetica', 12))
+        mode_label.pack(anchor="w", padx=10)
+
+        self.mode_dropdown = ttk.Combobox(scroll_frame, values=list(MODES), state="readonly", font=('helvetica', 12), width=50)
+        self.mode_dropdown.set('Auto')
+        self.mode_dropdown.pack(fill="x", padx=10, pady=5)
+
+        sample_label = tk.Label(scroll_frame, text="Silhouette Sample Size:", font=('helvetica', 12))
+        sample_label.pack(anchor="w", padx=10)
+
+        self.sample_entry = tk.Entry(scroll_frame, font=('helvetica', 12), width=50)
+        self.sample_entry.insert(0, str(SILHOUETTE_SAMPLE_SIZE))
+        self.sample_entry.pack(fill="x", padx=10, pady=5)
+
+        self.progressive = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            scroll_frame, text="Progressive preview (sample first, refine in the background)",
+            variable=self.progressive, font=('helvetica', 11)
+        ).pack(anchor="w", padx=10)
+
+        button_frame = tk.Frame(scroll_frame)
+        button_frame.pack(pady=20)
+
+        self.process_button = Button(button_frame, text='Run K-Means', command=self.run_kmeans, bg='brown', fg='white', font=('helvetica', 12, 'bold'))
+        self.process_button.pack(side="left", padx=5)
+
+        self.cancel_button = Button(button_frame, text='Cancel', command=self.cancel_kmeans, state=tk.DISABLED, font=('helvetica', 12))
+        self.cancel_button.pack(side="left", padx=5)
+
+        self.save_button = Button(button_frame, text='Save Model', command=self.save_model, state=tk.DISABLED, font=('helvetica', 12))
+        self.save_button.pack(side="left", padx=5)
+
+        # k Sweep (elbow and silhouette curves)
+        sweep_frame = tk.Frame(scroll_frame)
+        sweep_frame.pack(pady=5)
+
+        tk.Label(sweep_frame, text="Sweep k from", font=('helvetica', 12)).pack(side="left")
+        self.sweep_from_entry = tk.Entry(sweep_frame, font=('helvetica', 12), width=5)
+        self.sweep_from_entry.insert(0, "2")
+        self.sweep_from_entry.pack(side="left", padx=5)
+
+        tk.Label(sweep_frame, text="to", font=('helvetica', 12)).pack(side="left")
+        self.sweep_to_entry = tk.Entry(sweep_frame, font=('helvetica', 12), width=5)
+        self.sweep_to_entry.insert(0, "10")
+        self.sweep_to_entry.pack(side="left", padx=5)
+
+        self.sweep_button = Button(sweep_frame, text='Sweep k', command=self.sweep_k, bg='brown', fg='white', font=('helvetica', 12, 'bold'))
+        self.sweep_button.pack(side="left", padx=5)
 
         self.results_label = tk.Label(scroll_frame, text="", font=('helvetica', 12), justify="left", wraplength=600)
         self.results_label.pack(pady=10)
@@ -56,6 +120,7 @@ class ClusteringTab:
 
         self.canvas_frame = tk.Frame(scroll_frame)
         self.canvas_frame.pack(fill=tk.BOTH, expand=True)
+        self.figure = FigurePanel(self.canvas_frame, figsize=(6, 4))
 
         spacer = tk.Frame(scroll_frame, height=50)
         spacer.pack()
@@ -63,6 +128,9 @@ class ClusteringTab:
         canvas.bind("<Configure>", lambda e: canvas.itemconfig(self.scrollable_window, width=e.width))
 
     def run_kmeans(self):
+        if self.is_busy():
+            return
+
         try:
             selected_features = [col.strip() for col in self.features_entry.get().split(',')]
             if not selected_features:
@@ -74,66 +142,265 @@ class ClusteringTab:
                 messagebox.showerror("Error", "Please enter a number greater than 1 for clusters.")
                 return
 
-            df_selected = self.df[selected_features].copy()
-
-            for col in df_selected.columns:
-                if df_selected[col].dtype == 'object':
-                    le = LabelEncoder()
-                    df_selected[col] = le.fit_transform(df_selected[col].astype(str))
-
-            if df_selected.shape[1] < 2:
+            if len(selected_features) < 2:
                 messagebox.showerror("Error", "Need at least two numeric features for clustering.")
                 return
 
-            scaler = StandardScaler()
-            X = scaler.fit_transform(df_selected)
-
-            kmeans = KMeans(n_clusters=k, n_init=10, random_state=42)
-            labels = kmeans.fit_predict(X)
-            centroids = kmeans.cluster_centers_
-            silhouette_avg = silhouette_score(X, labels)
-            inertia = kmeans.inertia_
-            n_iter = kmeans.n_iter_
-            cluster_sizes = [list(labels).count(i) for i in range(k)]
-
-            for widget in self.canvas_frame.winfo_children():
-                widget.destroy()
-
-            fig, ax = plt.subplots(figsize=(6, 4))
-            ax.scatter(X[:, 0], X[:, 1], c=labels, cmap='viridis', s=50, alpha=0.6)
-            ax.scatter(centroids[:, 0], centroids[:, 1], c='red', s=100, marker='X')
-            ax.set_title(f'K-Means Clustering (k={k})')
-            ax.set_xlabel(selected_features[0])
-            ax.set_ylabel(selected_features[1])
-
-            canvas = FigureCanvasTkAgg(fig, master=self.canvas_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
-            # Display Results
-            result_text = (
-                f"Silhouette Score: {silhouette_avg:.2f}\n"
-                f"Within Cluster Sum of Squares (WCSS): {inertia:.2f}\n"
-                f"Number of Iterations: {n_iter}\n"
-                f"Cluster Size Distribution: {cluster_sizes}"
+            mode = MODES[self.mode_dropdown.get()]
+            sample_size = self.selected_sample_size()
+
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
+
+        self.last_config = {'selected_features': selected_features, 'k': k, 'mode': mode, 'sample_size': sample_size}
+        self.set_running(True)
+        self.results_label.config(text="Running K-Means... Please wait.")
+        self.last_preview = None
+        if self.progressive.get():
+            self.jobs.submit(
+                self.JOB_KEY,
+                lambda job: self.run_progressive(job, selected_features, k, mode, sample_size),
+                on_done=lambda outcome: self.show_results(*outcome),
+                on_error=self.on_job_error,
+                on_progress=self.on_preview,
+                on_cancel=self.on_preview_stopped
+            )
+            return
+
+        self.jobs.submit(
+            self.JOB_KEY,
+            lambda job: self.run_cached(job, selected_features, k, mode, sample_size),
+            on_done=lambda outcome: self.show_results(*outcome),
+            on_error=self.on_job_error,
+            on_progress=lambda message: self.results_label.config(text=message),
+            on_cancel=self.on_job_cancelled
+        )
+
+    def refresh(self, store, delta):
+        self.store = store
+        self.df = store.df
+
+    def recompute(self, store, job):
+        # Worker thread: repeats the last k-means run (not the sweep) on a reloaded dataset
+        if self.last_config is None:
+            return None
+        return self.run_cached(job, **self.last_config, store=store)
+
+    def reload(self, store, outcome):
+        self.refresh(store, None)
+        if outcome is not None and not self.is_busy():
+            self.show_results(*outcome)
+
+    def is_busy(self):
+        return self.jobs.is_running(self.JOB_KEY) or self.jobs.is_running(self.SWEEP_JOB_KEY)
+
+    def cancel_kmeans(self):
+        self.jobs.cancel(self.JOB_KEY)
+        self.jobs.cancel(self.SWEEP_JOB_KEY)
+
+    def set_running(self, running):
+        self.process_button.config(state=tk.DISABLED if running else tk.NORMAL)
+        self.sweep_button.config(state=tk.DISABLED if running else tk.NORMAL)
+        self.cancel_button.config(state=tk.NORMAL if running else tk.DISABLED)
+
+    def on_job_error(self, error):
+        self.set_running(False)
+        self.results_label.config(text="")
+        messagebox.showerror("Error", str(error))
+
+    def on_job_cancelled(self):
+        self.set_running(False)
+        self.results_label.config(text="Clustering cancelled.")
+
+    def run_cached(self, job, selected_features, k, mode, sample_size, store=None):
+        # Runs on a worker thread: no Tk calls in here, only job.report()
+        store = store if store is not None else self.store
+        key = self.cache_key(store, selected_features, k, mode, sample_size)
+        return self.results.get_or_compute(
+            key, lambda: run_clustering(
+                store, selected_features, k, progress=job.report, stages=job, mode=mode, sample_size=sample_size
             )
-            self.results_label.config(text=result_text)
+        )
 
-            # Centroid Details
-            centroids_text = "Cluster Centroids (Standardized Values):\n"
-            for i, center in enumerate(centroids):
-                centroid_values = ', '.join(f"{val:.2f}" for val in center)
-                centroids_text += f"Cluster {i + 1}: [{centroid_values}]\n"
+    def run_progressive(self, job, selected_features, k, mode, sample_size):
+        # The finished run is the full-data result, so it shares the regular cache entry
+        return self.results.get_or_compute(
+            self.cache_key(self.store, selected_features, k, mode, sample_size),
+            lambda: progressive_clustering(
+                self.store, selected_features, k, progress=job.report, stages=job, mode=mode, sample_size=sample_size
+            )
+        )
 
-            # Interpretation
-            if silhouette_avg >= 0.7:
-                comment = "Good clustering. The clusters are well separated."
-            elif silhouette_avg >= 0.5:
-                comment = "Fair clustering. Some overlap between clusters."
-            else:
-                comment = "Poor clustering. Try adjusting cluster count or features."
+    def cache_key(self, store, selected_features, k, mode, sample_size):
+        return result_key(
+            store.fingerprint, self.JOB_KEY, selected_features, k=k, mode=mode, sample_size=sample_size,
+            minibatch=MINIBATCH_PARAMS, row_threshold=CLUSTERING_ROW_THRESHOLD, **CLUSTERING_PARAMS
+        )
 
-            self.interpretation_label.config(text=centroids_text + "\n" + comment)
+    def on_preview(self, payload):
+        # A progressive run's intermediate results; the run carries on, so the tab stays busy
+        if isinstance(payload, dict):
+            self.last_preview = payload
+            self.show_results(payload)
+            self.set_running(True)
+
+    def on_preview_stopped(self):
+        if self.last_preview is None:
+            self.on_job_cancelled()
+            return
+        # Stopping early keeps the last preview on screen
+        self.last_preview['stopped'] = True
+        self.show_results(self.last_preview)
+
+    def save_model(self):
+        if self.last_result is not None:
+            save_model_dialog(self.last_result, 'clustering', self.store)
+
+    def show_results(self, result, cached=False):
+        self.set_running(False)
+        # A preview's model saw only a sample, so it cannot be saved
+        preview = result.get('preview', False)
+        self.last_result = None if preview else result
+        self.save_button.config(state=tk.DISABLED if preview else tk.NORMAL)
+        centroids = result['centroids']
+        silhouette_avg = result['silhouette']
+
+        self.figure.show(plot_clusters, result)
+
+        # Display Results
+        sampled_note = f" (sampled on {result['silhouette_sample']:,} rows)" if result['silhouette_sample'] else ""
+        result_text = (
+            f"Mode: {MODE_NAMES[result['mode']]}\n"
+            f"Silhouette Score: {silhouette_avg:.2f}{sampled_note}\n"
+            f"Within Cluster Sum of Squares (WCSS): {result['inertia']:.2f}\n"
+            f"Number of Iterations: {result['n_iter']}\n"
+            f"Cluster Size Distribution: {result['cluster_sizes']}"
+        )
+        if cached:
+            result_text += "\n(cached result)"
+        if preview_note(result):
+            result_text += f"\n{preview_note(result)}"
+        self.results_label.config(text=result_text)
+
+        # Centroid Details
+        centroids_text = "Cluster Centroids (Standardized Values):\n"
+        for i, center in enumerate(centroids):
+            centroid_values = ', '.join(f"{val:.2f}" for val in center)
+            centroids_text += f"Cluster {i + 1}: [{centroid_values}]\n"
+
+        # Interpretation
+        if silhouette_avg >= 0.7:
+            comment = "Good clustering. The clusters are well separated."
+        elif silhouette_avg >= 0.5:
+            comment = "Fair clustering. Some overlap between clusters."
+        else:
+            comment = "Poor clustering. Try adjusting cluster count or features."
+
+        self.interpretation_label.config(text=centroids_text + "\n" + comment)
+
+    def selected_sample_size(self):
+        # Shared by single runs and sweeps; the silhouette sampler needs two points or more
+        sample_size = int(self.sample_entry.get())
+        if sample_size < 2:
+            raise ValueError("The silhouette sample size must be at least 2.")
+        return sample_size
+
+    def sweep_k(self):
+        if self.is_busy():
+            return
+
+        try:
+            selected_features = [col.strip() for col in self.features_entry.get().split(',')]
+            if len(selected_features) < 2:
+                messagebox.showerror("Error", "Need at least two numeric features for clustering.")
+                return
+
+            k_from = int(self.sweep_from_entry.get())
+            k_to = int(self.sweep_to_entry.get())
+            if k_from < 2 or k_to <= k_from:
+                messagebox.showerror("Error", "Enter a k range starting at 2 or more, with the end above the start.")
+                return
+
+            mode = MODES[self.mode_dropdown.get()]
+            sample_size = self.selected_sample_size()
 
         except Exception as e:
-            messagebox.showerror("Error", str(e))
\ No newline at end of file
+            messagebox.showerror("Error", str(e))
+            return
+
+        k_values = list(range(k_from, k_to + 1))
+        self.sweep_points = []
+        self.start_sweep_plot(k_values)
+
+        self.set_running(True)
+        self.results_label.config(text=f"Sweeping k = {k_from}..{k_to} across all cores...")
+        self.interpretation_label.config(text="")
+        self.jobs.submit(
+            self.SWEEP_JOB_KEY,
+            lambda job: self.run_sweep_cached(job, selected_features, k_values, mode, sample_size),
+            on_done=lambda outcome: self.show_sweep(*outcome),
+            on_error=self.on_job_error,
+            on_progress=self.on_sweep_point,
+            on_cancel=self.on_job_cancelled
+        )
+
+    def run_sweep_cached(self, job, selected_features, k_values, mode, sample_size):
+        # Runs on a worker thread: no Tk calls in here, only job.report()
+        key = result_key(
+            self.store.fingerprint, self.SWEEP_JOB_KEY, selected_features, k_values=k_values, mode=mode,
+            sample_size=sample_size, minibatch=MINIBATCH_PARAMS, row_threshold=CLUSTERING_ROW_THRESHOLD,
+            **CLUSTERING_PARAMS
+        )
+        return self.results.get_or_compute(
+            key, lambda: run_k_sweep(
+                self.store, selected_features, k_values, progress=job.report, stages=job, mode=mode, sample_size=sample_size
+            )
+        )
+
+    def start_sweep_plot(self, k_values):
+        self.inertia_ax, self.silhouette_ax = self.figure.axes(ncols=2, figsize=(9, 4))
+        self.inertia_line, = self.inertia_ax.plot([], [], marker='o')
+        self.silhouette_line, = self.silhouette_ax.plot([], [], marker='o', color='green')
+        for ax, title in [(self.inertia_ax, "Elbow (WCSS)"), (self.silhouette_ax, "Silhouette Score")]:
+            ax.set_xlim(k_values[0] - 0.5, k_values[-1] + 0.5)
+            ax.set_xlabel("k")
+            ax.set_title(title)
+        self.figure.redraw(layout=True)
+
+    def on_sweep_point(self, point):
+        # Curves grow in place as each k finishes, in whatever order they complete
+        self.sweep_points.append(point)
+        self.update_sweep_plot(self.sweep_points)
+        self.results_label.config(text=f"Finished k = {point['k']} ({len(self.sweep_points)} done)...")
+
+    def update_sweep_plot(self, points):
+        points = sorted(points, key=lambda p: p['k'])
+        ks = [p['k'] for p in points]
+        self.inertia_line.set_data(ks, [p['inertia'] for p in points])
+        self.silhouette_line.set_data(ks, [p['silhouette'] for p in points])
+        for ax in (self.inertia_ax, self.silhouette_ax):
+            ax.relim()
+            ax.autoscale_view(scalex=False)
+        self.figure.redraw()
+
+    def show_sweep(self, result, cached=False):
+        self.set_running(False)
+        self.update_sweep_plot(result['points'])
+
+        best_k = result['recommended_k']
+        best = next(p for p in result['points'] if p['k'] == best_k)
+        for ax in (self.inertia_ax, self.silhouette_ax):
+            ax.axvline(best_k, color='red', linestyle='--', lw=1)
+        self.silhouette_ax.plot([best_k], [best['silhouette']], marker='*', color='red', markersize=14)
+        self.figure.redraw()
+
+        # Pre-fill the recommendation so a single run is one click away
+        self.cluster_entry.delete(0, tk.END)
+        self.cluster_entry.insert(0, str(best_k))
+
+        cached_note = "\n(cached result)" if cached else ""
+        self.results_label.config(text=(
+            f"Mode: {MODE_NAMES[result['mode']]}\n"
+            f"Recommended k: {best_k} (highest silhouette score, {best['silhouette']:.2f}){cached_note}"
+        ))
@@ -0,0 +1,39 @@
+import tkinter as tk
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+# One matplotlib figure and Tk canvas per tab, created on first use and reused
+# for every later run. Figures are built with matplotlib.figure.Figure rather
+# than pyplot, so nothing is registered globally and nothing leaks per click.
+
+
+class FigurePanel:
+    def __init__(self, parent, figsize=(6, 4)):
+        self.parent = parent
+        self.figsize = figsize
+        self.figure = None
+        self.canvas = None
+
+    def axes(self, ncols=1, figsize=None):
+        # Clears the figure and returns fresh axes on the same canvas
+        if self.figure is None:
+            self.figure = Figure(figsize=figsize or self.figsize)
+            self.canvas = FigureCanvasTkAgg(self.figure, master=self.parent)
+            self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        else:
+            self.figure.clear()
+            self.figure.set_size_inches(*(figsize or self.figsize), forward=True)
+
+        axes = self.figure.subplots(1, ncols)
+        return list(axes) if ncols > 1 else axes
+
+    def show(self, draw, result, figsize=None):
+        draw(self.axes(figsize=figsize), result)
+        self.redraw(layout=True)
+
+    def redraw(self, layout=False):
+        if self.figure is None:
+            return
+        if layout:
+            self.figure.tight_layout()
+        self.canvas.draw_idle()
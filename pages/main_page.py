@@ -1,17 +1,45 @@
 import tkinter as tk
 from tkinter import Button, filedialog, ttk, messagebox
-import os
-import pandas as pd
-from pages.clustering import ClusteringTab
-from pages.regression import RegressionTab
-from pages.association import AssociationTab
-from pages.classification import ClassificationTab
+import importlib
+import time
+from utils.job_runner import JobCancelled, JobRunner
+from utils.result_cache import ResultCache, RESULT_CACHE_DIR
+
+# Tabs are imported and built the first time they are selected, so pandas,
+# sklearn, mlxtend and matplotlib stay unloaded until the dashboard needs them
+TABS = [
+    ("Classification", "pages.classification", "ClassificationTab"),
+    ("Regression", "pages.regression", "RegressionTab"),
+    ("Association", "pages.association", "AssociationTab"),
+    ("Clustering", "pages.clustering", "ClusteringTab"),
+    ("Summary", "pages.summary", "SummaryTab"),
+    ("Batch Scoring", "pages.scoring", "ScoringTab"),
+]
+
+# Merging files and reloading the watched source both replace the store, so they
+# share one job key and never run at the same time
+SOURCE_JOB_KEY = "source"
 
 
 class MainPage:
-    def __init__(self, root):
+    def __init__(self, root, persist_results=False):
         self.root = root
         self.df = None
+        self.store = None
+        self.load_summary = ""
+        self.ingest_status = ""
+        self.source_path = None
+        self.source_sheet = None
+        self.source_hash = None
+        # Files merged into the source; a reload merges them again
+        self.merged_paths = []
+        self.watcher = None
+        self.reload_pending = False
+        self.cache = None
+        self.tabs = {}
+        self.results = ResultCache(persist_dir=RESULT_CACHE_DIR if persist_results else None)
+        self.jobs = JobRunner(root)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         self.create_main_page()
 
     def create_main_page(self):
@@ -45,7 +73,7 @@ class MainPage:
         label.pack(pady=20)
 
         # Upload Button
-        upload_button = Button(
+        self.upload_button = Button(
             upload_section, 
             text="Upload File", 
             command=self.upload_file, 
@@ -55,7 +83,18 @@ class MainPage:
             width=15,
             height=2
         )
-        upload_button.pack(pady=20)
+        self.upload_button.pack(pady=20)
+
+        # Loading Progress
+        self.progress_bar = ttk.Progressbar(upload_section, orient="horizontal", length=300, mode="determinate", maximum=100)
+        self.progress_bar.pack(pady=10)
+
+        self.progress_label = tk.Label(upload_section, text="", font=('helvetica', 12))
+        self.progress_label.pack()
+
+        # Cache Controls
+        clear_cache_button = Button(upload_section, text="Clear Dataset Cache", command=self.clear_cache, font=('helvetica', 10))
+        clear_cache_button.pack(pady=10)
 
     def upload_file(self):
         # Open file dialog for selecting the data file
@@ -68,22 +107,94 @@ class MainPage:
         if not import_file_path:
             return
 
-        try:
-            # Determine file type and read accordingly
-            ext = os.path.splitext(import_file_path)[-1].lower()
+        sheet = None
+        from utils.loader import is_excel
+        if is_excel(import_file_path):
+            from utils.loader import excel_sheets
+            from pages.sheet_dialog import ask_sheet
+
+            try:
+                sheet = ask_sheet(self.root, import_file_path, excel_sheets(import_file_path))
+            except Exception as e:
+                messagebox.showerror("File Error", f"Failed to open the workbook. Error: {e}")
+                return
+            if sheet is None:
+                return
+
+        self.upload_button.config(state=tk.DISABLED)
+        self.progress_bar['value'] = 0
+        self.progress_label.config(text="Loading...")
+
+        self.jobs.submit(
+            "load",
+            lambda job: self.load_file(job, import_file_path, sheet),
+            on_done=lambda result: self.on_file_loaded(result, import_file_path, sheet),
+            on_error=self.on_load_error,
+            on_progress=self.on_load_progress
+        )
+
+    def get_cache(self):
+        if self.cache is None:
+            from utils.dataset_cache import DatasetCache
+            self.cache = DatasetCache()
+        return self.cache
+
+    def load_file(self, job, path, sheet=None):
+        from utils.feature_store import FeatureStore
 
-            if ext == '.csv':
-                self.df = pd.read_csv(import_file_path)
-            elif ext in ['.xls', '.xlsx']:
-                self.df = pd.read_excel(import_file_path, engine='openpyxl')
-            else:
-                raise ValueError("Invalid file format. Please upload a CSV or Excel file.")
+        df, note = self.read_source(job, path, sheet)
+        # Encode once per upload; every tab shares this store
+        with job.stage("encode"):
+            return FeatureStore(df, source=path), note, self.get_cache().file_key(path)
 
-            # Open the dashboard if file is valid
-            self.open_dashboard()
+    def read_source(self, job, path, sheet=None):
+        from utils.loader import load_dataset
 
+        # Runs on a worker thread; a known file is read back from the columnar cache.
+        # Returns the table and a note for the load status
+        with job.stage("cache-read"):
+            df = self.get_cache().get(path, sheet)
+        if df is not None:
+            job.report(1.0)
+            return df, " (from cache)"
+
+        with job.stage("read"):
+            df = load_dataset(path, progress=job.report, sheet=sheet)
+        try:
+            with job.stage("cache-write"):
+                self.get_cache().put(path, df, sheet)
         except Exception as e:
-            messagebox.showerror("File Error", f"Failed to load the file. Error: {e}")
+            # The table is loaded either way; only the next load of this file is slower
+            return df, f" (could not cache: {e})"
+        return df, ""
+
+    def clear_cache(self):
+        from utils.loader import format_bytes
+
+        cache = self.get_cache()
+        freed = cache.size()
+        cache.purge()
+        messagebox.showinfo("Cache Cleared", f"Removed {format_bytes(freed)} of cached datasets.")
+
+    def on_load_progress(self, fraction):
+        self.progress_bar['value'] = fraction * 100
+        self.progress_label.config(text=f"Loading... {fraction * 100:.0f}%")
+
+    def on_load_error(self, error):
+        self.upload_button.config(state=tk.NORMAL)
+        self.progress_label.config(text="")
+        messagebox.showerror("File Error", f"Failed to load the file. Error: {error}")
+
+    def on_file_loaded(self, result, path, sheet):
+        store, note, digest = result
+        self.source_path = path
+        self.source_sheet = sheet
+        self.source_hash = digest
+        self.merged_paths = []
+        self.set_store(store, note)
+
+        # Open the dashboard if file is valid
+        self.open_dashboard()
 
     def open_dashboard(self):
         # Clear the root window before displaying the dashboard
@@ -93,13 +204,237 @@ class MainPage:
         # Create a notebook widget (Tab Container)
         notebook = ttk.Notebook(self.root)
         notebook.grid(row=0, column=0, sticky="nsew")
-        
-        # Add tabs to the notebook
-        ClassificationTab(notebook, self.df)
-        RegressionTab(notebook, self.df)
-        AssociationTab(notebook, self.df)
-        ClusteringTab(notebook, self.df)
-        
+
+        # Status bar with the loaded dataset's footprint
+        status_frame = tk.Frame(self.root)
+        status_frame.grid(row=1, column=0, sticky="ew", padx=10)
+        self.status_label = tk.Label(status_frame, text=self.load_summary, font=('helvetica', 10), anchor="w")
+        self.status_label.pack(side="left", fill="x", expand=True)
+
+        # Later quarters or other regions are merged into the loaded table
+        self.add_files_button = Button(status_frame, text="Load Additional Files...", command=self.add_files, font=('helvetica', 10))
+        self.add_files_button.pack(side="right")
+
+        # Opt-in: reload the uploaded file whenever its content changes
+        self.watch_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            status_frame, text="Watch file for changes", variable=self.watch_var, command=self.toggle_watch, font=('helvetica', 10)
+        ).pack(side="right", padx=10)
+
+        # Per-stage timings of every job, collapsed until opened
+        from pages.perf_panel import PerfPanel
+
+        self.perf_panel = PerfPanel(self.root, self.jobs.perf)
+        self.perf_panel.grid(row=2, column=0, sticky="ew", padx=10)
+        self.update_status()
+
+        # Add placeholder frames; each tab is built on its first selection
+        self.notebook = notebook
+        self.tab_frames = []
+        for title, _, _ in TABS:
+            frame = tk.Frame(notebook)
+            notebook.add(frame, text=title)
+            self.tab_frames.append(frame)
+        notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+
+        # The first tab is selected before the binding exists, so build it directly
+        self.on_tab_changed(None)
+
         # Allow the notebook to expand fully
         self.root.grid_rowconfigure(0, weight=1)
         self.root.grid_columnconfigure(0, weight=1)
+
+    def set_store(self, store, note=""):
+        from utils.loader import memory_footprint, format_bytes
+
+        self.store = store
+        self.df = df = store.df
+        rows, cols = df.shape
+        self.load_summary = f"{rows:,} rows × {cols} columns, {format_bytes(memory_footprint(df))} in memory{note}"
+
+    def toggle_watch(self):
+        from utils.file_watcher import FileWatcher, POLL_INTERVAL
+
+        if not self.watch_var.get():
+            self.watcher = None
+            return
+
+        self.watcher = FileWatcher(self.source_path)
+        self.root.after(int(POLL_INTERVAL * 1000), self.poll_source, self.watcher)
+
+    def poll_source(self, watcher):
+        from utils.file_watcher import POLL_INTERVAL
+
+        # A watcher replaced or switched off since this timer was set just stops
+        if watcher is not self.watcher:
+            return
+        if watcher.poll():
+            self.reload_pending = True
+        # A change seen while files are being merged is reloaded once the merge is done
+        if self.reload_pending and not self.jobs.is_running(SOURCE_JOB_KEY):
+            self.reload_pending = False
+            self.ingest_status = "Source file changed, reloading..."
+            path, sheet, previous_hash, merged_paths = self.source_path, self.source_sheet, self.source_hash, list(self.merged_paths)
+            self.jobs.submit(
+                SOURCE_JOB_KEY,
+                lambda job: self.reload_source(job, path, sheet, previous_hash, merged_paths, dict(self.tabs)),
+                on_done=self.on_source_reloaded,
+                on_error=self.on_reload_error
+            )
+        self.root.after(int(POLL_INTERVAL * 1000), self.poll_source, watcher)
+
+    def reload_source(self, job, path, sheet, previous_hash, merged_paths, tabs):
+        from utils.feature_store import FeatureStore
+        from utils.ingest import merge_files, read_files
+
+        # Worker thread: everything is computed here and swapped in by one Tk callback
+        with job.stage("hash"):
+            digest = self.get_cache().file_key(path)
+        if digest == previous_hash:
+            return None
+
+        df, _ = self.read_source(job, path, sheet)
+        if merged_paths:
+            # Files merged since the upload are applied again, so the reload keeps their rows
+            with job.stage("read"):
+                frames = read_files(merged_paths)
+            with job.stage("merge"):
+                df, _ = merge_files(df, frames)
+        with job.stage("encode"):
+            store = FeatureStore(df, source=None if merged_paths else path)
+        # Every open tab repeats its last configuration against the new table; a tab that
+        # fails (e.g. its features are gone from the file) does not hold back the others
+        outcomes = {}
+        failures = {}
+        for index, tab in tabs.items():
+            if tab is None:
+                continue
+            try:
+                outcomes[index] = tab.recompute(store, job)
+            except JobCancelled:
+                raise
+            except Exception as e:
+                failures[index] = e
+        return digest, store, outcomes, failures
+
+    def on_reload_error(self, error):
+        self.ingest_status = ""
+        messagebox.showerror("Reload Error", f"Failed to reload the changed file. Error: {error}")
+
+    def on_source_reloaded(self, result):
+        if result is None:
+            # Saved again with identical content
+            self.ingest_status = ""
+            return
+
+        digest, store, outcomes, failures = result
+        self.source_hash = digest
+        merged = f", {len(self.merged_paths)} merged files applied again" if self.merged_paths else ""
+        self.set_store(store, f" (reloaded {time.strftime('%H:%M:%S')}{merged})")
+        self.ingest_status = ""
+        # Failed tabs still take the new table, just without their last result
+        for index, tab in self.tabs.items():
+            if tab is not None:
+                tab.reload(store, outcomes.get(index))
+
+        if failures:
+            lines = "\n".join(f"{TABS[index][0]}: {error}" for index, error in failures.items())
+            messagebox.showwarning(
+                "Reload Warning",
+                f"The file was reloaded, but these tabs could not repeat their last run on it:\n{lines}"
+            )
+
+    def update_status(self):
+        stats = self.results.stats()
+        ingest = f"    |    {self.ingest_status}" if self.ingest_status else ""
+        self.status_label.config(
+            text=f"{self.load_summary}    |    Result cache: {stats['hits']} hits, {stats['misses']} misses{ingest}"
+        )
+        self.perf_panel.refresh()
+        self.root.after(1000, self.update_status)
+
+    def add_files(self):
+        paths = filedialog.askopenfilenames(
+            title="Select Files to Merge",
+            filetypes=[("CSV Files", "*.csv"), ("Excel Files", "*.xls *.xlsx")]
+        )
+        if not paths:
+            return
+        if self.jobs.is_running(SOURCE_JOB_KEY):
+            messagebox.showinfo("Busy", "The source file is being reloaded. Add the files once it has finished.")
+            return
+
+        self.add_files_button.config(state=tk.DISABLED)
+        self.ingest_status = "Merging files..."
+        self.jobs.submit(
+            SOURCE_JOB_KEY,
+            lambda job: self.ingest_files(job, list(paths)),
+            on_done=lambda result: self.on_files_merged(result, list(paths)),
+            on_error=self.on_ingest_error,
+            on_progress=self.on_ingest_progress
+        )
+
+    def ingest_files(self, job, paths):
+        from utils.ingest import is_empty, merge_files, read_files
+
+        # Runs on a worker thread; only the delta is encoded again
+        with job.stage("read"):
+            frames = read_files(paths, progress=job.report)
+        with job.stage("merge"):
+            merged, delta = merge_files(self.df, frames)
+        if is_empty(delta):
+            return self.store, delta
+        with job.stage("encode"):
+            return self.store.with_delta(merged, delta), delta
+
+    def on_ingest_progress(self, fraction):
+        self.ingest_status = f"Merging files... {fraction * 100:.0f}%"
+
+    def on_ingest_error(self, error):
+        self.add_files_button.config(state=tk.NORMAL)
+        self.ingest_status = ""
+        messagebox.showerror("Merge Error", f"Failed to merge the files. Error: {error}")
+
+    def on_files_merged(self, result, paths):
+        from utils.ingest import describe_delta, is_empty
+
+        store, delta = result
+        self.add_files_button.config(state=tk.NORMAL)
+        self.ingest_status = ""
+        if not is_empty(delta):
+            self.merged_paths += [path for path in paths if path not in self.merged_paths]
+            self.set_store(store, " (merged)")
+
+            # Open tabs take the merged table in place; unopened ones are built from it later
+            for tab in self.tabs.values():
+                if tab is not None:
+                    tab.refresh(store, delta)
+
+        messagebox.showinfo("Files Merged", describe_delta(delta))
+
+    def on_tab_changed(self, event):
+        index = self.notebook.index(self.notebook.select())
+        if index in self.tabs:
+            return
+
+        # Mark the tab as pending so repeated tab events don't build it twice
+        self.tabs[index] = None
+        loading_label = tk.Label(self.tab_frames[index], text="Loading...", font=('helvetica', 12))
+        loading_label.pack(pady=20)
+        self.root.after(10, self.build_tab, index, loading_label)
+
+    def build_tab(self, index, loading_label):
+        _, module_name, class_name = TABS[index]
+        try:
+            tab_class = getattr(importlib.import_module(module_name), class_name)
+            loading_label.destroy()
+            self.tabs[index] = tab_class(self.tab_frames[index], self.store, self.jobs, self.results)
+        except Exception as e:
+            del self.tabs[index]
+            loading_label.config(text="")
+            messagebox.showerror("Error", f"Failed to open tab. Error: {e}")
+
+    def on_close(self):
+        # Signal running jobs to stop so worker threads don't outlive the window
+        self.jobs.shutdown()
+        self.root.destroy()
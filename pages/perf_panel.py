@@ -0,0 +1,109 @@
+import tkinter as tk
+from tkinter import filedialog, messagebox, ttk
+
+# Collapsible "Performance" panel under the dashboard: one row per job run
+# with its stages nested below, plus cProfile output for profiled runs.
+
+
+class PerfPanel:
+    def __init__(self, parent, perf):
+        self.perf = perf
+        self.expanded = False
+        self.shown_version = None
+        self.profiles = {}
+        self.create_widgets(parent)
+
+    def create_widgets(self, parent):
+        self.frame = tk.Frame(parent)
+
+        self.toggle_button = tk.Button(self.frame, text="▸ Performance", command=self.toggle, relief="flat", font=('helvetica', 10, 'bold'))
+        self.toggle_button.pack(anchor="w")
+
+        self.body = tk.Frame(self.frame)
+
+        controls = tk.Frame(self.body)
+        controls.pack(fill="x", pady=3)
+
+        self.profile_var = tk.BooleanVar(value=self.perf.profile)
+        tk.Checkbutton(controls, text="Profile runs with cProfile", variable=self.profile_var, command=self.set_profiling).pack(side="left")
+        tk.Button(controls, text="Clear", command=self.clear).pack(side="left", padx=5)
+        tk.Button(controls, text="Export JSON", command=self.export_json).pack(side="left", padx=5)
+
+        panes = tk.Frame(self.body)
+        panes.pack(fill="x")
+
+        columns = ('Wall (s)', 'CPU (s)', 'Peak (MB)')
+        self.tree = ttk.Treeview(panes, columns=columns, height=8)
+        self.tree.heading('#0', text='Run / Stage')
+        self.tree.column('#0', width=260)
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=90, anchor="e")
+        self.tree.pack(side="left", fill="x", expand=True)
+        self.tree.bind("<<TreeviewSelect>>", self.show_profile)
+
+        self.profile_text = tk.Text(panes, height=10, width=70, font=('courier', 9), wrap="none")
+        self.profile_text.pack(side="left", fill="both", expand=True, padx=5)
+
+    def grid(self, **kwargs):
+        self.frame.grid(**kwargs)
+
+    def toggle(self):
+        self.expanded = not self.expanded
+        if self.expanded:
+            self.body.pack(fill="x")
+            self.toggle_button.config(text="▾ Performance")
+            self.refresh()
+        else:
+            self.body.pack_forget()
+            self.toggle_button.config(text="▸ Performance")
+
+    def set_profiling(self):
+        self.perf.profile = self.profile_var.get()
+
+    def clear(self):
+        self.perf.clear()
+        self.refresh()
+
+    def refresh(self):
+        # Cheap when collapsed or unchanged, so it can ride on the status bar timer
+        if not self.expanded or self.perf.version == self.shown_version:
+            return
+        self.shown_version = self.perf.version
+
+        self.tree.delete(*self.tree.get_children())
+        self.profiles = {}
+        for run in reversed(self.perf.snapshot()):
+            wall = f"{run['wall_s']:.3f}" if run['wall_s'] is not None else "running"
+            cpu = sum(stage['cpu_s'] for stage in run['stages'])
+            peak = max((stage['peak_mb'] for stage in run['stages']), default=0.0)
+            label = f"#{run['id']} {run['name']} ({run['started']})" + (" [profiled]" if 'profile' in run else "")
+            run_item = self.tree.insert('', 'end', text=label, values=(wall, f"{cpu:.3f}", f"{peak:.1f}"))
+            if 'profile' in run:
+                self.profiles[run_item] = run['profile']
+            for stage in run['stages']:
+                self.tree.insert(run_item, 'end', text=stage['stage'], values=(
+                    f"{stage['wall_s']:.3f}", f"{stage['cpu_s']:.3f}", f"{stage['peak_mb']:.1f}"
+                ))
+
+    def show_profile(self, event):
+        selection = self.tree.selection()
+        item = selection[0] if selection else None
+        if item is not None and self.tree.parent(item):
+            item = self.tree.parent(item)
+
+        self.profile_text.delete("1.0", tk.END)
+        self.profile_text.insert("1.0", self.profiles.get(item, "Enable profiling and select a profiled run to see its cProfile output."))
+
+    def export_json(self):
+        path = filedialog.asksaveasfilename(
+            title="Export Performance Data", defaultextension=".json", filetypes=[("JSON Files", "*.json")]
+        )
+        if not path:
+            return
+
+        try:
+            self.perf.export_json(path)
+            messagebox.showinfo("Export Complete", f"Saved {len(self.perf.runs)} runs to {path}.")
+        except Exception as e:
+            messagebox.showerror("Export Error", str(e))
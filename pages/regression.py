@@ -1,21 +1,33 @@
+import os
 import tkinter as tk
 from tkinter import messagebox, ttk
-import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from pages.figure_panel import FigurePanel
+from pages.scoring import save_model_dialog
+from pages.search_panel import SearchPanel
+from utils.pipelines import run_regression, REGRESSION_PARAMS
+from utils.plots import plot_regression
+from utils.progressive import preview_note, progressive_regression
+from utils.result_cache import result_key
+from utils.search import format_params
+from utils.streaming import run_streaming_regression
 
 class RegressionTab:
-    def __init__(self, notebook, df):
-        self.df = df
-        self.create_tab(notebook)
+    JOB_KEY = "regression"
 
-    def create_tab(self, notebook):
+    def __init__(self, parent, store, jobs, results):
+        self.store = store
+        self.results = results
+        self.df = store.df
+        self.jobs = jobs
+        self.last_result = None
+        self.last_config = None
+        self.last_preview = None
+        self.create_tab(parent)
+
+    def create_tab(self, parent):
         # Main frame for the tab
-        main_frame = tk.Frame(notebook)
-        notebook.add(main_frame, text="Regression")
+        main_frame = tk.Frame(parent)
+        main_frame.pack(fill="both", expand=True)
 
         # Scrollable frame setup
         canvas = tk.Canvas(main_frame)
@@ -53,9 +65,38 @@ class RegressionTab:
         self.target_dropdown = ttk.Combobox(scroll_frame, values=self.feature_list, font=('helvetica', 12), width=50)
         self.target_dropdown.pack(fill="x", padx=10, pady=5)
 
-        # Train Button
-        train_button = tk.Button(scroll_frame, text='Train Model', command=self.train_model, bg='green', fg='white', font=('helvetica', 12, 'bold'))
-        train_button.pack(pady=15)
+        self.progressive = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            scroll_frame, text="Progressive preview (sample first, refine in the background)",
+            variable=self.progressive, font=('helvetica', 11)
+        ).pack(anchor="w", padx=10)
+
+        # Train / Cancel Buttons
+        button_frame = tk.Frame(scroll_frame)
+        button_frame.pack(pady=15)
+
+        self.train_button = tk.Button(button_frame, text='Train Model', command=self.train_model, bg='green', fg='white', font=('helvetica', 12, 'bold'))
+        self.train_button.pack(side="left", padx=5)
+
+        self.cancel_button = tk.Button(button_frame, text='Cancel', command=self.cancel_training, state=tk.DISABLED, font=('helvetica', 12))
+        self.cancel_button.pack(side="left", padx=5)
+
+        self.save_button = tk.Button(button_frame, text='Save Model', command=self.save_model, state=tk.DISABLED, font=('helvetica', 12))
+        self.save_button.pack(side="left", padx=5)
+
+        # Out-of-core mode re-reads the source file in chunks instead of fitting on the loaded table
+        self.streaming = tk.BooleanVar(value=False)
+        self.streaming_check = tk.Checkbutton(
+            scroll_frame, text="Stream from the source file (out-of-core, CSV only)", variable=self.streaming,
+            font=('helvetica', 11)
+        )
+        self.streaming_check.pack(anchor="w", padx=10)
+        self.streaming_note = tk.Label(scroll_frame, text="", font=('helvetica', 10), fg='gray')
+        self.streaming_note.pack(anchor="w", padx=30)
+        self.update_streaming_state()
+
+        # Hyperparameter Search over a regularized linear model
+        self.search = SearchPanel(scroll_frame, self, 'regression')
 
         # Results Label
         self.results_label = tk.Label(scroll_frame, text="", font=('helvetica', 12), wraplength=600, justify="left")
@@ -68,6 +109,7 @@ class RegressionTab:
         # Plot Frame
         self.canvas_frame = tk.Frame(scroll_frame)
         self.canvas_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.figure = FigurePanel(self.canvas_frame, figsize=(6, 4))
 
         # Spacer for better scrolling experience
         spacer = tk.Frame(scroll_frame, height=50)
@@ -77,72 +119,178 @@ class RegressionTab:
         canvas.bind("<Configure>", lambda e: canvas.itemconfig(self.scrollable_window, width=e.width))
 
     def train_model(self):
-        try:
-            # Extract features and target
-            features = [f.strip() for f in self.features_entry.get().split(",")]
-            target = self.target_dropdown.get()
-
-            # Check if selections are valid
-            if not features or target == "" or target not in self.df.columns:
-                messagebox.showerror("Error", "Please select valid features and target.")
-                return
-
-            # Prepare data for training
-            X = self.df[features]
-            y = self.df[target]
-            X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.3, random_state=42)
-
-            # Train the model
-            model = LinearRegression()
-            model.fit(X_train, y_train)
-            predictions = model.predict(X_test)
-
-            # Calculate metrics
-            mse = mean_squared_error(y_test, predictions)
-            r2 = r2_score(y_test, predictions)
-            mae = mean_absolute_error(y_test, predictions)
-            rmse = mse ** 0.5
-            corr_coeff = y_test.corr(pd.Series(predictions, index=y_test.index))
-            rae = (mae / y_test.mean()) * 100
-            rrse = (rmse / y_test.std()) * 100
-            n = len(y_test)
-
-            # Plot the results
-            fig, ax = plt.subplots(figsize=(6, 4))
-            ax.scatter(y_test, predictions)
-            ax.plot([y_test.min(), y_test.max()], [y_test.min(), y_test.max()], color='red', lw=2)
-            ax.set_xlabel("True Values")
-            ax.set_ylabel("Predictions")
-            ax.set_title("True vs Predicted")
-
-            # Embed the plot in Tkinter
-            for widget in self.canvas_frame.winfo_children():
-                widget.destroy()  # Clear previous plot
-
-            canvas = FigureCanvasTkAgg(fig, master=self.canvas_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
-            # Display all metrics
-            self.results_label.config(
-                text=f"MSE: {mse:.2f}\nR²: {r2:.2f}\nMAE: {mae:.2f}\nRMSE: {rmse:.2f}\n"
-                    f"Correlation Coefficient: {corr_coeff:.2f}\n"
-                    f"RAE: {rae:.2f}%\nRRSE: {rrse:.2f}%\nTotal Instances: {n}"
+        if self.jobs.is_running(self.JOB_KEY):
+            return
+
+        inputs = self.selected_inputs()
+        if inputs is None:
+            return
+        features, target = inputs
+        streaming = self.streaming.get()
+        if streaming and self.streaming_unavailable():
+            messagebox.showerror("Error", f"Streaming is unavailable: {self.streaming_unavailable()}.")
+            return
+
+        self.set_running(True)
+        self.results_label.config(text="Training model... Please wait.")
+        self.last_config = {'features': features, 'target': target, 'streaming': streaming}
+        self.last_preview = None
+        if self.progressive.get() and not streaming:
+            self.jobs.submit(
+                self.JOB_KEY,
+                lambda job: self.run_progressive(job, features, target),
+                on_done=lambda outcome: self.show_results(*outcome),
+                on_error=self.on_job_error,
+                on_progress=self.on_preview,
+                on_cancel=self.on_preview_stopped
             )
+            return
+
+        self.jobs.submit(
+            self.JOB_KEY,
+            lambda job: self.run_cached(job, features, target, streaming),
+            on_done=lambda outcome: self.show_results(*outcome),
+            on_error=self.on_job_error,
+            on_progress=lambda message: self.results_label.config(text=message),
+            on_cancel=self.on_job_cancelled
+        )
+
+    def refresh(self, store, delta):
+        # Swap in the merged table; new columns become selectable without rebuilding the tab
+        self.store = store
+        self.df = store.df
+        self.feature_list = list(self.df.columns)
+        self.target_dropdown.config(values=self.feature_list)
+        self.update_streaming_state()
+
+    def streaming_unavailable(self):
+        # Why out-of-core mode cannot re-read the table, or None when it can
+        source = self.store.source
+        if not source:
+            # e.g. a merged table is no longer one file that can be streamed again
+            return "the table was not loaded from a single file"
+        if os.path.splitext(source)[-1].lower() != '.csv':
+            return "the source file is not a CSV"
+        return None
+
+    def update_streaming_state(self):
+        reason = self.streaming_unavailable()
+        if reason is not None:
+            self.streaming.set(False)
+        self.streaming_check.config(state=tk.DISABLED if reason else tk.NORMAL)
+        self.streaming_note.config(text=f"Unavailable: {reason}." if reason else "")
+
+    def recompute(self, store, job):
+        # Worker thread: repeats the last run on a reloaded dataset
+        if self.last_config is None:
+            return None
+        return self.run_cached(job, **self.last_config, store=store)
+
+    def reload(self, store, outcome):
+        self.refresh(store, None)
+        if outcome is not None and not self.jobs.is_running(self.JOB_KEY):
+            self.show_results(*outcome)
 
-            # Interpretation Logic
-            if r2 >= 0.9:
-                comment = "This is an excellent fit. The model explains almost all variability in the data."
-            elif r2 >= 0.7:
-                comment = "This is a good fit. The model explains most of the variability."
-            elif r2 >= 0.5:
-                comment = "This is a moderate fit. The model explains some of the variability."
-            else:
-                comment = "This is a poor fit. Consider using more features, a different model, or data preprocessing."
+    def selected_inputs(self):
+        # Extract features and target
+        features = [f.strip() for f in self.features_entry.get().split(",")]
+        target = self.target_dropdown.get()
 
-            interpretation = f"R² Score: {r2:.2f} → {comment}"
-            self.interpretation_label.config(text=interpretation)
+        # Check if selections are valid
+        if not features or target == "" or target not in self.df.columns:
+            messagebox.showerror("Error", "Please select valid features and target.")
+            return None
+        return features, target
+
+    def cancel_training(self):
+        self.jobs.cancel(self.JOB_KEY)
+
+    def set_running(self, running):
+        self.train_button.config(state=tk.DISABLED if running else tk.NORMAL)
+        self.cancel_button.config(state=tk.NORMAL if running else tk.DISABLED)
+
+    def on_job_error(self, error):
+        self.set_running(False)
+        self.results_label.config(text="")
+        messagebox.showerror("Error", str(error))
+
+    def on_job_cancelled(self):
+        self.set_running(False)
+        self.results_label.config(text="Training cancelled.")
+
+    def run_cached(self, job, features, target, streaming=False, store=None):
+        # Runs on a worker thread: no Tk calls in here, only job.report()
+        store = store if store is not None else self.store
+        key = self.cache_key(store, features, target, streaming)
+        if streaming:
+            return self.results.get_or_compute(
+                key, lambda: run_streaming_regression(store.source, features, target, progress=job.report, stages=job)
+            )
+        return self.results.get_or_compute(
+            key, lambda: run_regression(store, features, target, progress=job.report, stages=job)
+        )
+
+    def run_progressive(self, job, features, target):
+        # The finished run is the full-data result, so it shares the regular cache entry
+        return self.results.get_or_compute(
+            self.cache_key(self.store, features, target),
+            lambda: progressive_regression(self.store, features, target, progress=job.report, stages=job)
+        )
+
+    def cache_key(self, store, features, target, streaming=False):
+        return result_key(store.fingerprint, self.JOB_KEY, features, target, streaming=streaming, **REGRESSION_PARAMS)
+
+    def on_preview(self, payload):
+        # A progressive run's intermediate results; the run carries on, so the tab stays busy
+        if isinstance(payload, dict):
+            self.last_preview = payload
+            self.show_results(payload)
+            self.set_running(True)
+
+    def on_preview_stopped(self):
+        if self.last_preview is None:
+            self.on_job_cancelled()
+            return
+        # Stopping early keeps the last preview on screen
+        self.last_preview['stopped'] = True
+        self.show_results(self.last_preview)
+
+    def save_model(self):
+        if self.last_result is not None:
+            save_model_dialog(self.last_result, 'regression', self.store)
+
+    def show_results(self, result, cached=False):
+        self.set_running(False)
+        # A preview's model saw only a sample, so it cannot be saved
+        preview = result.get('preview', False)
+        self.last_result = None if preview else result
+        self.save_button.config(state=tk.DISABLED if preview else tk.NORMAL)
+        r2 = result['r2']
+
+        # Plot the results
+        self.figure.show(plot_regression, result)
+
+        # Display all metrics
+        self.results_label.config(
+            text=f"MSE: {result['mse']:.2f}\nR²: {r2:.2f}\nMAE: {result['mae']:.2f}\nRMSE: {result['rmse']:.2f}\n"
+                f"Correlation Coefficient: {result['corr_coeff']:.2f}\n"
+                f"RAE: {result['rae']:.2f}%\nRRSE: {result['rrse']:.2f}%\nTotal Instances: {result['n']}"
+                + (f"\nStreamed: {result['n_train']:,} training rows, {result['rows_skipped']:,} incomplete rows skipped"
+                   if result.get('streamed') else "")
+                + (f"\nModel: Ridge ({format_params(result['model_params'])})" if result.get('model_params') else "")
+                + ("\n(cached result)" if cached else "")
+                + (f"\n{preview_note(result)}" if preview_note(result) else "")
+        )
 
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        # Interpretation Logic
+        if r2 >= 0.9:
+            comment = "This is an excellent fit. The model explains almost all variability in the data."
+        elif r2 >= 0.7:
+            comment = "This is a good fit. The model explains most of the variability."
+        elif r2 >= 0.5:
+            comment = "This is a moderate fit. The model explains some of the variability."
+        else:
+            comment = "This is a poor fit. Consider using more features, a different model, or data preprocessing."
 
+        interpretation = f"R² Score: {r2:.2f} → {comment}"
+        self.interpretation_label.config(text=interpretation)
@@ -0,0 +1,171 @@
+import tkinter as tk
+from tkinter import filedialog, messagebox, ttk
+import numpy as np
+
+# Rule table that only materializes the visible window of rows. Sorting and
+# filtering run on the rules DataFrame; the Treeview keeps a fixed set of row
+# items whose values are swapped as the user scrolls.
+
+VISIBLE_ROWS = 20
+METRICS = ['support', 'confidence', 'lift', 'conviction']
+
+
+class RuleViewer:
+    def __init__(self, parent):
+        self.rules = None
+        self.order = np.array([], dtype=np.int64)
+        self.offset = 0
+        self.create_widgets(parent)
+
+    def create_widgets(self, parent):
+        frame = tk.Frame(parent)
+        frame.pack(fill="both", expand=True, padx=10)
+
+        # Sort / Filter Controls
+        controls = tk.Frame(frame)
+        controls.pack(fill="x", pady=5)
+
+        tk.Label(controls, text="Sort by:", font=('helvetica', 11)).grid(row=0, column=0, sticky="w")
+        self.sort_dropdown = ttk.Combobox(controls, values=METRICS, state="readonly", width=12)
+        self.sort_dropdown.set('lift')
+        self.sort_dropdown.grid(row=0, column=1, padx=5)
+        self.sort_dropdown.bind("<<ComboboxSelected>>", lambda e: self.apply_view())
+
+        self.descending = tk.BooleanVar(value=True)
+        tk.Checkbutton(controls, text="Descending", variable=self.descending, command=self.apply_view).grid(row=0, column=2, padx=5)
+
+        self.filter_entries = {}
+        for i, metric in enumerate(METRICS):
+            tk.Label(controls, text=f"Min {metric}:", font=('helvetica', 11)).grid(row=1, column=2 * i, sticky="w")
+            entry = tk.Entry(controls, width=8)
+            entry.grid(row=1, column=2 * i + 1, padx=5, pady=3)
+            entry.bind("<Return>", lambda e: self.apply_view())
+            self.filter_entries[metric] = entry
+
+        tk.Button(controls, text="Apply Filters", command=self.apply_view).grid(row=0, column=3, padx=5)
+        tk.Button(controls, text="Export CSV", command=self.export_csv).grid(row=0, column=4, padx=5)
+
+        # Rule Table with a virtual scrollbar
+        table = tk.Frame(frame)
+        table.pack(fill="both", expand=True)
+
+        columns = ('Antecedents', 'Consequents', 'Support', 'Confidence', 'Lift', 'Conviction')
+        self.tree = ttk.Treeview(table, columns=columns, show='headings', height=VISIBLE_ROWS)
+        widths = {'Antecedents': 150, 'Consequents': 150, 'Support': 80, 'Confidence': 90, 'Lift': 70, 'Conviction': 90}
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=widths[col])
+        for metric in METRICS:
+            self.tree.heading(metric.capitalize(), command=lambda m=metric: self.sort_by(m))
+
+        self.scrollbar = ttk.Scrollbar(table, orient="vertical", command=self.on_scroll)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll_rows(-1 if e.delta > 0 else 1))
+        self.tree.bind("<Button-4>", lambda e: self.scroll_rows(-1))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_rows(1))
+
+        self.row_ids = [self.tree.insert('', 'end', values=()) for _ in range(VISIBLE_ROWS)]
+
+        self.status_label = tk.Label(frame, text="", font=('helvetica', 10), anchor="w")
+        self.status_label.pack(fill="x")
+
+        self.render()
+
+    def clear(self):
+        self.set_rules(None)
+
+    def set_rules(self, rules):
+        self.rules = rules
+        self.apply_view()
+
+    def sort_by(self, metric):
+        if self.sort_dropdown.get() == metric:
+            self.descending.set(not self.descending.get())
+        self.sort_dropdown.set(metric)
+        self.apply_view()
+
+    def apply_view(self):
+        if self.rules is None or self.rules.empty:
+            self.order = np.array([], dtype=np.int64)
+        else:
+            try:
+                mask = np.ones(len(self.rules), dtype=bool)
+                for metric, entry in self.filter_entries.items():
+                    if entry.get().strip():
+                        mask &= self.rules[metric].to_numpy() >= float(entry.get())
+            except ValueError:
+                messagebox.showerror("Error", "Filter thresholds must be numbers.")
+                return
+
+            selected = np.flatnonzero(mask)
+            values = self.rules[self.sort_dropdown.get()].to_numpy()[selected]
+            order = np.argsort(-values if self.descending.get() else values, kind='stable')
+            self.order = selected[order]
+
+        self.offset = 0
+        self.render()
+
+    def on_scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            self.offset = int(float(amount) * len(self.order))
+            self.render()
+        elif action == "scroll":
+            step = VISIBLE_ROWS if unit == "pages" else 1
+            self.scroll_rows(int(amount) * step)
+
+    def scroll_rows(self, delta):
+        self.offset += delta
+        self.render()
+
+    def render(self):
+        total = len(self.order)
+        self.offset = max(0, min(self.offset, total - VISIBLE_ROWS))
+        window = self.order[self.offset:self.offset + VISIBLE_ROWS]
+
+        # Only the visible slice is formatted and pushed into Tk
+        rows = self.rules.iloc[window] if len(window) else None
+        for i, row_id in enumerate(self.row_ids):
+            if rows is not None and i < len(rows):
+                rule = rows.iloc[i]
+                self.tree.item(row_id, values=(
+                    ', '.join(sorted(rule['antecedents'])),
+                    ', '.join(sorted(rule['consequents'])),
+                    f"{rule['support']:.3f}",
+                    f"{rule['confidence']:.3f}",
+                    f"{rule['lift']:.3f}",
+                    f"{rule['conviction']:.3f}"
+                ))
+            else:
+                self.tree.item(row_id, values=())
+
+        if total:
+            self.scrollbar.set(self.offset / total, min(self.offset + VISIBLE_ROWS, total) / total)
+            shown = f"Rules {self.offset + 1}-{self.offset + len(window)} of {total:,}"
+            if self.rules is not None and total != len(self.rules):
+                shown += f" (filtered from {len(self.rules):,})"
+            self.status_label.config(text=shown)
+        else:
+            self.scrollbar.set(0, 1)
+            self.status_label.config(text="")
+
+    def export_csv(self):
+        if self.rules is None or self.rules.empty:
+            messagebox.showerror("Error", "There are no rules to export.")
+            return
+
+        path = filedialog.asksaveasfilename(
+            title="Export Rules", defaultextension=".csv", filetypes=[("CSV Files", "*.csv")]
+        )
+        if not path:
+            return
+
+        try:
+            export = self.rules.copy()
+            for col in ['antecedents', 'consequents']:
+                export[col] = export[col].map(lambda itemset: ', '.join(sorted(itemset)))
+            export.to_csv(path, index=False)
+            messagebox.showinfo("Export Complete", f"Saved {len(export):,} rules to {path}.")
+        except Exception as e:
+            messagebox.showerror("Export Error", str(e))
@@ -0,0 +1,169 @@
+import os
+import tkinter as tk
+from tkinter import filedialog, messagebox, ttk
+from utils.model_store import SavedPipeline, save_pipeline, score_file
+
+# Batch scoring with saved pipelines: load a model saved from one of the
+# model tabs and stream predictions for a new file to CSV, no retraining.
+
+
+def save_model_dialog(result, task, store):
+    # Shared by the model tabs' "Save Model" buttons
+    directory = filedialog.askdirectory(title="Choose a Folder for the Saved Model")
+    if not directory:
+        return
+
+    try:
+        save_pipeline(result, task, directory, store)
+        messagebox.showinfo("Model Saved", f"Saved the {task} model to {directory}.")
+    except Exception as e:
+        messagebox.showerror("Save Error", str(e))
+
+
+def parse_column_map(text):
+    # "model feature=file column, ..." for files whose columns are named differently
+    column_map = {}
+    for part in text.split(','):
+        if not part.strip():
+            continue
+        if '=' not in part:
+            raise ValueError(f"Expected feature=column in '{part.strip()}'.")
+        feature, column = part.split('=', 1)
+        column_map[feature.strip()] = column.strip()
+    return column_map
+
+
+class ScoringTab:
+    JOB_KEY = "scoring"
+
+    def __init__(self, parent, store, jobs, results):
+        self.store = store
+        self.jobs = jobs
+        self.results = results
+        self.pipeline = None
+        self.create_tab(parent)
+
+    def refresh(self, store, delta):
+        self.store = store
+
+    def recompute(self, store, job):
+        # Scoring reads its own files, so a reloaded dataset has nothing to rerun
+        return None
+
+    def reload(self, store, outcome):
+        self.refresh(store, None)
+
+    def create_tab(self, parent):
+        main_frame = tk.Frame(parent)
+        main_frame.pack(fill="both", expand=True)
+
+        title_label = tk.Label(main_frame, text="Batch Scoring", font=('helvetica', 16, 'bold'))
+        title_label.pack(pady=15)
+
+        self.load_button = tk.Button(main_frame, text='Load Saved Model', command=self.load_model, bg='gray', fg='white', font=('helvetica', 12, 'bold'))
+        self.load_button.pack(pady=5)
+
+        self.model_label = tk.Label(main_frame, text="No model loaded.", font=('helvetica', 12), wraplength=700, justify="left")
+        self.model_label.pack(padx=10, pady=10)
+
+        map_label = tk.Label(main_frame, text="Column Mapping (optional, feature=column, ...):", font=('helvetica', 12))
+        map_label.pack(anchor="w", padx=10)
+
+        self.map_entry = tk.Entry(main_frame, font=('helvetica', 12), width=70)
+        self.map_entry.pack(fill="x", padx=10, pady=5)
+
+        button_frame = tk.Frame(main_frame)
+        button_frame.pack(pady=15)
+
+        self.score_button = tk.Button(button_frame, text='Score File', command=self.score, state=tk.DISABLED, bg='blue', fg='white', font=('helvetica', 12, 'bold'))
+        self.score_button.pack(side="left", padx=5)
+
+        self.cancel_button = tk.Button(button_frame, text='Cancel', command=lambda: self.jobs.cancel(self.JOB_KEY), state=tk.DISABLED, font=('helvetica', 12))
+        self.cancel_button.pack(side="left", padx=5)
+
+        self.progress_bar = ttk.Progressbar(main_frame, orient="horizontal", length=400, mode="determinate")
+        self.progress_bar.pack(pady=5)
+
+        self.results_label = tk.Label(main_frame, text="", font=('helvetica', 12), wraplength=700, justify="left")
+        self.results_label.pack(padx=10, pady=10)
+
+    def load_model(self):
+        directory = filedialog.askdirectory(title="Choose a Saved Model Folder")
+        if not directory:
+            return
+
+        try:
+            self.pipeline = SavedPipeline(directory)
+        except Exception as e:
+            messagebox.showerror("Load Error", str(e))
+            return
+
+        manifest = self.pipeline.manifest
+        metrics = ', '.join(f"{name}: {value:.3f}" for name, value in manifest['metrics'].items())
+        self.model_label.config(text=(
+            f"Task: {manifest['task'].capitalize()}\n"
+            f"Features: {', '.join(manifest['features'])}\n"
+            + (f"Target: {manifest['target']}\n" if manifest['target'] else "")
+            + f"Saved: {manifest['created']}\n"
+            f"Training Metrics: {metrics or 'none recorded'}"
+        ))
+        self.score_button.config(state=tk.NORMAL)
+
+    def score(self):
+        if self.pipeline is None or self.jobs.is_running(self.JOB_KEY):
+            return
+
+        try:
+            column_map = parse_column_map(self.map_entry.get())
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+
+        path = filedialog.askopenfilename(
+            title="Choose a File to Score",
+            filetypes=[("CSV Files", "*.csv"), ("Excel Files", "*.xls *.xlsx")]
+        )
+        if not path:
+            return
+        output_path = filedialog.asksaveasfilename(
+            title="Save Predictions", defaultextension=".csv", filetypes=[("CSV Files", "*.csv")],
+            initialfile=os.path.splitext(os.path.basename(path))[0] + "_scored.csv"
+        )
+        if not output_path:
+            return
+
+        self.set_running(True)
+        self.progress_bar['value'] = 0
+        self.results_label.config(text="Scoring...")
+        pipeline = self.pipeline
+        self.jobs.submit(
+            self.JOB_KEY,
+            lambda job: score_file(pipeline, path, output_path, column_map, progress=job.report),
+            on_done=self.show_results,
+            on_error=self.on_job_error,
+            on_progress=lambda fraction: self.progress_bar.config(value=fraction * 100),
+            on_cancel=self.on_job_cancelled
+        )
+
+    def set_running(self, running):
+        self.score_button.config(state=tk.DISABLED if running else tk.NORMAL)
+        self.load_button.config(state=tk.DISABLED if running else tk.NORMAL)
+        self.cancel_button.config(state=tk.NORMAL if running else tk.DISABLED)
+
+    def on_job_error(self, error):
+        self.set_running(False)
+        self.results_label.config(text="")
+        messagebox.showerror("Scoring Error", str(error))
+
+    def on_job_cancelled(self):
+        self.set_running(False)
+        self.results_label.config(text="Scoring cancelled.")
+
+    def show_results(self, summary):
+        self.set_running(False)
+        self.progress_bar['value'] = 100
+        unseen = summary['unseen_categories']
+        self.results_label.config(text=(
+            f"Scored {summary['rows']:,} rows into {summary['output']}."
+            + (f"\n{unseen:,} values had categories the model never saw." if unseen else "")
+        ))
@@ -0,0 +1,152 @@
+import tkinter as tk
+from tkinter import messagebox, ttk
+from utils.result_cache import result_key
+from utils.search import (
+    DEFAULT_SPACES, EARLY_STOP_MARGIN, SEARCH_FOLDS, TIME_BUDGET,
+    format_params, parse_space, run_search
+)
+
+# Hyperparameter search controls and live leaderboard, shared by the
+# classification and regression tabs. The tab supplies its inputs through
+# selected_inputs() and displays the refitted best model with show_results().
+
+METHOD_NAMES = {'Grid search': 'grid', 'Random search': 'random', 'Successive halving': 'halving'}
+
+
+class SearchPanel:
+    def __init__(self, parent, tab, task):
+        self.tab = tab
+        self.task = task
+        self.job_key = f"{tab.JOB_KEY}-search"
+        self.create_widgets(parent)
+
+    def create_widgets(self, parent):
+        frame = tk.LabelFrame(parent, text="Hyperparameter Search", font=('helvetica', 12, 'bold'))
+        frame.pack(fill="x", padx=10, pady=10)
+
+        controls = tk.Frame(frame)
+        controls.pack(fill="x", pady=5)
+
+        tk.Label(controls, text="Method:", font=('helvetica', 11)).grid(row=0, column=0, sticky="w")
+        self.method_dropdown = ttk.Combobox(controls, values=list(METHOD_NAMES), state="readonly", width=18)
+        self.method_dropdown.set('Grid search')
+        self.method_dropdown.grid(row=0, column=1, padx=5, sticky="w")
+
+        tk.Label(controls, text="Time budget (s):", font=('helvetica', 11)).grid(row=0, column=2, sticky="w")
+        self.budget_entry = tk.Entry(controls, width=8)
+        self.budget_entry.insert(0, str(int(TIME_BUDGET)))
+        self.budget_entry.grid(row=0, column=3, padx=5, sticky="w")
+
+        tk.Label(controls, text="Parameters:", font=('helvetica', 11)).grid(row=1, column=0, sticky="w")
+        self.space_entry = tk.Entry(controls, width=60)
+        self.space_entry.insert(0, DEFAULT_SPACES[self.task])
+        self.space_entry.grid(row=1, column=1, columnspan=3, padx=5, pady=3, sticky="we")
+
+        buttons = tk.Frame(frame)
+        buttons.pack(pady=5)
+        self.search_button = tk.Button(buttons, text='Search', command=self.start_search, bg='purple', fg='white', font=('helvetica', 11, 'bold'))
+        self.search_button.pack(side="left", padx=5)
+        self.cancel_button = tk.Button(buttons, text='Cancel', command=lambda: self.tab.jobs.cancel(self.job_key), state=tk.DISABLED, font=('helvetica', 11))
+        self.cancel_button.pack(side="left", padx=5)
+
+        columns = ('Rank', 'Parameters', 'Score', 'Std', 'Folds', 'Rows', 'Status', 'Time (s)')
+        self.tree = ttk.Treeview(frame, columns=columns, show='headings', height=6)
+        widths = {'Rank': 45, 'Parameters': 300, 'Score': 70, 'Std': 60, 'Folds': 50, 'Rows': 70, 'Status': 70, 'Time (s)': 70}
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=widths[col])
+        self.tree.pack(fill="x", padx=5)
+
+        self.status_label = tk.Label(frame, text="", font=('helvetica', 10), anchor="w")
+        self.status_label.pack(fill="x", padx=5, pady=3)
+
+    def start_search(self):
+        if self.tab.jobs.is_running(self.job_key):
+            return
+
+        inputs = self.tab.selected_inputs()
+        if inputs is None:
+            return
+        features, target = inputs
+
+        try:
+            space = parse_space(self.space_entry.get())
+            budget = float(self.budget_entry.get())
+            if budget <= 0:
+                raise ValueError("The time budget must be positive.")
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+
+        method = METHOD_NAMES[self.method_dropdown.get()]
+        self.set_running(True)
+        self.show_leaderboard([])
+        self.status_label.config(text="Starting search workers...")
+        self.tab.jobs.submit(
+            self.job_key,
+            lambda job: self.run_cached(job, features, target, space, method, budget),
+            on_done=lambda outcome: self.show_search(*outcome),
+            on_error=self.on_job_error,
+            on_progress=self.on_progress,
+            on_cancel=self.on_job_cancelled
+        )
+
+    def run_cached(self, job, features, target, space, method, budget):
+        # Runs on a worker thread: no Tk calls in here, only job.report()
+        key = result_key(
+            self.tab.store.fingerprint, self.job_key, features, target, space=space, method=method,
+            budget=budget, folds=SEARCH_FOLDS, margin=EARLY_STOP_MARGIN
+        )
+        return self.tab.results.get_or_compute(
+            key, lambda: run_search(
+                self.tab.store, self.task, features, target, space, method, time_budget=budget, progress=job.report, stages=job
+            )
+        )
+
+    def set_running(self, running):
+        self.search_button.config(state=tk.DISABLED if running else tk.NORMAL)
+        self.cancel_button.config(state=tk.NORMAL if running else tk.DISABLED)
+
+    def on_progress(self, payload):
+        if isinstance(payload, dict):
+            self.show_leaderboard(payload['leaderboard'])
+            self.status_label.config(text=f"Evaluated {payload['done']}/{payload['total']} candidates this round...")
+        else:
+            self.status_label.config(text=payload)
+
+    def on_job_error(self, error):
+        self.set_running(False)
+        self.status_label.config(text="")
+        messagebox.showerror("Search Error", str(error))
+
+    def on_job_cancelled(self):
+        self.set_running(False)
+        self.status_label.config(text="Search cancelled.")
+
+    def show_leaderboard(self, entries):
+        self.tree.delete(*self.tree.get_children())
+        for rank, entry in enumerate(entries, start=1):
+            self.tree.insert('', 'end', values=(
+                rank,
+                format_params(entry['params']),
+                f"{entry['score']:.3f}",
+                f"{entry['std']:.3f}",
+                entry['folds'],
+                'all' if entry['rows'] is None else f"{entry['rows']:,}",
+                entry['status'],
+                f"{entry['seconds']:.1f}",
+            ))
+
+    def show_search(self, search, cached=False):
+        self.set_running(False)
+        self.show_leaderboard(search['leaderboard'])
+
+        note = " Time budget ran out; showing the best finished candidate." if search['timed_out'] else ""
+        if cached:
+            note += " (cached result)"
+        self.status_label.config(text=(
+            f"Best of {search['evaluated']} evaluations: {format_params(search['best_params'])} "
+            f"(CV score {search['best_score']:.3f}).{note}"
+        ))
+        # The refitted best model replaces whatever the tab was showing
+        self.tab.show_results(search['result'], cached=cached)
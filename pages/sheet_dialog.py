@@ -0,0 +1,39 @@
+import os
+import tkinter as tk
+from tkinter import ttk
+
+# Modal chooser for workbooks with more than one sheet; pandas used to read
+# the first sheet without asking.
+
+
+def ask_sheet(root, path, sheets):
+    # Returns the chosen sheet name, or None if the dialog was cancelled
+    if len(sheets) == 1:
+        return sheets[0]
+
+    dialog = tk.Toplevel(root)
+    dialog.title("Select a Sheet")
+    dialog.transient(root)
+    dialog.resizable(False, False)
+    choice = {'sheet': None}
+
+    tk.Label(dialog, text=f"{os.path.basename(path)} has {len(sheets)} sheets. Load:", font=('helvetica', 12)).pack(padx=15, pady=(15, 5))
+
+    sheet_dropdown = ttk.Combobox(dialog, values=sheets, state="readonly", font=('helvetica', 12), width=40)
+    sheet_dropdown.set(sheets[0])
+    sheet_dropdown.pack(padx=15, pady=5)
+
+    def confirm():
+        choice['sheet'] = sheet_dropdown.get()
+        dialog.destroy()
+
+    button_frame = tk.Frame(dialog)
+    button_frame.pack(pady=10)
+    tk.Button(button_frame, text="Load", command=confirm, bg='green', fg='white', font=('helvetica', 11, 'bold'), width=10).pack(side="left", padx=5)
+    tk.Button(button_frame, text="Cancel", command=dialog.destroy, font=('helvetica', 11), width=10).pack(side="left", padx=5)
+
+    dialog.bind("<Return>", lambda e: confirm())
+    dialog.bind("<Escape>", lambda e: dialog.destroy())
+    dialog.grab_set()
+    root.wait_window(dialog)
+    return choice['sheet']
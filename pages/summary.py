@@ -0,0 +1,178 @@
+import tkinter as tk
+from tkinter import messagebox, ttk
+import numpy as np
+from pages.figure_panel import FigurePanel
+from utils.plots import plot_trend
+
+# Production summary read from the long-format series store: totals and
+# year-over-year growth per region or species, and quarterly species trends.
+
+GROUPS = {'Region': 'Geolocation', 'Species': 'Species'}
+
+
+class SummaryTab:
+    JOB_KEY = "summary"
+
+    def __init__(self, parent, store, jobs, results):
+        self.store = store
+        self.jobs = jobs
+        self.results = results
+        self.series = None
+        self.create_tab(parent)
+
+    def create_tab(self, parent):
+        main_frame = tk.Frame(parent)
+        main_frame.pack(fill="both", expand=True)
+
+        canvas = tk.Canvas(main_frame)
+        scrollbar = tk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
+        scroll_frame = tk.Frame(canvas)
+
+        scroll_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        )
+
+        self.scrollable_window = canvas.create_window((0, 0), window=scroll_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        title_label = tk.Label(scroll_frame, text="Production Summary", font=('helvetica', 16, 'bold'))
+        title_label.pack(pady=15)
+
+        # Totals Controls
+        controls = tk.Frame(scroll_frame)
+        controls.pack(fill="x", padx=10, pady=5)
+
+        tk.Label(controls, text="Group by:", font=('helvetica', 12)).pack(side="left")
+        self.group_dropdown = ttk.Combobox(controls, values=list(GROUPS), state="readonly", width=12)
+        self.group_dropdown.set('Region')
+        self.group_dropdown.pack(side="left", padx=5)
+        self.group_dropdown.bind("<<ComboboxSelected>>", lambda e: self.show_totals())
+
+        tk.Label(controls, text="Year:", font=('helvetica', 12)).pack(side="left", padx=(15, 0))
+        self.year_dropdown = ttk.Combobox(controls, state="readonly", width=8)
+        self.year_dropdown.pack(side="left", padx=5)
+        self.year_dropdown.bind("<<ComboboxSelected>>", lambda e: self.show_totals())
+
+        # Totals Table
+        table = tk.Frame(scroll_frame)
+        table.pack(fill="x", padx=10, pady=5)
+
+        columns = ('Name', 'Production', 'Share', 'YoY Growth')
+        self.tree = ttk.Treeview(table, columns=columns, show='headings', height=12)
+        widths = {'Name': 320, 'Production': 120, 'Share': 80, 'YoY Growth': 100}
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=widths[col], anchor="w" if col == 'Name' else "e")
+        tree_scroll = ttk.Scrollbar(table, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=tree_scroll.set)
+        self.tree.pack(side="left", fill="x", expand=True)
+        tree_scroll.pack(side="right", fill="y")
+
+        self.totals_label = tk.Label(scroll_frame, text="Reshaping the dataset...", font=('helvetica', 12), justify="left")
+        self.totals_label.pack(anchor="w", padx=10, pady=5)
+
+        # Species Trend
+        trend_controls = tk.Frame(scroll_frame)
+        trend_controls.pack(fill="x", padx=10, pady=5)
+
+        tk.Label(trend_controls, text="Species trend:", font=('helvetica', 12)).pack(side="left")
+        self.species_dropdown = ttk.Combobox(trend_controls, state="readonly", width=40)
+        self.species_dropdown.pack(side="left", padx=5)
+        self.species_dropdown.bind("<<ComboboxSelected>>", lambda e: self.show_trend())
+
+        self.canvas_frame = tk.Frame(scroll_frame)
+        self.canvas_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.figure = FigurePanel(self.canvas_frame, figsize=(8, 4))
+
+        spacer = tk.Frame(scroll_frame, height=50)
+        spacer.pack()
+
+        canvas.bind("<Configure>", lambda e: canvas.itemconfig(self.scrollable_window, width=e.width))
+
+        self.load_series()
+
+    def load_series(self):
+        # The reshape is one-off but not instant on large tables
+        store = self.store
+        self.jobs.submit(
+            self.JOB_KEY,
+            lambda job: store.series,
+            on_done=lambda series: self.on_series_ready(store, series),
+            on_error=self.on_job_error
+        )
+
+    def refresh(self, store, delta):
+        # New quarters change every aggregate, so the merged table is reshaped again
+        self.store = store
+        self.series = None
+        self.totals_label.config(text="Reshaping the dataset...")
+        self.load_series()
+
+    def recompute(self, store, job):
+        # Worker thread: reshapes a reloaded dataset before it is swapped in
+        with job.stage("series"):
+            return store.series
+
+    def reload(self, store, series):
+        self.store = store
+        if series is None:
+            self.refresh(store, None)
+        else:
+            self.on_series_ready(store, series)
+
+    def on_job_error(self, error):
+        self.totals_label.config(text="")
+        messagebox.showerror("Error", f"Could not build the summary: {error}")
+
+    def on_series_ready(self, store, series):
+        if store is not self.store:
+            # More files were merged while this reshape ran
+            self.load_series()
+            return
+
+        self.series = series
+        years = series.years
+        self.year_dropdown.config(values=years)
+        if self.year_dropdown.get() not in map(str, years):
+            self.year_dropdown.set(years[-1])
+        self.species_dropdown.config(values=series.species)
+        if series.species and self.species_dropdown.get() not in series.species:
+            self.species_dropdown.set(series.species[0])
+
+        self.show_totals()
+        self.show_trend()
+
+    def show_totals(self):
+        if self.series is None:
+            return
+
+        by = GROUPS[self.group_dropdown.get()]
+        year = int(self.year_dropdown.get())
+        totals = self.series.annual_totals(by)[year].dropna().sort_values(ascending=False)
+        growth = self.series.yoy_growth(by)[year]
+        overall = totals.sum()
+
+        self.tree.delete(*self.tree.get_children())
+        for name, value in totals.items():
+            change = growth.get(name, np.nan)
+            self.tree.insert('', 'end', values=(
+                name,
+                f"{value:,.2f}",
+                f"{value / overall * 100:.1f}%" if overall else "",
+                f"{change:+.1f}%" if np.isfinite(change) else "n/a",
+            ))
+
+        all_growth = self.series.yoy_growth(None)[year].iloc[0]
+        growth_text = f" ({all_growth:+.1f}% on {year - 1})" if np.isfinite(all_growth) else ""
+        self.totals_label.config(text=f"Total production in {year}: {overall:,.2f}{growth_text}")
+
+    def show_trend(self):
+        species = self.species_dropdown.get()
+        if self.series is None or not species:
+            return
+
+        self.figure.show(plot_trend, {'trend': self.series.species_trend(species), 'name': species})
@@ -0,0 +1,360 @@
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from cli import JOB_TYPES, compute_job, job_key, job_metrics, to_json
+
+# Local job service for the dashboard pipelines, so a team can share one warm
+# process: datasets are loaded once and shared by every request, and pipeline
+# results are cached across users. An asyncio front end accepts requests and
+# queues jobs; a fixed number of workers run them on a thread pool. Clients
+# poll a job until it is done.
+#
+#   POST /datasets  {"path": "data/fisheries-raw-dataset.csv"}  -> {"id": ..., "rows": ..., "columns": [...]}
+#   GET  /datasets
+#   POST /jobs      {"dataset": ID, "type": "classification", "features": [...], "target": "..."}  -> 202 {"id": ...}
+#   GET  /jobs/ID   -> {"status": "queued" | "running" | "done" | "error" | "cancelled", "metrics": {...}, ...}
+#   GET  /jobs
+#   DELETE /jobs/ID (queued jobs only)
+#   GET  /health
+#
+# Job bodies take the same fields as the cli.py job spec. Identical jobs
+# submitted while one of them runs share that one computation.
+#
+# Usage: python server.py [--port 8765] [--workers N] [--queue-size N]
+
+HOST = "127.0.0.1"
+PORT = 8765
+WORKERS = min(4, os.cpu_count() or 1)
+QUEUE_SIZE = 64
+
+# Finished jobs kept for polling before the oldest are dropped
+MAX_FINISHED_JOBS = 500
+MAX_BODY_BYTES = 1024 * 1024
+# Seconds a client gets to send its request line, headers and body
+READ_TIMEOUT = 10.0
+TOP_RULES = 20
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class JobService:
+    def __init__(self, workers=WORKERS, queue_size=QUEUE_SIZE, results=None):
+        from utils.result_cache import ResultCache
+
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="server-job")
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.results = results if results is not None else ResultCache()
+        self.datasets = {}
+        self.jobs = {}
+        self._ids = itertools.count(1)
+        self._loading = {}
+        self._running = {}
+        self._tasks = []
+
+    def start(self):
+        self._tasks = [asyncio.create_task(self.worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    # Datasets
+
+    async def add_dataset(self, path):
+        from utils.dataset_cache import content_hash
+
+        if not isinstance(path, str):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "path must be a string.")
+        if not os.path.isfile(path):
+            raise HttpError(HTTPStatus.NOT_FOUND, f"No such file: {path}")
+
+        loop = asyncio.get_running_loop()
+        # A file that cannot be read or parsed is the client's problem, not a server fault
+        try:
+            digest = await loop.run_in_executor(self.executor, content_hash, path)
+            dataset_id = digest[:12]
+            # Identical files share one loaded table; concurrent requests share one load
+            if dataset_id not in self.datasets:
+                if dataset_id not in self._loading:
+                    self._loading[dataset_id] = loop.run_in_executor(self.executor, load_state, path, digest)
+                try:
+                    state = await self._loading[dataset_id]
+                finally:
+                    self._loading.pop(dataset_id, None)
+                self.datasets.setdefault(dataset_id, state)
+        except FileNotFoundError:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"No such file: {path}")
+        except (ValueError, PermissionError) as e:
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"Could not load {path}: {e}")
+        return dataset_info(dataset_id, self.datasets[dataset_id])
+
+    def list_datasets(self):
+        return [dataset_info(dataset_id, state) for dataset_id, state in self.datasets.items()]
+
+    # Jobs
+
+    def submit(self, spec):
+        if not isinstance(spec, dict):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "The job must be a JSON object.")
+        if spec.get('type') not in JOB_TYPES:
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"type must be one of {', '.join(JOB_TYPES)}.")
+        if spec.get('dataset') not in self.datasets:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"Unknown dataset: {spec.get('dataset')}; POST it to /datasets first.")
+
+        job_id = str(next(self._ids))
+        record = {
+            'id': job_id,
+            'type': spec['type'],
+            'dataset': spec['dataset'],
+            'status': 'queued',
+            'submitted': time.time(),
+            'started': None,
+            'finished': None,
+        }
+        try:
+            self.queue.put_nowait((record, spec))
+        except asyncio.QueueFull:
+            raise HttpError(HTTPStatus.SERVICE_UNAVAILABLE, "The job queue is full; try again later.")
+        self.jobs[job_id] = record
+        self._prune()
+        return record
+
+    def job(self, job_id):
+        if job_id not in self.jobs:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"Unknown job: {job_id}")
+        return self.jobs[job_id]
+
+    def cancel(self, job_id):
+        record = self.job(job_id)
+        if record['status'] != 'queued':
+            raise HttpError(HTTPStatus.CONFLICT, f"Job {job_id} is {record['status']}; only queued jobs can be cancelled.")
+        record['status'] = 'cancelled'
+        record['finished'] = time.time()
+        return record
+
+    async def worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            record, spec = await self.queue.get()
+            try:
+                if record['status'] == 'cancelled':
+                    continue
+                record['status'] = 'running'
+                record['started'] = time.time()
+                state = self.datasets[spec['dataset']]
+                try:
+                    job = job_spec(spec)
+                    result, cached = await self.compute(job, state)
+                    metrics = await loop.run_in_executor(self.executor, spec_metrics, job, result)
+                    record.update(status='done', metrics=metrics, cached=cached)
+                except Exception as e:
+                    # KeyError's str() wraps the message in quotes
+                    message = e.args[0] if isinstance(e, KeyError) and e.args else str(e)
+                    record.update(status='error', error=str(message))
+                record['finished'] = time.time()
+            finally:
+                self.queue.task_done()
+
+    async def compute(self, job, state):
+        # A job identical to one already running waits for that run instead of repeating it
+        key = job_key(job, state)
+        running = self._running.get(key)
+        if running is not None:
+            result, _ = await asyncio.shield(running)
+            return result, True
+
+        running = asyncio.get_running_loop().run_in_executor(self.executor, compute_job, job, state, self.results)
+        self._running[key] = running
+        running.add_done_callback(lambda _: self._running.pop(key, None))
+        return await running
+
+    def health(self):
+        statuses = [record['status'] for record in self.jobs.values()]
+        return {
+            'status': 'ok',
+            'workers': self.workers,
+            'queued': statuses.count('queued'),
+            'running': statuses.count('running'),
+            'datasets': len(self.datasets),
+            'result_cache': self.results.stats(),
+        }
+
+    def _prune(self):
+        finished = [job_id for job_id, record in self.jobs.items() if record['finished'] is not None]
+        for job_id in finished[:max(len(finished) - MAX_FINISHED_JOBS, 0)]:
+            del self.jobs[job_id]
+
+
+def load_state(path, digest):
+    from utils.feature_store import FeatureStore
+    from utils.loader import load_dataset
+
+    # Worker thread; the same state dict shape cli.py builds per dataset
+    return {'path': path, 'hash': digest, 'store': FeatureStore(load_dataset(path), source=path)}
+
+
+def dataset_info(dataset_id, state):
+    df = state['store'].df
+    return {'id': dataset_id, 'path': state['path'], 'rows': len(df), 'columns': [str(col) for col in df.columns]}
+
+
+def job_spec(spec):
+    # A job body is a cli.py job spec plus the dataset id
+    return {name: value for name, value in spec.items() if name != 'dataset'}
+
+
+def spec_metrics(job, result):
+    # Worker thread
+    metrics = job_metrics(job, result)
+    if job['type'] == 'association':
+        metrics['top_rules'] = top_rules(result['rules'])
+    return metrics
+
+
+def top_rules(rules, n=TOP_RULES):
+    top = rules.nlargest(n, 'lift') if 'lift' in rules.columns else rules.head(n)
+    return [
+        {
+            'antecedents': sorted(row['antecedents']),
+            'consequents': sorted(row['consequents']),
+            'support': float(row['support']),
+            'confidence': float(row['confidence']),
+            'lift': float(row['lift']),
+        }
+        for _, row in top.iterrows()
+    ]
+
+
+class Server:
+    def __init__(self, service):
+        self.service = service
+
+    async def handle(self, reader, writer):
+        try:
+            status, payload = await self.respond(reader)
+        except HttpError as e:
+            status, payload = e.status, {'error': str(e)}
+        except Exception as e:
+            status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(e)}
+
+        body = json.dumps(payload, default=to_json).encode('utf-8')
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: close\r\n\r\n".encode('latin-1') + body
+        )
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def respond(self, reader):
+        # A client that stops sending (e.g. a body shorter than its Content-Length) cannot hold the connection
+        try:
+            method, target, body = await asyncio.wait_for(self.read_request(reader), READ_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise HttpError(HTTPStatus.REQUEST_TIMEOUT, f"The request was not received within {READ_TIMEOUT:g} seconds.")
+        except asyncio.IncompleteReadError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "The connection closed before the request body was complete.")
+        return await self.route(method.upper(), target.split('?', 1)[0].rstrip('/').split('/')[1:], body)
+
+    async def read_request(self, reader):
+        request_line = (await reader.readline()).decode('latin-1').strip()
+        try:
+            method, target, _ = request_line.split(' ', 2)
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Malformed request line.")
+
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode('latin-1')
+            if line in ('\r\n', '\n', ''):
+                break
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get('content-length', 0) or 0)
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Malformed Content-Length header.")
+        if length < 0:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Malformed Content-Length header.")
+        if length > MAX_BODY_BYTES:
+            raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large.")
+        body = None
+        if length:
+            try:
+                body = json.loads(await reader.readexactly(length))
+            except ValueError:
+                raise HttpError(HTTPStatus.BAD_REQUEST, "The request body is not valid JSON.")
+        return method, target, body
+
+    async def route(self, method, parts, body):
+        service = self.service
+        if parts == ['health'] and method == 'GET':
+            return HTTPStatus.OK, service.health()
+        if parts == ['datasets'] and method == 'GET':
+            return HTTPStatus.OK, service.list_datasets()
+        if parts == ['datasets'] and method == 'POST':
+            return HTTPStatus.CREATED, await service.add_dataset((body or {}).get('path'))
+        if parts == ['jobs'] and method == 'GET':
+            return HTTPStatus.OK, [summary(record) for record in service.jobs.values()]
+        if parts == ['jobs'] and method == 'POST':
+            return HTTPStatus.ACCEPTED, service.submit(body)
+        if len(parts) == 2 and parts[0] == 'jobs' and method == 'GET':
+            return HTTPStatus.OK, service.job(parts[1])
+        if len(parts) == 2 and parts[0] == 'jobs' and method == 'DELETE':
+            return HTTPStatus.OK, service.cancel(parts[1])
+        raise HttpError(HTTPStatus.NOT_FOUND, f"No route for {method} /{'/'.join(parts)}")
+
+
+def summary(record):
+    return {name: value for name, value in record.items() if name != 'metrics'}
+
+
+async def serve(port=PORT, workers=WORKERS, queue_size=QUEUE_SIZE, ready=None):
+    service = JobService(workers=workers, queue_size=queue_size)
+    service.start()
+    # Loopback only: the service reads files by path and has no authentication
+    server = await asyncio.start_server(Server(service).handle, HOST, port)
+    print(f"Serving on http://{HOST}:{server.sockets[0].getsockname()[1]} with {workers} workers")
+    if ready is not None:
+        ready(server)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the dashboard pipelines over a local HTTP/JSON API.")
+    parser.add_argument('--port', type=int, default=PORT, help="port on 127.0.0.1 (0 picks a free one)")
+    parser.add_argument('--workers', type=int, default=WORKERS, help="jobs run at the same time")
+    parser.add_argument('--queue-size', type=int, default=QUEUE_SIZE, help="jobs waiting before new ones are refused")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.port, max(args.workers, 1), max(args.queue_size, 1)))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.association_miner import (
+    TransactionMatrix, concat_bits, derive_rules, frequent_itemsets_frame, mine_itemsets
+)
+
+
+def random_matrix(n_transactions, n_items=13, seed=1):
+    rng = np.random.default_rng(seed)
+    return rng.random((n_transactions, n_items)) < 0.4
+
+
+@pytest.mark.parametrize('n_transactions', [1, 7, 8, 9, 1003])
+def test_take_matches_repacking_the_selected_rows(n_transactions):
+    dense = random_matrix(n_transactions)
+    matrix = TransactionMatrix.from_frame(pd.DataFrame(dense))
+    rng = np.random.default_rng(n_transactions)
+    for rows in [
+        np.arange(n_transactions),
+        np.sort(rng.choice(n_transactions, max(1, n_transactions // 3), replace=False)),
+        np.array([n_transactions - 1, 0]),
+    ]:
+        taken = matrix.take(rows)
+        assert taken.n_transactions == len(rows)
+        assert np.array_equal(taken.bits, np.packbits(dense[rows].T, axis=1))
+
+
+@pytest.mark.parametrize('n_left', [0, 5, 8, 13, 16, 23])
+@pytest.mark.parametrize('n_right', [1, 7, 8, 20])
+def test_concat_bits_matches_repacking(n_left, n_right):
+    # Byte-aligned (multiples of 8) and unaligned splits
+    dense = random_matrix(n_left + n_right, seed=n_left * 100 + n_right).T
+    left = np.packbits(dense[:, :n_left], axis=1)
+    right = np.packbits(dense[:, n_left:], axis=1)
+    assert np.array_equal(concat_bits(left, n_left, right, n_right), np.packbits(dense, axis=1))
+
+
+@pytest.fixture
+def baskets():
+    # Correlated items so the fixture has rules at several confidence levels
+    rng = np.random.default_rng(7)
+    base = rng.random((300, 4)) < [0.5, 0.4, 0.3, 0.6]
+    derived = base[:, [0, 1]] & (rng.random((300, 2)) < 0.8)
+    return pd.DataFrame(np.hstack([base, derived]), columns=list('abcdef'))
+
+
+def test_mine_itemsets_matches_apriori(baskets):
+    apriori = pytest.importorskip('mlxtend.frequent_patterns').apriori
+    result = mine_itemsets(TransactionMatrix.from_frame(baskets), 0.05)
+    mined = frequent_itemsets_frame(result, list(baskets.columns))
+    expected = apriori(baskets, min_support=0.05, use_colnames=True)
+
+    assert dict(zip(mined['itemsets'], mined['support'])) == pytest.approx(
+        dict(zip(expected['itemsets'], expected['support']))
+    )
+
+
+def test_derive_rules_matches_association_rules(baskets):
+    frequent_patterns = pytest.importorskip('mlxtend.frequent_patterns')
+    result = mine_itemsets(TransactionMatrix.from_frame(baskets), 0.05)
+    rules, truncated = derive_rules(result, list(baskets.columns), 0.4)
+    frequent = frequent_patterns.apriori(baskets, min_support=0.05, use_colnames=True)
+    expected = frequent_patterns.association_rules(frequent, num_itemsets=len(baskets), metric='confidence', min_threshold=0.4)
+
+    assert not truncated
+    assert len(rules) == len(expected) > 0
+    columns = ['antecedent support', 'consequent support', 'support', 'confidence', 'lift', 'leverage', 'conviction']
+    key = ['antecedents', 'consequents']
+    merged = rules.merge(expected, on=key, suffixes=('', '_expected'))
+    assert len(merged) == len(rules)
+    for column in columns:
+        assert np.allclose(merged[column], merged[f'{column}_expected']), column
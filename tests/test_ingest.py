@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import make_fisheries_frame
+from utils.feature_store import FeatureStore
+from utils.ingest import merge_files
+from utils.loader import KEY_COLUMNS, load_dataset
+from utils.pipelines import build_transactions, update_transactions
+
+NEW_YEAR = [f"2024 Quarter {q}" for q in range(1, 5)] + ["2024 Annual"]
+
+
+def write(df, path):
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+def tables(tmp_path):
+    # One table split into a base file and an additional file. The additional file brings a new
+    # year (new columns), rows and species the base lacks, and changed 2023 Annual values
+    full = make_fisheries_frame(1000, years=range(2022, 2025)).astype({'Species': object, 'Geolocation': object})
+    full.loc[900:, 'Species'] = [f"Novel species {i}" for i in range(900, 1000)]
+    full.loc[650:700, '2023 Annual'] = (full.loc[650:700, '2023 Annual'] * 1.5).round(2)
+    full.loc[:599, NEW_YEAR] = np.nan
+    # Appended rows only have the columns of the file they came from
+    carried = KEY_COLUMNS + ['2023 Annual'] + NEW_YEAR
+    full.loc[800:, [col for col in full.columns if col not in carried]] = np.nan
+
+    base = full.iloc[:800].drop(columns=NEW_YEAR)
+    base.loc[650:700, '2023 Annual'] = make_fisheries_frame(1000, years=range(2022, 2025)).loc[650:700, '2023 Annual']
+    additional = full.iloc[600:][carried]
+    return (
+        load_dataset(write(base, tmp_path / "base.csv")),
+        load_dataset(write(additional, tmp_path / "additional.csv")),
+        load_dataset(write(full, tmp_path / "full.csv")),
+    )
+
+
+def test_merge_matches_loading_the_full_table(tmp_path):
+    base, additional, full = tables(tmp_path)
+    merged, delta = merge_files(base, [additional])
+
+    assert delta['new_columns'] == NEW_YEAR
+    assert delta['new_rows'] == 200
+    assert delta['updated_columns'] == ['2023 Annual']
+    assert list(merged.columns) == list(full.columns)
+    assert merged.dtypes.to_dict() == full.dtypes.to_dict()
+    for col in merged.columns:
+        assert merged[col].astype(object).equals(full[col].astype(object)), col
+
+
+def test_incremental_store_and_transactions_match_a_rebuild(tmp_path):
+    base, additional, full = tables(tmp_path)
+    merged, delta = merge_files(base, [additional])
+
+    store = FeatureStore(base).with_delta(merged, delta)
+    rebuilt = FeatureStore(full)
+    assert store.matrix.dtype == rebuilt.matrix.dtype
+    assert np.array_equal(store.matrix, rebuilt.matrix, equal_nan=True)
+    assert store.codes.keys() == rebuilt.codes.keys()
+    for col in rebuilt.codes:
+        assert np.array_equal(store.codes[col], rebuilt.codes[col])
+        assert list(store.categories[col]) == list(rebuilt.categories[col])
+
+    transactions = update_transactions(build_transactions(base), merged, delta)
+    expected = build_transactions(full)
+    assert transactions.items == expected.items
+    assert transactions.n_transactions == expected.n_transactions
+    assert np.array_equal(transactions.bits, expected.bits)
+
+
+def test_merge_widens_narrow_integer_columns(tmp_path):
+    (tmp_path / "base.csv").write_text("Geolocation,Species,N\nA,x,1\nB,y,2\n")
+    base = load_dataset(str(tmp_path / "base.csv"))
+    assert base['N'].dtype == np.int8
+
+    # An updated cell and an appended row, neither of which fits in int8
+    (tmp_path / "additional.csv").write_text("Geolocation,Species,N\nA,x,300.7\nC,z,1000\n")
+    merged, delta = merge_files(base, [load_dataset(str(tmp_path / "additional.csv"))])
+
+    assert delta['updated_columns'] == ['N']
+    assert delta['new_rows'] == 1
+    assert merged['N'].tolist() == pytest.approx([300.7, 2.0, 1000.0], rel=1e-6)
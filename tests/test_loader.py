@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+
+from utils.loader import downcast_float, load_dataset
+
+
+def test_downcast_float_narrows_only_losslessly():
+    # Two-decimal values that float32 holds exactly at that precision
+    small = downcast_float(pd.Series([591.64, 65.23, np.nan, 1506.54]))
+    assert small.dtype == np.float32
+
+    # Large annual totals would lose their cents in float32
+    totals = pd.Series([5517838.27, 1234.5])
+    assert downcast_float(totals).dtype == np.float64
+
+
+def test_mixed_chunks_keep_the_source_decimals(tmp_path):
+    # The first chunk narrows to float32, the second cannot
+    path = tmp_path / "mixed.csv"
+    path.write_text("Geolocation,Species,Total\nA,x,591.64\nB,y,65.23\nC,z,5517838.27\nD,w,0.1\n")
+    df = load_dataset(str(path), chunksize=2)
+
+    assert df['Total'].dtype == np.float64
+    assert df['Total'].tolist() == [591.64, 65.23, 5517838.27, 0.1]
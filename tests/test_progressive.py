@@ -0,0 +1,40 @@
+from sklearn.cluster import MiniBatchKMeans
+
+import utils.pipelines as pipelines
+from benchmarks.synthetic import make_fisheries_frame
+from utils.feature_store import FeatureStore
+from utils.progressive import preview_note, progressive_clustering
+
+FEATURES = ['2024 Quarter 1', '2024 Quarter 2', '2024 Annual']
+
+
+def test_clustering_rounds_share_the_full_table_estimator(monkeypatch):
+    # Rounds of 2,000 and 8,000 rows straddle the threshold; the 10,000-row table is above it
+    monkeypatch.setattr(pipelines, 'CLUSTERING_ROW_THRESHOLD', 5000)
+    df = make_fisheries_frame(10000)
+    df[FEATURES] = df[FEATURES].fillna(0)
+    store = FeatureStore(df)
+
+    previews = []
+    result = progressive_clustering(
+        store, FEATURES, 3, progress=lambda payload: isinstance(payload, dict) and previews.append(payload)
+    )
+
+    rounds = previews + [result]
+    assert [r['sample_rows'] for r in previews] == [2000, 8000]
+    assert [r['mode'] for r in rounds] == ['minibatch'] * 3
+    assert all(isinstance(r['model'], MiniBatchKMeans) for r in rounds)
+
+
+def test_final_result_carries_no_preview_fields():
+    # The final result is cached under the regular key, so it must look like a regular run
+    df = make_fisheries_frame(5000)
+    df[FEATURES] = df[FEATURES].fillna(0)
+    previews = []
+    result = progressive_clustering(
+        FeatureStore(df), FEATURES, 3, progress=lambda payload: isinstance(payload, dict) and previews.append(payload)
+    )
+
+    assert all(preview['preview'] for preview in previews)
+    assert not {'sample_rows', 'total_rows', 'preview', 'metric_change', 'stable'} & result.keys()
+    assert preview_note(result) == ""
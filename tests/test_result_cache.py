@@ -0,0 +1,12 @@
+from utils.result_cache import ResultCache
+
+
+def test_budget_cut_results_are_not_cached(tmp_path):
+    cache = ResultCache(persist_dir=str(tmp_path))
+    for flag in ['timed_out', 'truncated']:
+        value, hit = cache.get_or_compute(flag, lambda: {flag: True})
+        assert not hit
+        assert cache.get_or_compute(flag, lambda: {flag: False}) == ({flag: False}, False)
+        # A finished run is kept, in memory and on disk
+        assert cache.get_or_compute(flag, lambda: {flag: True}) == ({flag: False}, True)
+        assert ResultCache(persist_dir=str(tmp_path)).get(flag) == {flag: False}
@@ -0,0 +1,17 @@
+import numpy as np
+
+from benchmarks.synthetic import make_fisheries_frame
+from utils.feature_store import FeatureStore
+
+
+def test_yoy_growth_leaves_gaps_after_a_missing_year():
+    # 2022 is absent, so 2023 has no previous year to grow on
+    df = make_fisheries_frame(60, years=[2021, 2023, 2024])
+    growth = FeatureStore(df).series.yoy_growth(None)
+    totals = df[[f"{year} Annual" for year in (2021, 2023, 2024)]].sum()
+
+    assert list(growth.columns) == [2021, 2023, 2024]
+    assert np.isnan(growth[2021].iloc[0])
+    assert np.isnan(growth[2023].iloc[0])
+    expected = (totals['2024 Annual'] - totals['2023 Annual']) / totals['2023 Annual'] * 100
+    assert np.isclose(growth[2024].iloc[0], expected, rtol=1e-5)
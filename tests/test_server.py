@@ -0,0 +1,82 @@
+import asyncio
+import json
+
+import server
+from benchmarks.synthetic import write_fisheries_csv
+
+FEATURES = ['2021 Annual', '2022 Annual', '2023 Annual']
+
+
+async def request(port, method, path, body=None, raw=None):
+    reader, writer = await asyncio.open_connection(server.HOST, port)
+    payload = json.dumps(body).encode('utf-8') if body is not None else b""
+    writer.write(raw if raw is not None else (
+        f"{method} {path} HTTP/1.1\r\nContent-Length: {len(payload)}\r\n\r\n".encode('latin-1') + payload
+    ))
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+
+def serve_and_run(scenario, **service_args):
+    async def main():
+        service = server.JobService(**service_args)
+        service.start()
+        listener = await asyncio.start_server(server.Server(service).handle, server.HOST, 0)
+        try:
+            return await scenario(service, listener.sockets[0].getsockname()[1])
+        finally:
+            listener.close()
+            await service.stop()
+
+    return asyncio.run(main())
+
+
+def test_truncated_body_times_out(monkeypatch):
+    monkeypatch.setattr(server, 'READ_TIMEOUT', 0.2)
+
+    async def scenario(service, port):
+        # Announces 100 bytes, sends 2 and keeps the connection open
+        raw = b"POST /jobs HTTP/1.1\r\nContent-Length: 100\r\n\r\n{}"
+        return await asyncio.wait_for(request(port, 'POST', '/jobs', raw=raw), 5)
+
+    status, payload = serve_and_run(scenario)
+    assert status == 408
+    assert 'error' in payload
+
+
+def test_identical_jobs_share_one_computation(tmp_path):
+    path = str(tmp_path / "fisheries.csv")
+    write_fisheries_csv(path, 3000)
+    job = {'type': 'regression', 'features': FEATURES, 'target': '2024 Annual'}
+
+    async def scenario(service, port):
+        _, dataset = await request(port, 'POST', '/datasets', {'path': path})
+        ids = [(await request(port, 'POST', '/jobs', {**job, 'dataset': dataset['id']}))[1]['id'] for _ in range(2)]
+        while True:
+            records = [(await request(port, 'GET', f'/jobs/{job_id}'))[1] for job_id in ids]
+            if all(record['status'] not in ('queued', 'running') for record in records):
+                return records, service.results.stats()
+            await asyncio.sleep(0.05)
+
+    records, stats = serve_and_run(scenario, workers=2)
+    assert [record['status'] for record in records] == ['done', 'done']
+    assert records[0]['metrics'] == records[1]['metrics']
+    assert stats['misses'] == 1
+
+
+def test_client_errors_are_not_server_faults(tmp_path):
+    bad = tmp_path / "notes.txt"
+    bad.write_text("not a table")
+
+    async def scenario(service, port):
+        raw = b"POST /datasets HTTP/1.1\r\nContent-Length: ten\r\n\r\n"
+        return [
+            (await request(port, 'POST', '/datasets', raw=raw))[0],
+            (await request(port, 'POST', '/datasets', {'path': str(tmp_path / "missing.csv")}))[0],
+            (await request(port, 'POST', '/datasets', {'path': str(bad)}))[0],
+        ]
+
+    assert serve_and_run(scenario) == [400, 404, 400]
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from utils.pipelines import regression_metrics
+from utils.streaming import Moments, holdout_mask, run_streaming_regression
+
+FEATURES = ['x1', 'x2', 'x3']
+TARGET = 'y'
+CHUNK_SIZE = 7
+
+
+def test_merged_moments_match_batch():
+    values = np.random.default_rng(3).normal(5.0, 2.0, size=(40, 4))
+    moments = Moments(4)
+    # Uneven chunks, including a single row and an empty one
+    for start, stop in [(0, 13), (13, 14), (14, 14), (14, 31), (31, 32), (32, 40)]:
+        moments.update(values[start:stop])
+
+    centred = values - values.mean(axis=0)
+    assert moments.n == len(values)
+    assert np.allclose(moments.mean, values.mean(axis=0))
+    assert np.allclose(moments.comoment, centred.T @ centred)
+
+
+def test_streaming_regression_matches_batch_fit(tmp_path):
+    # 30 full chunks and a last chunk of one row; missing values make the complete rows per chunk uneven
+    rng = np.random.default_rng(11)
+    n_rows = CHUNK_SIZE * 30 + 1
+    X = rng.normal(size=(n_rows, len(FEATURES)))
+    y = X @ [2.0, -1.0, 0.5] + 4.0 + rng.normal(0, 0.3, n_rows)
+    df = pd.DataFrame(X, columns=FEATURES).assign(**{TARGET: y})
+    df.loc[rng.random(n_rows) < 0.1, 'x2'] = np.nan
+    path = str(tmp_path / "stream.csv")
+    df.to_csv(path, index=False)
+
+    # The same train/held-out split, chunk by chunk, fitted in one batch
+    rows = pd.read_csv(path)[FEATURES + [TARGET]].to_numpy()
+    train, held_out = [], []
+    for number, start in enumerate(range(0, n_rows, CHUNK_SIZE)):
+        values = rows[start:start + CHUNK_SIZE]
+        values = values[~np.isnan(values).any(axis=1)]
+        mask = holdout_mask(len(values), number)
+        train.append(values[~mask])
+        held_out.append(values[mask])
+    train, held_out = np.vstack(train), np.vstack(held_out)
+    batch = LinearRegression().fit(train[:, :-1], train[:, -1])
+    expected = regression_metrics(held_out[:, -1], batch.predict(held_out[:, :-1]))
+
+    result = run_streaming_regression(path, FEATURES, TARGET, chunksize=CHUNK_SIZE)
+    assert result['n_train'] == len(train)
+    assert result['rows_skipped'] == int(df.isna().any(axis=1).sum())
+    assert np.allclose(result['model'].coef_, batch.coef_)
+    assert result['model'].intercept_ == pytest.approx(batch.intercept_)
+    for name, value in expected.items():
+        assert result[name] == pytest.approx(value), name
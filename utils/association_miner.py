@@ -0,0 +1,219 @@
+import math
+import time
+from itertools import combinations
+import numpy as np
+import pandas as pd
+
+# Vertical (Eclat) frequent itemset miner over bit-packed transaction columns.
+# Every item keeps one packed bitset of the transactions containing it, so the
+# support of an itemset is a bitwise AND followed by a popcount, and all
+# extensions of a prefix are counted in one vectorized step.
+
+# Upper bounds that keep low-support runs from exhausting time or memory
+MAX_ITEMSETS = 500000
+MAX_RULES = 1000000
+TIME_BUDGET = 120.0
+
+# How often the miner reports progress, in itemsets
+REPORT_EVERY = 5000
+
+_POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def popcount(bits):
+    # Number of set bits along the last axis of a uint8 array
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(bits).sum(axis=-1, dtype=np.int64)
+    return _POPCOUNT_TABLE[bits].sum(axis=-1, dtype=np.int64)
+
+
+class TransactionMatrix:
+    def __init__(self, items, bits, n_transactions):
+        # bits has one row per item holding np.packbits of its transaction column
+        self.items = list(items)
+        self.bits = bits
+        self.n_transactions = n_transactions
+        self.item_index = {item: i for i, item in enumerate(self.items)}
+
+    @classmethod
+    def from_frame(cls, df):
+        values = df.to_numpy(dtype=bool)
+        return cls(df.columns, np.packbits(values.T, axis=1), len(df))
+
+    @property
+    def columns(self):
+        return self.items
+
+    @property
+    def shape(self):
+        return (self.n_transactions, len(self.items))
+
+    @property
+    def nbytes(self):
+        return self.bits.nbytes
+
+    def subset(self, items):
+        indices = [self.item_index[item] for item in items]
+        return TransactionMatrix(items, self.bits[indices], self.n_transactions)
+
+    def supports(self):
+        return popcount(self.bits) / max(self.n_transactions, 1)
+
+    def take(self, rows):
+        # The transactions at the given row positions, repacked. Only the selected bits are
+        # read out of their bytes, so nothing the size of the full table is unpacked
+        rows = np.asarray(rows, dtype=np.int64)
+        shifts = (7 - (rows & 7)).astype(np.uint8)
+        selected = (self.bits[:, rows >> 3] >> shifts) & np.uint8(1)
+        return TransactionMatrix(self.items, np.packbits(selected, axis=1), len(rows))
+
+    def append_rows(self, other):
+        # Transactions of `other` after this matrix's; items missing on either side are empty there
+        items = self.items + [item for item in other.items if item not in self.item_index]
+        n_bytes = (self.n_transactions + 7) // 8
+        left = np.zeros((len(items), n_bytes), dtype=np.uint8)
+        left[:len(self.items)] = self.bits
+        right = np.zeros((len(items), other.bits.shape[1]), dtype=np.uint8)
+        for i, item in enumerate(items):
+            if item in other.item_index:
+                right[i] = other.bits[other.item_index[item]]
+        bits = concat_bits(left, self.n_transactions, right, other.n_transactions)
+        return TransactionMatrix(items, bits, self.n_transactions + other.n_transactions)
+
+
+def concat_bits(left, n_left, right, n_right):
+    # Packed rows of n_left bits followed by n_right bits, shifting without unpacking
+    offset = n_left % 8
+    total = (n_left + n_right + 7) // 8
+    if offset == 0:
+        return np.hstack([left, right])[:, :total]
+
+    start = n_left // 8
+    bits = np.zeros((left.shape[0], total), dtype=np.uint8)
+    bits[:, :left.shape[1]] = left
+    # Each byte of `right` straddles two output bytes; padding bits are zero on both sides
+    high = right >> np.uint8(offset)
+    low = right << np.uint8(8 - offset)
+    bits[:, start:start + right.shape[1]] |= high[:, :total - start]
+    end = min(start + 1 + right.shape[1], total)
+    bits[:, start + 1:end] |= low[:, :end - start - 1]
+    return bits
+
+
+class MiningResult:
+    def __init__(self, itemsets, counts, n_transactions, truncated):
+        self.itemsets = itemsets
+        self.counts = counts
+        self.n_transactions = n_transactions
+        self.truncated = truncated
+
+
+def mine_itemsets(matrix, min_support, max_len=None, max_itemsets=MAX_ITEMSETS,
+                  time_budget=TIME_BUDGET, progress=None):
+    n = matrix.n_transactions
+    min_count = max(1, math.ceil(min_support * n - 1e-9))
+    deadline = time.monotonic() + time_budget if time_budget else None
+
+    counts = popcount(matrix.bits)
+    frequent = [i for i in np.argsort(counts, kind='stable') if counts[i] >= min_count]
+
+    itemsets = []
+    itemset_counts = []
+    state = {'truncated': False}
+
+    def over_budget():
+        if len(itemsets) >= max_itemsets:
+            return True
+        return deadline is not None and time.monotonic() > deadline
+
+    def extend(prefix, candidates, candidate_bits, candidate_counts):
+        # candidates are item indices in ascending support order; bits are already ANDed with prefix
+        for pos, item in enumerate(candidates):
+            if over_budget():
+                state['truncated'] = True
+                return
+
+            itemset = prefix + (item,)
+            itemsets.append(itemset)
+            itemset_counts.append(int(candidate_counts[pos]))
+            if progress is not None and len(itemsets) % REPORT_EVERY == 0:
+                progress(f"Mined {len(itemsets):,} frequent itemsets...")
+
+            if pos + 1 == len(candidates) or (max_len is not None and len(itemset) >= max_len):
+                continue
+
+            # Count every extension of this itemset at once
+            joined = candidate_bits[pos + 1:] & candidate_bits[pos]
+            joined_counts = popcount(joined)
+            keep = joined_counts >= min_count
+            if keep.any():
+                extend(itemset, [c for c, k in zip(candidates[pos + 1:], keep) if k],
+                       joined[keep], joined_counts[keep])
+
+    if frequent:
+        extend((), frequent, matrix.bits[frequent], counts[frequent])
+
+    return MiningResult(itemsets, itemset_counts, n, state['truncated'])
+
+
+def frequent_itemsets_frame(result, items):
+    return pd.DataFrame({
+        'support': np.asarray(result.counts, dtype=np.float64) / max(result.n_transactions, 1),
+        'itemsets': [frozenset(items[i] for i in itemset) for itemset in result.itemsets],
+    })
+
+
+def derive_rules(result, items, min_confidence, max_rules=MAX_RULES, progress=None):
+    n = max(result.n_transactions, 1)
+    count_of = {frozenset(itemset): count for itemset, count in zip(result.itemsets, result.counts)}
+
+    rows = []
+    truncated = False
+    for itemset, count in zip(result.itemsets, result.counts):
+        if len(itemset) < 2:
+            continue
+        full = frozenset(itemset)
+        for size in range(1, len(itemset)):
+            for antecedent in combinations(itemset, size):
+                antecedent = frozenset(antecedent)
+                consequent = full - antecedent
+                antecedent_count = count_of.get(antecedent)
+                consequent_count = count_of.get(consequent)
+                # Subsets can be missing only when mining stopped at its budget
+                if antecedent_count is None or consequent_count is None:
+                    continue
+                confidence = count / antecedent_count
+                if confidence >= min_confidence:
+                    rows.append((antecedent, consequent, antecedent_count, consequent_count, count))
+
+        if len(rows) >= max_rules:
+            truncated = True
+            break
+        if progress is not None and rows and len(rows) % REPORT_EVERY == 0:
+            progress(f"Derived {len(rows):,} rules...")
+
+    columns = ['antecedents', 'consequents', 'antecedent support', 'consequent support', 'support',
+               'confidence', 'lift', 'leverage', 'conviction']
+    if not rows:
+        return pd.DataFrame(columns=columns), truncated
+
+    antecedents, consequents, a_counts, c_counts, counts = zip(*rows)
+    a_support = np.asarray(a_counts, dtype=np.float64) / n
+    c_support = np.asarray(c_counts, dtype=np.float64) / n
+    support = np.asarray(counts, dtype=np.float64) / n
+    confidence = support / a_support
+    with np.errstate(divide='ignore'):
+        conviction = np.where(confidence < 1, (1 - c_support) / (1 - confidence), np.inf)
+
+    rules = pd.DataFrame({
+        'antecedents': [frozenset(items[i] for i in a) for a in antecedents],
+        'consequents': [frozenset(items[i] for i in c) for c in consequents],
+        'antecedent support': a_support,
+        'consequent support': c_support,
+        'support': support,
+        'confidence': confidence,
+        'lift': confidence / c_support,
+        'leverage': support - a_support * c_support,
+        'conviction': conviction,
+    })
+    return rules, truncated
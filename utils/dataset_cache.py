@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ml-dashboard", "datasets")
+MAX_CACHE_BYTES = 2 * 1024 ** 3
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def content_hash(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DatasetCache:
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.extension = ".feather" if feather is not None else ".pkl"
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def file_key(self, path):
+        # The content hash is only recomputed when the file's size or mtime moved
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        index = self._read_index()
+        entry = index.get(path)
+
+        if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            return entry['hash']
+
+        digest = content_hash(path)
+        index[path] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'hash': digest}
+        self._write_index(index)
+        return digest
+
+    def entry_key(self, path, sheet=None):
+        # Each sheet of a workbook is its own entry
+        key = self.file_key(path)
+        if sheet is not None:
+            key += "-" + hashlib.blake2b(str(sheet).encode('utf-8'), digest_size=4).hexdigest()
+        return key
+
+    def get(self, path, sheet=None):
+        entry_path = self._entry_path(self.entry_key(path, sheet))
+        if not os.path.exists(entry_path):
+            return None
+
+        # Touch the entry so eviction treats it as recently used
+        os.utime(entry_path)
+        if feather is not None:
+            # Uncompressed Feather is memory-mapped, so numeric columns are not copied on read
+            table = feather.read_table(entry_path, memory_map=True)
+            return table.to_pandas(split_blocks=True)
+        return pd.read_pickle(entry_path)
+
+    def put(self, path, df, sheet=None):
+        entry_path = self._entry_path(self.entry_key(path, sheet))
+        tmp_path = entry_path + ".tmp"
+
+        if feather is not None:
+            feather.write_feather(df.reset_index(drop=True), tmp_path, compression='uncompressed')
+        else:
+            df.to_pickle(tmp_path)
+        os.replace(tmp_path, entry_path)
+        self.evict()
+
+    def entries(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(self.extension):
+                full_path = os.path.join(self.cache_dir, name)
+                stat = os.stat(full_path)
+                entries.append((stat.st_mtime, stat.st_size, full_path))
+        return entries
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        # Drop least recently used entries until the cache fits its size budget
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, full_path in entries:
+            if total <= self.max_bytes:
+                break
+            os.remove(full_path)
+            total -= size
+
+    def purge(self):
+        for _, _, full_path in self.entries():
+            os.remove(full_path)
+        if os.path.exists(self.index_path):
+            os.remove(self.index_path)
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, key + self.extension)
+
+    def _read_index(self):
+        try:
+            with open(self.index_path) as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self, index):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'w') as handle:
+            json.dump(index, handle)
+        os.replace(tmp_path, self.index_path)
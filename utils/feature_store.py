@@ -0,0 +1,157 @@
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+# Number of standardized feature matrices kept per dataset
+MAX_SCALED = 8
+
+
+class FeatureStore:
+    def __init__(self, df, source=None):
+        self.df = df
+        # Path of the file the frame was read from, for passes that stream it again
+        self.source = source
+        self.columns = list(df.columns)
+        self.column_index = {col: i for i, col in enumerate(self.columns)}
+        self.codes = {}
+        self.categories = {}
+        self._scaled = OrderedDict()
+        self._series = None
+        self._fingerprint = None
+        self._lock = threading.Lock()
+        self.matrix = self._build_matrix()
+
+    def _build_matrix(self, previous=None, reuse=()):
+        numeric = [col for col in self.columns if pd.api.types.is_numeric_dtype(self.df[col])]
+        all_float32 = all(self.df[col].dtype == np.float32 for col in numeric)
+        dtype = np.float32 if all_float32 else np.float64
+
+        # Column-major, so every single column is a contiguous view
+        matrix = np.empty((len(self.df), len(self.columns)), dtype=dtype, order='F')
+        for i, col in enumerate(self.columns):
+            series = self.df[col]
+            if col in reuse:
+                # Unchanged column: copy the old encoding and only encode rows appended after it
+                n_old = len(previous.df)
+                matrix[:n_old, i] = previous.column(col)
+                if previous.is_categorical(col):
+                    self.codes[col] = previous.codes[col]
+                    self.categories[col] = previous.categories[col]
+                else:
+                    matrix[n_old:, i] = series.iloc[n_old:].to_numpy(dtype=dtype, na_value=np.nan)
+                continue
+
+            if col in numeric:
+                matrix[:, i] = series.to_numpy(dtype=dtype, na_value=np.nan)
+            else:
+                # Encode text once per upload; sorted categories give the same codes as LabelEncoder
+                categorical = series.astype('category')
+                categorical = categorical.cat.reorder_categories(sorted(categorical.cat.categories, key=str))
+                self.codes[col] = categorical.cat.codes.to_numpy()
+                self.categories[col] = categorical.cat.categories
+                matrix[:, i] = self.codes[col]
+        return matrix
+
+    def with_delta(self, df, delta):
+        # A store for the merged table that reuses every encoding the delta left alone
+        updated = set(delta['new_columns']) | set(delta['updated_columns'])
+        store = FeatureStore.__new__(FeatureStore)
+        store.df = df
+        # The merged table no longer matches any one file, so it cannot be streamed again
+        store.source = None
+        store.columns = list(df.columns)
+        store.column_index = {col: i for i, col in enumerate(store.columns)}
+        store.codes = {}
+        store.categories = {}
+        store._series = None
+        store._fingerprint = None
+        store._lock = threading.Lock()
+
+        # Appended rows can bring new categories, which shifts the sorted codes
+        reuse = {
+            col for col in store.columns
+            if col in self.column_index and col not in updated
+            and not (delta['new_rows'] and self.is_categorical(col))
+        }
+        store.matrix = store._build_matrix(previous=self, reuse=reuse)
+
+        # Standardized matrices stay valid while their rows and columns are unchanged
+        kept = []
+        if not delta['new_rows']:
+            with self._lock:
+                kept = [(key, value) for key, value in self._scaled.items() if not updated.intersection(key)]
+        store._scaled = OrderedDict(kept)
+        return store
+
+    def take(self, rows):
+        # A store over a subset of rows with the same encodings, for sampled runs
+        store = FeatureStore.__new__(FeatureStore)
+        store.df = self.df.iloc[rows].reset_index(drop=True)
+        store.source = None
+        store.columns = self.columns
+        store.column_index = self.column_index
+        store.codes = {col: codes[rows] for col, codes in self.codes.items()}
+        store.categories = self.categories
+        store.matrix = np.asfortranarray(self.matrix[rows])
+        store._scaled = OrderedDict()
+        store._series = None
+        store._fingerprint = None
+        store._lock = threading.Lock()
+        return store
+
+    @property
+    def fingerprint(self):
+        # Content hash of the dataset, used to key cached results
+        if self._fingerprint is None:
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update("\x1f".join(map(str, self.columns)).encode('utf-8'))
+            digest.update(pd.util.hash_pandas_object(self.df, index=False).to_numpy().tobytes())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    @property
+    def series(self):
+        # Long-format period store, reshaped on first use and shared by every tab
+        with self._lock:
+            if self._series is None:
+                from utils.series_store import SeriesStore
+
+                self._series = SeriesStore.from_wide(self.df)
+            return self._series
+
+    def is_categorical(self, col):
+        return col in self.codes
+
+    def column(self, col):
+        return self.matrix[:, self.column_index[col]]
+
+    def features(self, cols):
+        missing = [col for col in cols if col not in self.column_index]
+        if missing:
+            raise KeyError(f"Columns not found: {', '.join(missing)}")
+
+        indices = [self.column_index[col] for col in cols]
+        # Adjacent columns can be sliced without copying; anything else is gathered once
+        if indices == list(range(indices[0], indices[0] + len(indices))):
+            return self.matrix[:, indices[0]:indices[-1] + 1]
+        return self.matrix[:, indices]
+
+    def scaled(self, cols):
+        key = tuple(cols)
+        with self._lock:
+            if key in self._scaled:
+                self._scaled.move_to_end(key)
+                return self._scaled[key]
+
+        from sklearn.preprocessing import StandardScaler
+
+        scaler = StandardScaler()
+        X = scaler.fit_transform(self.features(cols))
+
+        with self._lock:
+            self._scaled[key] = (scaler, X)
+            while len(self._scaled) > MAX_SCALED:
+                self._scaled.popitem(last=False)
+        return scaler, X
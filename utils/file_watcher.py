@@ -0,0 +1,41 @@
+import os
+import time
+
+# Polling watcher for the uploaded file. Writers often save a file in several
+# steps, so a change is only reported once the file's size and mtime have held
+# still for the debounce period; the caller then compares content hashes to
+# skip saves that did not change anything.
+
+POLL_INTERVAL = 2.0
+DEBOUNCE = 3.0
+
+
+class FileWatcher:
+    def __init__(self, path, debounce=DEBOUNCE):
+        self.path = path
+        self.debounce = debounce
+        self.last_stat = _stat(path)
+        self.changed_at = None
+
+    def poll(self):
+        # True once per settled change; cheap enough to call from the Tk timer
+        stat = _stat(self.path)
+        now = time.monotonic()
+        if stat != self.last_stat:
+            self.last_stat = stat
+            self.changed_at = now
+            return False
+
+        if self.changed_at is not None and stat is not None and now - self.changed_at >= self.debounce:
+            self.changed_at = None
+            return True
+        return False
+
+
+def _stat(path):
+    # A file that is briefly missing mid-save counts as a change, not an error
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
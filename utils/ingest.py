@@ -0,0 +1,149 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from utils.loader import KEY_COLUMNS, FLOAT32_RTOL, astype_exact, combine_chunks, downcast_float, load_dataset
+
+# Incremental ingestion: additional files are read concurrently and merged
+# into the loaded table on Geolocation/Species. The merge reports what
+# changed (new columns, new rows, updated cells) so derived structures can be
+# updated for the delta instead of rebuilt.
+
+
+def read_files(paths, progress=None, max_workers=None):
+    # pandas' parser releases the GIL for most of a read, so threads overlap well
+    fractions = [0.0] * len(paths)
+
+    def read(i, path):
+        def report(fraction):
+            fractions[i] = fraction
+            if progress is not None:
+                progress(sum(fractions) / len(paths))
+        return load_dataset(path, progress=report)
+
+    workers = max_workers or min(len(paths), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest") as pool:
+        futures = [pool.submit(read, i, path) for i, path in enumerate(paths)]
+        return [future.result() for future in futures]
+
+
+def empty_delta():
+    return {'new_columns': [], 'new_rows': 0, 'updated_columns': [], 'updated_cells': 0}
+
+
+def merge_frames(base, new, keys=KEY_COLUMNS):
+    missing = [key for key in keys if key not in base.columns or key not in new.columns]
+    if missing:
+        raise ValueError(f"Both files need the key columns: {', '.join(missing)}")
+
+    base_index = pd.MultiIndex.from_frame(base[keys].astype(str))
+    if not base_index.is_unique:
+        raise ValueError(f"The loaded table has repeated {'/'.join(keys)} rows; it cannot be merged by key.")
+    new = new.drop_duplicates(keys, keep='last').reset_index(drop=True)
+    positions = base_index.get_indexer(pd.MultiIndex.from_frame(new[keys].astype(str)))
+    matched = positions >= 0
+    targets = positions[matched]
+
+    delta = empty_delta()
+    merged = base.copy(deep=False)
+
+    # Values for rows the table already has: changed cells and whole new columns
+    for col in new.columns:
+        if col in keys:
+            continue
+        incoming = new[col][matched]
+        if col in base.columns:
+            changed = _changed(base[col].iloc[targets], incoming)
+            if changed.any():
+                if isinstance(base[col].dtype, pd.CategoricalDtype):
+                    dtype = 'category'
+                    values = base[col].to_numpy(copy=True)
+                else:
+                    # Columns only ever widen: 300.7 must not wrap into an int8 column
+                    dtype = _widened(base[col].dtype, incoming.dtype)
+                    values = astype_exact(base[col].to_numpy(), dtype)
+                values[targets[changed]] = astype_exact(incoming.to_numpy(), values.dtype)[changed]
+                merged[col] = pd.Series(values, name=col).astype(dtype)
+                delta['updated_columns'].append(col)
+                delta['updated_cells'] += int(changed.sum())
+        else:
+            merged[col] = _new_column(incoming, targets, len(base))
+            delta['new_columns'].append(col)
+
+    # Rows the table has not seen are appended with the merged frame's dtypes
+    new_rows = new[~matched].reindex(columns=merged.columns)
+    if len(new_rows):
+        categorical = [col for col in merged.columns if isinstance(merged[col].dtype, pd.CategoricalDtype)]
+        for col in merged.columns:
+            if col in categorical:
+                new_rows[col] = new_rows[col].astype(object).astype('category')
+            elif pd.api.types.is_numeric_dtype(merged[col]):
+                incoming = pd.to_numeric(new_rows[col], errors='coerce')
+                # A column the file lacks only adds missing values, which need a float but not float64
+                dtype = _widened(merged[col].dtype, incoming.dtype if col in new.columns else np.float32)
+                merged[col] = pd.Series(astype_exact(merged[col].to_numpy(), dtype), index=merged.index, name=col)
+                new_rows[col] = pd.Series(astype_exact(incoming.to_numpy(), dtype), index=new_rows.index, name=col)
+        merged = combine_chunks([merged.reset_index(drop=True), new_rows.reset_index(drop=True)], categorical)
+        delta['new_rows'] = len(new_rows)
+
+    return merged, delta
+
+
+def merge_files(base, frames, keys=KEY_COLUMNS):
+    total = empty_delta()
+    for frame in frames:
+        base, delta = merge_frames(base, frame, keys)
+        for name in ['new_columns', 'updated_columns']:
+            total[name] += [col for col in delta[name] if col not in total[name]]
+        total['new_rows'] += delta['new_rows']
+        total['updated_cells'] += delta['updated_cells']
+    # A column that is new overall is not also an update
+    total['updated_columns'] = [col for col in total['updated_columns'] if col not in total['new_columns']]
+    return base, total
+
+
+def is_empty(delta):
+    return not (delta['new_columns'] or delta['new_rows'] or delta['updated_columns'])
+
+
+def describe_delta(delta):
+    if is_empty(delta):
+        return "The selected files add nothing new to the loaded table."
+    lines = []
+    if delta['new_columns']:
+        lines.append(f"New columns ({len(delta['new_columns'])}): {', '.join(map(str, delta['new_columns']))}")
+    if delta['new_rows']:
+        lines.append(f"New rows: {delta['new_rows']:,}")
+    if delta['updated_columns']:
+        lines.append(f"Updated cells: {delta['updated_cells']:,} in {len(delta['updated_columns'])} columns")
+    return "\n".join(lines)
+
+
+def _changed(current, incoming):
+    current = current.to_numpy()
+    incoming_values = incoming.to_numpy()
+    present = pd.notna(incoming_values)
+    if pd.api.types.is_numeric_dtype(incoming) and pd.api.types.is_numeric_dtype(current.dtype):
+        # A value stored as float32 differs from the file's text by float32 rounding only
+        rtol = FLOAT32_RTOL if np.dtype(np.float32) in (current.dtype, incoming_values.dtype) else 0.0
+        same = np.isclose(current.astype(np.float64), incoming_values.astype(np.float64), rtol=rtol, atol=0, equal_nan=False)
+    else:
+        same = current.astype(str) == incoming_values.astype(str)
+    return present & ~same
+
+
+def _widened(current, incoming):
+    # The narrowest dtype holding both; text stays text
+    if pd.api.types.is_numeric_dtype(current) and pd.api.types.is_numeric_dtype(incoming):
+        return np.result_type(current, incoming)
+    return np.dtype(object) if current != incoming else current
+
+
+def _new_column(incoming, targets, n_rows):
+    if pd.api.types.is_numeric_dtype(incoming):
+        values = np.full(n_rows, np.nan)
+        values[targets] = astype_exact(incoming.to_numpy(dtype=incoming.dtype, na_value=np.nan), np.float64)
+        return downcast_float(pd.Series(values))
+    values = np.full(n_rows, None, dtype=object)
+    values[targets] = incoming.to_numpy(dtype=object)
+    return pd.Series(values)
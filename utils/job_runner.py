@@ -0,0 +1,105 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from utils.perf import PerfRecorder
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, key, perf):
+        self.key = key
+        self.perf = perf
+        self.record = None
+        self.future = None
+        self._cancel_event = threading.Event()
+        self._messages = queue.Queue()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def check_cancelled(self):
+        if self.cancelled:
+            raise JobCancelled()
+
+    def stage(self, name):
+        # Jobs double as the pipelines' `stages` object; stages land in this job's run
+        return self.perf.stage(name, run=self.record)
+
+    def report(self, payload):
+        # Called from the worker thread; the payload is handed to on_progress on the Tk thread
+        self.check_cancelled()
+        self._messages.put(payload)
+
+
+class JobRunner:
+    def __init__(self, root, max_workers=None, poll_interval=100, perf=None):
+        self.root = root
+        self.poll_interval = poll_interval
+        self.perf = perf if perf is not None else PerfRecorder()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dashboard-job")
+        self.jobs = {}
+
+    def is_running(self, key):
+        return key in self.jobs
+
+    def submit(self, key, func, on_done, on_error=None, on_progress=None, on_cancel=None):
+        # Only one job per key: a second click while a run is in flight is ignored
+        if key in self.jobs:
+            return None
+
+        job = Job(key, self.perf)
+        job.future = self.executor.submit(self._run, func, job)
+        self.jobs[key] = job
+        self.root.after(self.poll_interval, self._poll, job, on_done, on_error, on_progress, on_cancel)
+        return job
+
+    def cancel(self, key):
+        job = self.jobs.get(key)
+        if job is not None:
+            job.cancel()
+
+    def shutdown(self):
+        for job in self.jobs.values():
+            job.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, func, job):
+        with self.perf.run(job.key) as record:
+            job.record = record
+            return func(job)
+
+    def _poll(self, job, on_done, on_error, on_progress, on_cancel):
+        # Runs on the Tk thread, so every callback is free to touch widgets
+        while True:
+            try:
+                payload = job._messages.get_nowait()
+            except queue.Empty:
+                break
+            if on_progress is not None and not job.cancelled:
+                on_progress(payload)
+
+        if not job.future.done():
+            self.root.after(self.poll_interval, self._poll, job, on_done, on_error, on_progress, on_cancel)
+            return
+
+        self.jobs.pop(job.key, None)
+        error = job.future.exception() if not job.future.cancelled() else JobCancelled()
+
+        if job.cancelled or isinstance(error, JobCancelled):
+            if on_cancel is not None:
+                on_cancel()
+        elif error is not None:
+            if on_error is not None:
+                on_error(error)
+        else:
+            # Plotting and table updates on the Tk thread are timed as the run's last stage
+            with self.perf.stage("render", run=job.record):
+                on_done(job.future.result())
+            self.perf.finish_run(job.record)
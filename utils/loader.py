@@ -0,0 +1,237 @@
+import os
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+CHUNK_SIZE = 50000
+
+# Object columns whose distinct values make up at most this share of the rows are stored as category
+CATEGORY_RATIO = 0.5
+
+# Identifier columns of the fisheries tables, always stored as category
+KEY_COLUMNS = ['Geolocation', 'Species']
+
+# Placeholders the source statistics tables use for missing values
+NA_VALUES = ['.', '..', '...']
+
+# Relative rounding error of a value stored as float32 (its machine epsilon)
+FLOAT32_RTOL = float(np.finfo(np.float32).eps)
+
+# Columns with more decimals than this are never narrowed to float32
+MAX_DECIMALS = 6
+
+
+EXCEL_EXTENSIONS = ['.xls', '.xlsx']
+
+
+def is_excel(path):
+    return os.path.splitext(path)[-1].lower() in EXCEL_EXTENSIONS
+
+
+def load_dataset(path, progress=None, chunksize=CHUNK_SIZE, sheet=None):
+    ext = os.path.splitext(path)[-1].lower()
+
+    if ext == '.csv':
+        return read_csv_chunked(path, progress=progress, chunksize=chunksize)
+    elif ext in EXCEL_EXTENSIONS:
+        return read_excel_chunked(path, sheet=sheet, progress=progress, chunksize=chunksize)
+    else:
+        raise ValueError("Invalid file format. Please upload a CSV or Excel file.")
+
+
+def read_csv_chunked(path, progress=None, chunksize=CHUNK_SIZE):
+    total_bytes = max(os.path.getsize(path), 1)
+    chunks = []
+    categorical = None
+
+    with open(path, 'rb') as handle:
+        for chunk in pd.read_csv(handle, chunksize=chunksize, na_values=NA_VALUES):
+            # The first chunk decides which text columns are repetitive enough to be categories
+            if categorical is None:
+                categorical = category_columns(chunk)
+            chunks.append(optimize_chunk(chunk, categorical))
+
+            if progress is not None:
+                progress(min(handle.tell() / total_bytes, 1.0))
+
+    if not chunks:
+        return pd.read_csv(path, na_values=NA_VALUES)
+
+    return combine_chunks(chunks, categorical)
+
+
+def excel_sheets(path):
+    # Read-only mode parses the workbook index only, not the sheets
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+
+def read_excel_chunked(path, sheet=None, progress=None, chunksize=CHUNK_SIZE):
+    # Streams rows out of the sheet XML instead of building the workbook's cell
+    # objects, and converts them chunk by chunk like the CSV path
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet is not None else workbook.worksheets[0]
+        # The sheet's stored dimensions give the row count for progress, but some
+        # writers record them wrongly, so rows are read until the data ends
+        total_rows = worksheet.max_row or 0
+        worksheet.reset_dimensions()
+        rows = worksheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        columns = _header_names(header)
+
+        chunks = []
+        categorical = None
+        batch = []
+        seen = 1
+        for row in rows:
+            seen += 1
+            # Blank rows are skipped, as the CSV parser does
+            if all(value is None for value in row):
+                continue
+            if len(row) != len(columns):
+                row = (row + (None,) * len(columns))[:len(columns)]
+            batch.append(row)
+            if len(batch) == chunksize:
+                chunk = _excel_chunk(batch, columns)
+                if categorical is None:
+                    categorical = category_columns(chunk)
+                chunks.append(optimize_chunk(chunk, categorical))
+                batch = []
+                if progress is not None and total_rows:
+                    progress(min(seen / total_rows, 1.0))
+
+        if batch or not chunks:
+            chunk = _excel_chunk(batch, columns)
+            if categorical is None:
+                categorical = category_columns(chunk)
+            chunks.append(optimize_chunk(chunk, categorical))
+    finally:
+        workbook.close()
+
+    if progress is not None:
+        progress(1.0)
+    return combine_chunks(chunks, categorical)
+
+
+def _header_names(header):
+    # Same names pandas gives: "Unnamed: i" for blanks and ".n" suffixes for repeats
+    names = []
+    counts = {}
+    for i, value in enumerate(header):
+        name = f"Unnamed: {i}" if value is None else str(value)
+        if name in counts:
+            counts[name] += 1
+            name = f"{name}.{counts[name]}"
+        else:
+            counts[name] = 0
+        names.append(name)
+    return names
+
+
+def _excel_chunk(rows, columns):
+    # Placeholders become NaN
+    chunk = pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+    for col in chunk.columns:
+        if chunk[col].dtype == 'object':
+            series = chunk[col].where(~chunk[col].isin(NA_VALUES))
+            # Text columns that only held numbers and placeholders are numeric, as in read_csv
+            numeric = pd.to_numeric(series, errors='coerce')
+            chunk[col] = numeric if numeric.notna().sum() == series.notna().sum() else series
+    return chunk
+
+
+def optimize_frame(df):
+    return optimize_chunk(df, category_columns(df))
+
+
+def category_columns(df):
+    columns = []
+    for col in df.columns:
+        if df[col].dtype == 'object' and len(df) > 0:
+            if col in KEY_COLUMNS or df[col].nunique(dropna=True) <= CATEGORY_RATIO * len(df):
+                columns.append(col)
+    return columns
+
+
+def optimize_chunk(chunk, categorical):
+    for col in chunk.columns:
+        series = chunk[col]
+        if col in categorical:
+            # Going through object keeps the category dtype identical across chunks
+            chunk[col] = series.astype(object).astype('category')
+        elif pd.api.types.is_integer_dtype(series):
+            chunk[col] = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_float_dtype(series):
+            chunk[col] = downcast_float(series)
+    return chunk
+
+
+def downcast_float(series):
+    if series.dtype == np.float32:
+        return series
+
+    # Only lossless narrowing: rounded to the column's own decimal precision, the
+    # float32 values must give back exactly the float64 values read from the file
+    values = series.to_numpy(dtype=np.float64)
+    narrowed = values.astype(np.float32)
+    finite = np.isfinite(values)
+    source = values[finite]
+    restored = narrowed[finite].astype(np.float64)
+    for decimals in range(MAX_DECIMALS + 1):
+        if np.array_equal(np.round(source, decimals), source):
+            if np.array_equal(np.round(restored, decimals), source):
+                return pd.Series(narrowed, index=series.index, name=series.name)
+            break
+    return series
+
+
+def astype_exact(values, dtype):
+    # float32 values widened to float64 keep the decimals they were read with,
+    # rather than float32's binary rounding (591.64, not 591.6400146484375)
+    values = np.asarray(values)
+    if values.dtype == np.float32 and np.dtype(dtype) == np.float64:
+        return values.astype(str).astype(np.float64)
+    return values.astype(dtype)
+
+
+def combine_chunks(chunks, categorical):
+    if len(chunks) == 1:
+        return chunks[0]
+
+    columns = {}
+    for col in chunks[0].columns:
+        parts = [chunk[col] for chunk in chunks]
+        if col in categorical:
+            columns[col] = pd.Series(union_categoricals(parts), name=col)
+        else:
+            dtypes = {part.dtype for part in parts}
+            if dtypes == {np.dtype(np.float32), np.dtype(np.float64)}:
+                # Some chunks narrowed and others did not
+                parts = [pd.Series(astype_exact(part, np.float64), name=col) for part in parts]
+            columns[col] = pd.concat(parts, ignore_index=True)
+        # Release each column's chunk pieces as soon as the combined column exists
+        for chunk in chunks:
+            del chunk[col]
+
+    return pd.DataFrame(columns)
+
+
+def memory_footprint(df):
+    return int(df.memory_usage(deep=True).sum())
+
+
+def format_bytes(n):
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if n < 1024 or unit == 'GB':
+            return f"{n:.1f} {unit}" if unit != 'B' else f"{n} B"
+        n /= 1024
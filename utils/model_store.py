@@ -0,0 +1,176 @@
+import contextlib
+import json
+import os
+import time
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from utils.loader import CHUNK_SIZE, KEY_COLUMNS, NA_VALUES, load_dataset
+from utils.pipelines import HIGH_PRODUCTION, LOW_PRODUCTION
+
+# Trained pipelines saved as a directory:
+#
+#   manifest.json   task, features, target, category lists, class labels,
+#                   production buckets and the training metrics
+#   model.joblib    estimator and scaler, written uncompressed so every numpy
+#                   array inside is memory-mapped on load instead of copied
+#
+# A saved pipeline scores new files chunk by chunk without the training data.
+
+MANIFEST = "manifest.json"
+MODEL_FILE = "model.joblib"
+FORMAT_VERSION = 1
+
+TASKS = ['classification', 'regression', 'clustering']
+METRIC_NAMES = ['accuracy', 'mse', 'r2', 'mae', 'rmse', 'silhouette', 'inertia']
+
+
+def save_pipeline(result, task, directory, store):
+    if task not in TASKS:
+        raise ValueError(f"Unknown task '{task}'.")
+    if result.get('model') is None:
+        raise ValueError("This result has no trained model to save.")
+
+    features = list(result['features'])
+    manifest = {
+        'format': FORMAT_VERSION,
+        'task': task,
+        'created': time.strftime("%Y-%m-%d %H:%M:%S"),
+        'sklearn': sklearn.__version__,
+        'features': features,
+        'target': result.get('target'),
+        # Scoring feeds the model the same dtype it was trained on
+        'dtype': str(store.matrix.dtype),
+        # Categorical features are encoded with the training categories, in the same order
+        'categories': {
+            col: [str(value) for value in store.categories[col]] for col in features if store.is_categorical(col)
+        },
+        'classes': [str(label) for label in result.get('classes', [])],
+        'production_buckets': [LOW_PRODUCTION, HIGH_PRODUCTION],
+        'model_params': result.get('model_params'),
+        'k': result.get('k'),
+        'metrics': {name: float(result[name]) for name in METRIC_NAMES if name in result},
+    }
+
+    os.makedirs(directory, exist_ok=True)
+    joblib.dump({'model': result['model'], 'scaler': result.get('scaler')}, os.path.join(directory, MODEL_FILE))
+    # The manifest goes last and atomically: a directory with one is complete
+    temp_path = os.path.join(directory, MANIFEST + ".tmp")
+    with open(temp_path, 'w') as handle:
+        json.dump(manifest, handle, indent=2)
+    os.replace(temp_path, os.path.join(directory, MANIFEST))
+    return manifest
+
+
+class SavedPipeline:
+    def __init__(self, directory):
+        manifest_path = os.path.join(directory, MANIFEST)
+        if not os.path.exists(manifest_path):
+            raise ValueError(f"No saved model in {directory}.")
+        with open(manifest_path) as handle:
+            self.manifest = json.load(handle)
+        if self.manifest.get('format') != FORMAT_VERSION:
+            raise ValueError("This model was saved in an unsupported format.")
+
+        objects = joblib.load(os.path.join(directory, MODEL_FILE), mmap_mode='r')
+        self.model = objects['model']
+        self.scaler = objects['scaler']
+        self.directory = directory
+
+    @property
+    def task(self):
+        return self.manifest['task']
+
+    @property
+    def features(self):
+        return self.manifest['features']
+
+    def encode(self, chunk, column_map=None):
+        # column_map points model features at differently named file columns,
+        # e.g. a model trained on 2024 Quarter 1 scoring 2025 Quarter 1
+        column_map = column_map or {}
+        X = np.empty((len(chunk), len(self.features)), dtype=self.manifest['dtype'])
+        unseen = 0
+        for i, feature in enumerate(self.features):
+            values = chunk[column_map.get(feature, feature)]
+            categories = self.manifest['categories'].get(feature)
+            if categories is not None:
+                codes = pd.Categorical(values.astype(str), categories=categories).codes
+                unseen += int(((codes < 0) & values.notna().to_numpy()).sum())
+                X[:, i] = codes
+            else:
+                X[:, i] = pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        return X, unseen
+
+    def predict(self, X):
+        # Rows with missing values get no prediction
+        complete = ~np.isnan(X).any(axis=1)
+        output = pd.DataFrame(index=range(len(X)))
+        if self.task == 'clustering':
+            labels = np.full(len(X), -1)
+            if complete.any():
+                labels[complete] = self.model.predict(self.scaler.transform(X[complete])) + 1
+            output['Cluster'] = pd.array(np.where(labels > 0, labels, None), dtype='Int64')
+        elif self.task == 'classification':
+            predicted = np.full(len(X), None, dtype=object)
+            if complete.any():
+                predicted[complete] = np.asarray(self.manifest['classes'])[self.model.predict(X[complete])]
+            output['Predicted Production'] = predicted
+        else:
+            predicted = np.full(len(X), np.nan)
+            if complete.any():
+                predicted[complete] = self.model.predict(X[complete])
+            output[f"Predicted {self.manifest['target']}"] = predicted
+            low, high = self.manifest['production_buckets']
+            buckets = np.where(complete, np.select([predicted < low, predicted < high], ['Low', 'Medium'], default='High'), None)
+            output['Predicted Production'] = buckets
+        return output
+
+
+def iter_scoring_chunks(path, columns, chunksize=CHUNK_SIZE):
+    if os.path.splitext(path)[-1].lower() == '.csv':
+        total_bytes = max(os.path.getsize(path), 1)
+        with open(path, 'rb') as handle:
+            for chunk in pd.read_csv(handle, chunksize=chunksize, usecols=lambda col: col in columns, na_values=NA_VALUES):
+                yield chunk, min(handle.tell() / total_bytes, 1.0)
+    else:
+        df = load_dataset(path)
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize], min((start + chunksize) / max(len(df), 1), 1.0)
+
+
+def score_file(pipeline, path, output_path, column_map=None, progress=None, chunksize=CHUNK_SIZE):
+    column_map = column_map or {}
+    needed = [column_map.get(feature, feature) for feature in pipeline.features]
+    columns = set(needed) | set(KEY_COLUMNS)
+
+    rows = 0
+    unseen = 0
+    temp_path = output_path + ".tmp"
+    try:
+        with open(temp_path, 'w', newline='') as handle:
+            for number, (chunk, fraction) in enumerate(iter_scoring_chunks(path, columns, chunksize)):
+                missing = [col for col in needed if col not in chunk.columns]
+                if missing:
+                    raise KeyError(f"Columns not found in {os.path.basename(path)}: {', '.join(missing)}")
+
+                X, chunk_unseen = pipeline.encode(chunk, column_map)
+                unseen += chunk_unseen
+                scored = pipeline.predict(X)
+                ids = chunk[[col for col in KEY_COLUMNS if col in chunk.columns]].reset_index(drop=True)
+                # Predictions are appended chunk by chunk; only one chunk is ever in memory
+                pd.concat([ids, scored], axis=1).to_csv(handle, header=number == 0, index=False)
+
+                rows += len(chunk)
+                if progress is not None:
+                    progress(fraction)
+    except BaseException:
+        # A failed or cancelled run leaves no partial output behind; if the open itself
+        # failed there is nothing to remove, and the original error is the one to raise
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temp_path)
+        raise
+    os.replace(temp_path, output_path)
+
+    return {'rows': rows, 'unseen_categories': unseen, 'output': output_path}
@@ -0,0 +1,199 @@
+import cProfile
+import io
+import itertools
+import json
+import os
+import pstats
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Lightweight per-stage instrumentation. Every stage records wall time, CPU
+# time and peak memory. Peak memory comes from a background thread sampling
+# the process RSS, which costs one small read every few milliseconds and
+# nothing per allocation; tracemalloc is used instead only while something
+# else has already started tracing. cProfile is opt-in per run.
+
+RSS_INTERVAL = 0.005
+MAX_RUNS = 200
+PROFILE_LINES = 30
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def current_rss():
+    # Resident set size in bytes; falls back to the lifetime peak off Linux
+    try:
+        with open('/proc/self/statm') as handle:
+            return int(handle.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class _RssSampler:
+    # One daemon thread tracks the RSS high-water mark of every open stage
+    def __init__(self, interval=RSS_INTERVAL):
+        self.interval = interval
+        self.watches = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def start(self):
+        rss = current_rss()
+        with self._lock:
+            watch_id = next(self._ids)
+            self.watches[watch_id] = [rss, rss]
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="perf-rss", daemon=True)
+                self._thread.start()
+        self._wake.set()
+        return watch_id
+
+    def stop(self, watch_id):
+        rss = current_rss()
+        with self._lock:
+            start, peak = self.watches.pop(watch_id)
+        return max(peak, rss) - start
+
+    def _run(self):
+        while True:
+            with self._lock:
+                idle = not self.watches
+            if idle:
+                self._wake.clear()
+                self._wake.wait()
+                continue
+
+            rss = current_rss()
+            with self._lock:
+                for watch in self.watches.values():
+                    watch[1] = max(watch[1], rss)
+            time.sleep(self.interval)
+
+
+_SAMPLER = _RssSampler()
+
+
+def watch_rss():
+    # Starts tracking the RSS high-water mark; pass the returned id to peak_rss
+    return _SAMPLER.start()
+
+
+def peak_rss(watch_id):
+    # Bytes the RSS peaked above its level when the watch started
+    return _SAMPLER.stop(watch_id)
+
+
+class PerfRecorder:
+    def __init__(self, max_runs=MAX_RUNS):
+        self.max_runs = max_runs
+        self.profile = False
+        self.runs = []
+        self.version = 0
+        self._ids = itertools.count(1)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def run(self, name, profile=None):
+        # Groups the stages recorded on this thread under one run
+        record = self.start_run(name)
+        previous = getattr(self._local, 'run', None)
+        self._local.run = record
+
+        profiler = None
+        if profile if profile is not None else self.profile:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another profiler is already active on this interpreter
+                profiler = None
+        try:
+            yield record
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                record['profile'] = profile_text(profiler)
+            self._local.run = previous
+            self.finish_run(record)
+
+    def start_run(self, name):
+        record = {
+            'id': next(self._ids),
+            'name': name,
+            'started': time.strftime("%H:%M:%S"),
+            'stages': [],
+            'wall_s': None,
+            '_start': time.perf_counter(),
+        }
+        with self._lock:
+            self.runs.append(record)
+            del self.runs[:-self.max_runs]
+            self.version += 1
+        return record
+
+    def finish_run(self, record):
+        with self._lock:
+            record['wall_s'] = round(time.perf_counter() - record['_start'], 6)
+            self.version += 1
+
+    @contextmanager
+    def stage(self, name, run=None):
+        run = run if run is not None else getattr(self._local, 'run', None)
+        traced = tracemalloc.is_tracing()
+        if traced:
+            tracemalloc.reset_peak()
+            start_memory = tracemalloc.get_traced_memory()[0]
+        else:
+            watch = _SAMPLER.start()
+        start = time.perf_counter()
+        # Process CPU time, so threads used by numpy and sklearn are counted too
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start
+            cpu = time.process_time() - cpu_start
+            if traced:
+                peak = tracemalloc.get_traced_memory()[1] - start_memory
+            else:
+                peak = _SAMPLER.stop(watch)
+
+            if run is not None:
+                with self._lock:
+                    run['stages'].append({
+                        'stage': name,
+                        'wall_s': round(wall, 6),
+                        'cpu_s': round(cpu, 6),
+                        'peak_mb': round(max(peak, 0) / 1024 ** 2, 3),
+                    })
+                    self.version += 1
+
+    def snapshot(self):
+        with self._lock:
+            return [
+                {key: value for key, value in run.items() if not key.startswith('_')} | {'stages': list(run['stages'])}
+                for run in self.runs
+            ]
+
+    def clear(self):
+        with self._lock:
+            self.runs.clear()
+            self.version += 1
+
+    def export_json(self, path):
+        with open(path, 'w') as handle:
+            json.dump({'pid': os.getpid(), 'runs': self.snapshot()}, handle, indent=2)
+
+
+def profile_text(profiler, lines=PROFILE_LINES):
+    output = io.StringIO()
+    pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(lines)
+    return output.getvalue()
@@ -0,0 +1,451 @@
+import os
+from contextlib import nullcontext
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.model_selection import StratifiedKFold, train_test_split
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.metrics import (
+    accuracy_score, classification_report,
+    cohen_kappa_score, mean_absolute_error, precision_recall_fscore_support,
+    mean_squared_error, r2_score, silhouette_score
+)
+from sklearn.preprocessing import LabelEncoder
+from utils.association_miner import TransactionMatrix, mine_itemsets, derive_rules
+from utils.series_store import ANNUAL, period_columns
+
+# UI-free versions of the four dashboard pipelines. Each takes an optional
+# progress callback; under the job runner that is Job.report, which also
+# raises JobCancelled once the user cancels. An optional `stages` object with
+# a stage(name) context manager is told when each pipeline stage runs.
+
+# Every setting that affects the outcome is part of the result cache key
+CLASSIFICATION_PARAMS = {'n_estimators': 100, 'random_state': 42, 'test_size': 0.3}
+REGRESSION_PARAMS = {'model': 'LinearRegression', 'random_state': 42, 'test_size': 0.3}
+CLUSTERING_PARAMS = {'n_init': 10, 'random_state': 42}
+MINIBATCH_PARAMS = {'batch_size': 4096, 'n_init': 3, 'random_state': 42}
+MIN_CONFIDENCE = 0.5
+
+# Above this many rows clustering switches to mini-batch k-means in 'auto' mode
+CLUSTERING_ROW_THRESHOLD = 20000
+
+# Rows sampled for the silhouette score; the exact score is O(n²)
+SILHOUETTE_SAMPLE_SIZE = 5000
+
+# Annual production below LOW_PRODUCTION is Low, below HIGH_PRODUCTION Medium, otherwise High
+LOW_PRODUCTION = 5000
+HIGH_PRODUCTION = 15000
+PRODUCTION_LABELS = ['Low', 'Med', 'High']
+
+
+def _report(progress, message):
+    if progress is not None:
+        progress(message)
+
+
+def _stage(stages, name):
+    return stages.stage(name) if stages is not None else nullcontext()
+
+
+def categorize_production(values):
+    return np.select(
+        [values < LOW_PRODUCTION, values < HIGH_PRODUCTION], ['Low', 'Medium'], default='High'
+    )
+
+
+def run_classification(store, features, target, progress=None, stages=None, model_params=None):
+    # Features come pre-encoded from the shared store, no per-run copies or refits
+    with _stage(stages, "encode"):
+        X = store.features(features)
+        target_encoder = LabelEncoder()
+        y = target_encoder.fit_transform(categorize_production(store.column(target)))
+
+    with _stage(stages, "split"):
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=CLASSIFICATION_PARAMS['test_size'], random_state=CLASSIFICATION_PARAMS['random_state']
+        )
+
+    _report(progress, "Fitting random forest...")
+    with _stage(stages, "fit"):
+        # model_params come from a hyperparameter search and override the defaults
+        model = RandomForestClassifier(**{
+            'n_estimators': CLASSIFICATION_PARAMS['n_estimators'],
+            'random_state': CLASSIFICATION_PARAMS['random_state'],
+            **(model_params or {}),
+        })
+        model.fit(X_train, y_train)
+
+    _report(progress, "Computing metrics...")
+    with _stage(stages, "predict"):
+        predictions = model.predict(X_test)
+
+    with _stage(stages, "metrics"):
+        metrics, accuracy, report = classification_metrics(y_test, predictions)
+
+    return {
+        'features': list(features),
+        'target': target,
+        'model': model,
+        'model_params': model_params,
+        'classes': list(target_encoder.classes_),
+        'feature_importances': model.feature_importances_,
+        'accuracy': accuracy,
+        'report': report,
+        'metrics': metrics,
+    }
+
+
+def classification_metrics(y_test, predictions):
+    mean_actual = np.mean(y_test)
+    metrics = {
+        'correct': int(np.sum(predictions == y_test)),
+        'incorrect': int(np.sum(predictions != y_test)),
+        'kappa': cohen_kappa_score(y_test, predictions),
+        'mae': mean_absolute_error(y_test, predictions),
+        'rmse': np.sqrt(mean_squared_error(y_test, predictions)),
+        'rae': np.sum(np.abs(y_test - predictions)) / np.sum(np.abs(y_test - mean_actual)),
+        'rrse': np.sqrt(np.sum((y_test - predictions) ** 2) / np.sum((y_test - mean_actual) ** 2)),
+    }
+    return metrics, accuracy_score(y_test, predictions), classification_report(y_test, predictions)
+
+
+def _fit_fold(fold, X, y, train_index, test_index, n_classes, tree_jobs):
+    model = RandomForestClassifier(
+        n_estimators=CLASSIFICATION_PARAMS['n_estimators'], random_state=CLASSIFICATION_PARAMS['random_state'],
+        n_jobs=tree_jobs
+    )
+    model.fit(X[train_index], y[train_index])
+    predictions = model.predict(X[test_index])
+    precision, recall, f1, support = precision_recall_fscore_support(
+        y[test_index], predictions, labels=np.arange(n_classes), zero_division=0
+    )
+    return {
+        'fold': fold,
+        'accuracy': accuracy_score(y[test_index], predictions),
+        'kappa': cohen_kappa_score(y[test_index], predictions),
+        'precision': precision,
+        'recall': recall,
+        'f1': f1,
+        'support': support,
+        'feature_importances': model.feature_importances_,
+    }
+
+
+def run_classification_cv(store, features, target, n_folds=5, progress=None, stages=None, n_jobs=-1):
+    with _stage(stages, "encode"):
+        X = store.features(features)
+        target_encoder = LabelEncoder()
+        y = target_encoder.fit_transform(categorize_production(store.column(target)))
+        classes = list(target_encoder.classes_)
+
+    # Every fold needs each class in its test part
+    smallest = np.bincount(y).min()
+    if smallest < 2:
+        raise ValueError("Cross-validation needs at least two rows of every target class.")
+    n_folds = min(n_folds, int(smallest))
+
+    with _stage(stages, "split"):
+        folds = list(StratifiedKFold(
+            n_splits=n_folds, shuffle=True, random_state=CLASSIFICATION_PARAMS['random_state']
+        ).split(X, y))
+
+    # Folds run side by side; cores left over go to the trees inside each fold
+    cores = os.cpu_count() or 1
+    fold_jobs = min(n_folds, cores) if n_jobs == -1 else n_jobs
+    tree_jobs = max(1, cores // fold_jobs)
+
+    scores = []
+    _report(progress, f"Fitting {n_folds} folds...")
+    with _stage(stages, "fit"):
+        tasks = (delayed(_fit_fold)(i, X, y, train, test, len(classes), tree_jobs) for i, (train, test) in enumerate(folds))
+        for fold in Parallel(n_jobs=fold_jobs, return_as='generator_unordered')(tasks):
+            scores.append(fold)
+            _report(progress, f"Fold {len(scores)}/{n_folds} done (accuracy {fold['accuracy']:.3f})")
+    scores.sort(key=lambda fold: fold['fold'])
+
+    with _stage(stages, "metrics"):
+        summary = cv_summary(scores, classes)
+
+    return {
+        'features': list(features),
+        'target': target,
+        'classes': classes,
+        'n_folds': n_folds,
+        **summary,
+    }
+
+
+def cv_summary(scores, classes):
+    def stat(name):
+        values = np.array([fold[name] for fold in scores])
+        return values.mean(axis=0), values.std(axis=0)
+
+    accuracy, accuracy_std = stat('accuracy')
+    kappa, kappa_std = stat('kappa')
+    importances, importances_std = stat('feature_importances')
+
+    precision, precision_std = stat('precision')
+    recall, recall_std = stat('recall')
+    f1, f1_std = stat('f1')
+    support = np.sum([fold['support'] for fold in scores], axis=0)
+
+    width = max(len(str(name)) for name in classes + ['class'])
+    lines = [f"{'class':>{width}}  {'precision':>13}  {'recall':>13}  {'f1-score':>13}  {'support':>7}"]
+    for i, name in enumerate(classes):
+        cells = [f"{mean[i]:.2f} ± {std[i]:.2f}" for mean, std in [(precision, precision_std), (recall, recall_std), (f1, f1_std)]]
+        lines.append(f"{name:>{width}}  " + "  ".join(f"{cell:>13}" for cell in cells) + f"  {support[i]:>7}")
+
+    return {
+        'accuracy': accuracy,
+        'accuracy_std': accuracy_std,
+        'kappa': kappa,
+        'kappa_std': kappa_std,
+        'fold_accuracies': [fold['accuracy'] for fold in scores],
+        'feature_importances': importances,
+        'feature_importances_std': importances_std,
+        'report': '\n'.join(lines),
+    }
+
+
+def run_regression(store, features, target, progress=None, stages=None, model_params=None):
+    with _stage(stages, "encode"):
+        X = store.features(features)
+        y = store.column(target)
+
+    with _stage(stages, "split"):
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=REGRESSION_PARAMS['test_size'], random_state=REGRESSION_PARAMS['random_state']
+        )
+
+    _report(progress, "Fitting linear regression...")
+    with _stage(stages, "fit"):
+        # A searched model is a regularized linear regression; plain OLS otherwise
+        model = Ridge(**model_params) if model_params else LinearRegression()
+        model.fit(X_train, y_train)
+
+    _report(progress, "Computing metrics...")
+    with _stage(stages, "predict"):
+        predictions = model.predict(X_test)
+
+    with _stage(stages, "metrics"):
+        metrics = regression_metrics(y_test, predictions)
+
+    return {
+        'features': list(features),
+        'target': target,
+        'model': model,
+        'model_params': model_params,
+        'y_test': y_test,
+        'predictions': predictions,
+        **metrics,
+    }
+
+
+def regression_metrics(y_test, predictions):
+    mse = mean_squared_error(y_test, predictions)
+    mae = mean_absolute_error(y_test, predictions)
+    rmse = mse ** 0.5
+
+    return {
+        'mse': mse,
+        'r2': r2_score(y_test, predictions),
+        'mae': mae,
+        'rmse': rmse,
+        'corr_coeff': np.corrcoef(y_test, predictions)[0, 1],
+        'rae': (mae / y_test.mean()) * 100,
+        'rrse': (rmse / y_test.std(ddof=1)) * 100,
+        'n': len(y_test),
+    }
+
+
+def clustering_mode(n_rows, mode='auto'):
+    if mode == 'auto':
+        return 'minibatch' if n_rows > CLUSTERING_ROW_THRESHOLD else 'full'
+    return mode
+
+
+def run_clustering(store, features, k, progress=None, stages=None, mode='auto',
+                   sample_size=SILHOUETTE_SAMPLE_SIZE):
+    # The store caches the standardized matrix per feature set
+    with _stage(stages, "encode"):
+        scaler, X = store.scaled(features)
+
+    mode = clustering_mode(len(X), mode)
+    with _stage(stages, "fit"):
+        if mode == 'minibatch':
+            _report(progress, "Fitting mini-batch K-Means...")
+            kmeans = MiniBatchKMeans(n_clusters=k, **MINIBATCH_PARAMS)
+        else:
+            _report(progress, "Fitting K-Means...")
+            kmeans = KMeans(n_clusters=k, n_init=CLUSTERING_PARAMS['n_init'], random_state=CLUSTERING_PARAMS['random_state'])
+        labels = kmeans.fit_predict(X)
+
+    _report(progress, "Computing silhouette score...")
+    with _stage(stages, "metrics"):
+        # Sampling keeps the silhouette's pairwise distances bounded on large tables
+        sampled = sample_size is not None and len(X) > sample_size
+        silhouette_avg = silhouette_score(
+            X, labels,
+            sample_size=sample_size if sampled else None,
+            random_state=CLUSTERING_PARAMS['random_state']
+        )
+        cluster_sizes = np.bincount(labels, minlength=k)
+
+    return {
+        'features': list(features),
+        'k': k,
+        'mode': mode,
+        'silhouette_sample': sample_size if sampled else None,
+        'model': kmeans,
+        'scaler': scaler,
+        'X': X,
+        'labels': labels,
+        'centroids': kmeans.cluster_centers_,
+        'silhouette': silhouette_avg,
+        'inertia': kmeans.inertia_,
+        'n_iter': kmeans.n_iter_,
+        'cluster_sizes': cluster_sizes.tolist(),
+    }
+
+
+def _fit_k(X, k, mode, sample_size):
+    if mode == 'minibatch':
+        kmeans = MiniBatchKMeans(n_clusters=k, **MINIBATCH_PARAMS)
+    else:
+        kmeans = KMeans(n_clusters=k, n_init=CLUSTERING_PARAMS['n_init'], random_state=CLUSTERING_PARAMS['random_state'])
+    labels = kmeans.fit_predict(X)
+    sampled = sample_size is not None and len(X) > sample_size
+    silhouette_avg = silhouette_score(
+        X, labels, sample_size=sample_size if sampled else None, random_state=CLUSTERING_PARAMS['random_state']
+    )
+    return {'k': k, 'inertia': kmeans.inertia_, 'silhouette': silhouette_avg}
+
+
+def run_k_sweep(store, features, k_values, progress=None, stages=None, mode='auto',
+                sample_size=SILHOUETTE_SAMPLE_SIZE, n_jobs=-1):
+    # Every k is fitted on the same standardized matrix; joblib memory-maps it
+    # into the worker processes instead of copying it per candidate
+    with _stage(stages, "encode"):
+        _, X = store.scaled(features)
+    mode = clustering_mode(len(X), mode)
+
+    points = []
+    with _stage(stages, "fit"):
+        tasks = (delayed(_fit_k)(X, k, mode, sample_size) for k in k_values)
+        for point in Parallel(n_jobs=n_jobs, return_as='generator_unordered')(tasks):
+            points.append(point)
+            # Each finished k is streamed to the caller as it arrives
+            if progress is not None:
+                progress(point)
+
+    points.sort(key=lambda point: point['k'])
+    best = max(points, key=lambda point: point['silhouette'])
+    return {
+        'features': list(features),
+        'mode': mode,
+        'points': points,
+        'recommended_k': best['k'],
+    }
+
+
+def build_transactions(raw_df, thresholds=(LOW_PRODUCTION, HIGH_PRODUCTION)):
+    # Emits the bit-packed transaction matrix directly: one item per species and
+    # per (year, production bucket), without building a dense one-hot frame
+    items, bit_rows = _species_items(raw_df)
+    annual_items, annual_bits = _annual_items(raw_df, period_columns(raw_df.columns, quarter=ANNUAL), thresholds)
+    items += annual_items
+    bit_rows += annual_bits
+
+    n_bytes = (len(raw_df) + 7) // 8
+    bits = np.vstack(bit_rows) if bit_rows else np.zeros((0, n_bytes), dtype=np.uint8)
+    return TransactionMatrix(items, bits, len(raw_df))
+
+
+def update_transactions(transactions, merged_df, delta, thresholds=(LOW_PRODUCTION, HIGH_PRODUCTION)):
+    # Same result as build_transactions(merged_df), but only appended rows and
+    # new or changed Annual columns are bucketed again
+    matrix = transactions
+    n_old = transactions.n_transactions
+    if delta['new_rows']:
+        matrix = matrix.append_rows(build_transactions(merged_df.iloc[n_old:], thresholds))
+
+    changed = set(delta['new_columns']) | set(delta['updated_columns'])
+    annual_cols = period_columns(merged_df.columns, quarter=ANNUAL)
+    rebuilt = [period for period in annual_cols if period[0] in changed]
+    if rebuilt:
+        items, bit_rows = _annual_items(merged_df, rebuilt, thresholds)
+        prefixes = tuple(f"{year}_Annual_" for _, year, _ in rebuilt)
+        kept = [item for item in matrix.items if not item.startswith(prefixes)]
+        bits = matrix.bits[[matrix.item_index[item] for item in kept]]
+        matrix = TransactionMatrix(kept + items, np.vstack([bits, *bit_rows]), matrix.n_transactions)
+
+    # Put the items back in build_transactions' order
+    species = sorted(item for item in matrix.items if item.startswith("Species_"))
+    annual = [
+        f"{year}_Annual_{label}" for _, year, _ in annual_cols for label in sorted(PRODUCTION_LABELS)
+    ]
+    order = species + [item for item in annual if item in matrix.item_index]
+    return matrix.subset(order)
+
+
+def _species_items(raw_df):
+    n_bytes = (len(raw_df) + 7) // 8
+    items = []
+    bit_rows = []
+
+    species = raw_df['Species'].astype('category')
+    names = species.cat.categories.astype(str).str.replace(r"[^\w]", "_", regex=True)
+    # Cleaning can map two labels onto the same item name; they share one item
+    item_names, name_codes = np.unique(np.asarray(names), return_inverse=True)
+    codes = species.cat.codes.to_numpy()
+    present = codes >= 0
+    rows = np.flatnonzero(present)
+    species_bits = np.zeros((len(item_names), n_bytes), dtype=np.uint8)
+    np.bitwise_or.at(
+        species_bits,
+        (name_codes[codes[present]], rows >> 3),
+        (np.uint8(128) >> (rows & 7).astype(np.uint8))
+    )
+    for name, bits in zip(item_names, species_bits):
+        if bits.any():
+            items.append(f"Species_{name}")
+            bit_rows.append(bits)
+    return items, bit_rows
+
+
+def _annual_items(raw_df, annual_cols, thresholds):
+    items = []
+    bit_rows = []
+    if annual_cols:
+        # NaN falls in the top bucket, as the old per-cell comparison did
+        buckets = np.digitize(raw_df[[col for col, _, _ in annual_cols]].to_numpy(dtype=np.float64), thresholds)
+        for i, (_, year, _) in enumerate(annual_cols):
+            for bucket in sorted(range(len(PRODUCTION_LABELS)), key=lambda b: PRODUCTION_LABELS[b]):
+                column_bits = np.packbits(buckets[:, i] == bucket)
+                if column_bits.any():
+                    items.append(f"{year}_Annual_{PRODUCTION_LABELS[bucket]}")
+                    bit_rows.append(column_bits)
+    return items, bit_rows
+
+
+def run_association(transactions, items, min_support, progress=None, stages=None):
+    # Accepts a packed TransactionMatrix or a bool one-hot frame
+    if isinstance(transactions, TransactionMatrix):
+        matrix = transactions.subset(items)
+    else:
+        matrix = TransactionMatrix.from_frame(transactions[items])
+
+    _report(progress, f"Mining frequent itemsets over {len(items)} items...")
+    with _stage(stages, "mine"):
+        mined = mine_itemsets(matrix, min_support, progress=progress)
+
+    _report(progress, f"Found {len(mined.itemsets):,} frequent itemsets. Deriving rules...")
+    with _stage(stages, "rules"):
+        rules, rules_truncated = derive_rules(mined, matrix.items, MIN_CONFIDENCE, progress=progress)
+
+    return {
+        'rules': rules,
+        'n_itemsets': len(mined.itemsets),
+        'truncated': mined.truncated or rules_truncated,
+    }
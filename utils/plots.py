@@ -0,0 +1,68 @@
+import numpy as np
+from matplotlib.artist import setp
+
+# Drawing helpers shared by the Tk tabs and the command line runner; each
+# draws a pipeline result onto an existing axes.
+
+# Above this many points scatters are replaced by a density plot or a fixed
+# random sample, so drawing cost stops growing with the table
+MAX_SCATTER_POINTS = 5000
+HEXBIN_GRIDSIZE = 60
+
+
+def plot_feature_importances(ax, result):
+    # Cross-validated results carry the spread across folds as error bars
+    ax.bar(result['features'], result['feature_importances'], yerr=result.get('feature_importances_std'),
+           capsize=4, color='teal')
+    ax.set_xlabel("Features")
+    ax.set_ylabel("Importance")
+    ax.set_title("Feature Importances")
+    setp(ax.get_xticklabels(), rotation=45, ha="right")
+
+
+def sample_indices(n, limit=MAX_SCATTER_POINTS, seed=0):
+    # The same rows are drawn on every redraw of the same result
+    if n <= limit:
+        return slice(None)
+    return np.sort(np.random.default_rng(seed).choice(n, size=limit, replace=False))
+
+
+def plot_regression(ax, result):
+    y_test = np.asarray(result['y_test'])
+    predictions = np.asarray(result['predictions'])
+    if len(y_test) > MAX_SCATTER_POINTS:
+        density = ax.hexbin(y_test, predictions, gridsize=HEXBIN_GRIDSIZE, bins='log', mincnt=1, cmap='Blues')
+        ax.figure.colorbar(density, ax=ax, label="Points (log)")
+    else:
+        ax.scatter(y_test, predictions)
+    ax.plot([y_test.min(), y_test.max()], [y_test.min(), y_test.max()], color='red', lw=2)
+    ax.set_xlabel("True Values")
+    ax.set_ylabel("Predictions")
+    ax.set_title("True vs Predicted")
+
+
+def plot_trend(ax, result):
+    trend = result['trend']
+    ax.plot(range(len(trend)), trend.to_numpy(), marker='o', color='teal')
+    ax.set_xticks(range(len(trend)))
+    ax.set_xticklabels(trend.index)
+    setp(ax.get_xticklabels(), rotation=45, ha="right")
+    ax.set_ylabel("Production")
+    ax.set_title(f"Quarterly Production: {result['name']}")
+
+
+def plot_clusters(ax, result):
+    X = result['X']
+    centroids = result['centroids']
+    shown = sample_indices(len(X))
+    # Large clouds are sampled and rasterized; colour by cluster keeps them readable
+    large = len(X) > MAX_SCATTER_POINTS
+    ax.scatter(X[shown, 0], X[shown, 1], c=result['labels'][shown], cmap='viridis',
+               s=10 if large else 50, alpha=0.6, rasterized=large)
+    ax.scatter(centroids[:, 0], centroids[:, 1], c='red', s=100, marker='X')
+    title = f"K-Means Clustering (k={result['k']})"
+    if large:
+        title += f", {MAX_SCATTER_POINTS:,} of {len(X):,} points"
+    ax.set_title(title)
+    ax.set_xlabel(result['features'][0])
+    ax.set_ylabel(result['features'][1])
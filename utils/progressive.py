@@ -0,0 +1,143 @@
+import numpy as np
+from utils.pipelines import (
+    SILHOUETTE_SAMPLE_SIZE, _report, _stage, categorize_production, clustering_mode, run_association,
+    run_classification, run_clustering, run_regression
+)
+
+# Preview-then-refine runs. A pipeline is first fitted on a small stratified
+# sample, then on samples growing by GROWTH until the full table. Every round's
+# result is sent to the progress callback as soon as it exists, labelled with
+# the rows it used, so the tab can show a preview within a second and the user
+# can stop once the headline metric has settled. Samples are nested: each one
+# contains the previous, which keeps the rounds comparable.
+
+PREVIEW_ROWS = 2000
+GROWTH = 4
+RANDOM_STATE = 42
+
+# A round whose headline metric moved less than this (relative) counts as settled
+STABLE_TOLERANCE = 0.01
+
+# Regression targets are stratified on this many quantile bins
+TARGET_BINS = 10
+
+
+def sample_schedule(n_rows, start=PREVIEW_ROWS, growth=GROWTH):
+    sizes = []
+    size = start
+    while size < n_rows:
+        sizes.append(size)
+        size *= growth
+    return sizes + [n_rows]
+
+
+def sample_order(n_rows, strata=None, random_state=RANDOM_STATE):
+    # A row order whose every prefix is a (near) proportional stratified sample:
+    # rows are spread over [0, 1) within their stratum and interleaved by position
+    rng = np.random.default_rng(random_state)
+    noise = rng.random(n_rows)
+    if strata is None:
+        return np.argsort(noise, kind='stable')
+
+    _, codes, counts = np.unique(strata, return_inverse=True, return_counts=True)
+    by_stratum = np.lexsort((noise, codes))
+    rank = np.empty(n_rows, dtype=np.int64)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    rank[by_stratum] = np.arange(n_rows) - np.repeat(starts, counts)
+    position = (rank + noise) / counts[codes]
+    return np.argsort(position, kind='stable')
+
+
+def quantile_bins(values, n_bins=TARGET_BINS):
+    values = np.asarray(values, dtype=np.float64)
+    edges = np.nanquantile(values, np.linspace(0, 1, n_bins + 1)[1:-1]) if np.isfinite(values).any() else []
+    return np.digitize(values, np.unique(edges))
+
+
+def run_progressive(fit, take, n_rows, metric, strata=None, progress=None, stages=None,
+                    start=PREVIEW_ROWS, growth=GROWTH):
+    # fit(data, progress) runs one round on the data take(rows) returns (or on None: the full table).
+    # Previews are labelled copies; the final result is returned as the pipeline made it, since
+    # callers cache it under the same key as a regular run
+    order = sample_order(n_rows, strata)
+    schedule = sample_schedule(n_rows, start, growth)
+    previous = None
+    result = None
+    for round_number, size in enumerate(schedule):
+        _report(progress, f"Fitting on {size:,} of {n_rows:,} rows...")
+        with _stage(stages, "preview" if round_number == 0 else "refine"):
+            data = take(np.sort(order[:size])) if size < n_rows else None
+            result = fit(data, progress)
+
+        value = metric(result)
+        change = abs(value - previous) / max(abs(previous), 1e-12) if previous is not None else None
+        previous = value
+        if size < n_rows and progress is not None:
+            progress({
+                **result,
+                'sample_rows': size,
+                'total_rows': n_rows,
+                'preview': True,
+                'metric_change': change,
+                'stable': change is not None and change < STABLE_TOLERANCE,
+            })
+    return result
+
+
+def preview_note(result):
+    # One line for the results label: how much data a preview saw and whether it has settled
+    if not result.get('preview'):
+        return ""
+
+    note = f"PREVIEW on {result['sample_rows']:,} of {result['total_rows']:,} rows"
+    if result.get('stopped'):
+        return note + "; stopped early."
+    note += "; refining in the background."
+    if result['metric_change'] is not None:
+        settled = " Results have stabilized; Cancel keeps this preview." if result['stable'] else ""
+        note += f" Changed {result['metric_change'] * 100:.1f}% since the last sample.{settled}"
+    return note
+
+
+def progressive_classification(store, features, target, progress=None, stages=None):
+    # Stratified on the production classes the model predicts
+    strata = categorize_production(store.column(target))
+    return run_progressive(
+        lambda data, report: run_classification(
+            data if data is not None else store, features, target, progress=report, stages=stages
+        ),
+        store.take, len(store.df), lambda result: result['accuracy'], strata, progress, stages
+    )
+
+
+def progressive_regression(store, features, target, progress=None, stages=None):
+    strata = quantile_bins(store.column(target))
+    return run_progressive(
+        lambda data, report: run_regression(
+            data if data is not None else store, features, target, progress=report, stages=stages
+        ),
+        store.take, len(store.df), lambda result: result['r2'], strata, progress, stages
+    )
+
+
+def progressive_clustering(store, features, k, progress=None, stages=None, mode='auto',
+                           sample_size=SILHOUETTE_SAMPLE_SIZE):
+    # 'auto' is decided on the full table, so every round fits the estimator the final result uses
+    mode = clustering_mode(len(store.df), mode)
+    return run_progressive(
+        lambda data, report: run_clustering(
+            data if data is not None else store, features, k, progress=report, stages=stages,
+            mode=mode, sample_size=sample_size
+        ),
+        store.take, len(store.df), lambda result: result['inertia'] / len(result['labels']), None, progress, stages
+    )
+
+
+def progressive_association(transactions, items, min_support, progress=None, stages=None):
+    # Support is a share of the transactions, so the threshold holds on every sample
+    return run_progressive(
+        lambda data, report: run_association(
+            data if data is not None else transactions, items, min_support, progress=report, stages=stages
+        ),
+        transactions.take, transactions.n_transactions, lambda result: len(result['rules']), None, progress, stages
+    )
@@ -0,0 +1,112 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+RESULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ml-dashboard", "results")
+MAX_ENTRIES = 32
+
+logger = logging.getLogger(__name__)
+
+
+def result_key(fingerprint, tab, features, target=None, **params):
+    # Everything that changes a run's outcome goes into the key, random_state included
+    payload = json.dumps(
+        [fingerprint, tab, list(features), target, sorted(params.items())],
+        default=str
+    )
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def is_final(value):
+    # Runs cut short by a time or size budget (hyperparameter search, association mining)
+    # depend on machine load, so they are not cached and a rerun can finish the work
+    return not (isinstance(value, dict) and (value.get('timed_out') or value.get('truncated')))
+
+
+class ResultCache:
+    def __init__(self, max_entries=MAX_ENTRIES, persist_dir=None):
+        self.max_entries = max_entries
+        self.persist_dir = persist_dir
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if persist_dir is not None:
+            os.makedirs(persist_dir, exist_ok=True)
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        value = self._read_disk(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, value)
+        return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._store(key, value)
+        self._write_disk(key, value)
+
+    def get_or_compute(self, key, compute):
+        # Returns (value, hit) so callers can say when a result was reused
+        value = self.get(key)
+        if value is not None:
+            return value, True
+        value = compute()
+        if is_final(value):
+            self.put(key, value)
+        return value, False
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.persist_dir is not None:
+            for name in os.listdir(self.persist_dir):
+                if name.endswith(".pkl"):
+                    os.remove(os.path.join(self.persist_dir, name))
+
+    def _store(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_path(self, key):
+        return os.path.join(self.persist_dir, key + ".pkl")
+
+    def _read_disk(self, key):
+        if self.persist_dir is None or not os.path.exists(self._disk_path(key)):
+            return None
+        try:
+            with open(self._disk_path(key), 'rb') as handle:
+                return pickle.load(handle)
+        except Exception:
+            return None
+
+    def _write_disk(self, key, value):
+        if self.persist_dir is None:
+            return
+        tmp_path = self._disk_path(key) + ".tmp"
+        try:
+            with open(tmp_path, 'wb') as handle:
+                pickle.dump(value, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._disk_path(key))
+        except Exception as e:
+            # The result stays in memory; only the next session recomputes it
+            logger.warning("Could not persist result %s: %s", key, e)
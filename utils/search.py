@@ -0,0 +1,265 @@
+import ast
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import Ridge
+from sklearn.model_selection import KFold, ParameterGrid, ParameterSampler, StratifiedKFold, train_test_split
+from sklearn.preprocessing import LabelEncoder
+from utils.pipelines import (
+    categorize_production, run_classification, run_regression,
+    CLASSIFICATION_PARAMS, REGRESSION_PARAMS, _report, _stage
+)
+
+# Hyperparameter search shared by the classification and regression tabs.
+# Candidates are scored by k-fold CV on the training split only, in a process
+# pool that receives the data once per worker. The winner is refitted through
+# the tab's own pipeline, so its metrics and plots use the usual test split.
+
+METHODS = ['grid', 'random', 'halving']
+
+# Parameter space text: "name=value,value; name=value,..."
+DEFAULT_SPACES = {
+    'classification': "n_estimators=50,100,200; max_depth=None,5,10; min_samples_leaf=1,2,5",
+    'regression': "alpha=0.001,0.01,0.1,1,10,100; fit_intercept=True,False",
+}
+
+SEARCH_FOLDS = 3
+RANDOM_CANDIDATES = 10
+HALVING_FACTOR = 3
+TIME_BUDGET = 300.0
+
+# A candidate is dropped once a fold scores this far below the current best
+# candidate's score on the same fold
+EARLY_STOP_MARGIN = 0.1
+
+LEADERBOARD_SIZE = 10
+
+
+def parse_space(text):
+    space = {}
+    for part in text.split(';'):
+        if not part.strip():
+            continue
+        if '=' not in part:
+            raise ValueError(f"Expected name=value,... in '{part.strip()}'.")
+        name, values = part.split('=', 1)
+        space[name.strip()] = [_parse_value(value.strip()) for value in values.split(',') if value.strip()]
+    if not space:
+        raise ValueError("The parameter space is empty.")
+    return space
+
+
+def _parse_value(text):
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+def make_estimator(task, params):
+    if task == 'classification':
+        return RandomForestClassifier(**{
+            'n_estimators': CLASSIFICATION_PARAMS['n_estimators'],
+            'random_state': CLASSIFICATION_PARAMS['random_state'],
+            **params,
+        })
+    return Ridge(**params)
+
+
+def candidates(space, method, n_iter=RANDOM_CANDIDATES, random_state=42):
+    if method == 'grid':
+        return list(ParameterGrid(space))
+    # Random and halving both start from a sample of the space
+    grid_size = len(ParameterGrid(space))
+    return list(ParameterSampler(space, n_iter=min(n_iter, grid_size), random_state=random_state))
+
+
+# Worker side: the training split is installed once per process
+_DATA = {}
+
+
+def _init_worker(task, X, y):
+    _DATA.update(task=task, X=X, y=y)
+
+
+def _evaluate(index, params, rows, reference):
+    task, X, y = _DATA['task'], _DATA['X'], _DATA['y']
+    if rows is not None:
+        X, y = X[rows], y[rows]
+
+    started = time.monotonic()
+    if task == 'classification':
+        splitter = StratifiedKFold(n_splits=SEARCH_FOLDS, shuffle=True, random_state=42)
+    else:
+        splitter = KFold(n_splits=SEARCH_FOLDS, shuffle=True, random_state=42)
+
+    scores = []
+    for fold, (train, test) in enumerate(splitter.split(X, y)):
+        model = make_estimator(task, params)
+        model.fit(X[train], y[train])
+        scores.append(model.score(X[test], y[test]))
+        # Folds are fixed, so a clearly worse fold means a worse candidate; stop paying for it
+        if reference is not None and scores[-1] < reference[fold] - EARLY_STOP_MARGIN:
+            return _entry(index, params, scores, started, 'pruned', rows)
+    return _entry(index, params, scores, started, 'done', rows)
+
+
+def _entry(index, params, scores, started, status, rows):
+    return {
+        'index': index,
+        'params': params,
+        'score': float(np.mean(scores)),
+        'std': float(np.std(scores)),
+        'fold_scores': scores,
+        'folds': len(scores),
+        'rows': None if rows is None else len(rows),
+        'seconds': time.monotonic() - started,
+        'status': status,
+    }
+
+
+def leaderboard(entries, size=LEADERBOARD_SIZE):
+    # Finished candidates first, best score first; pruned ones rank below them
+    ranked = sorted(entries, key=lambda entry: (entry['status'] != 'done', -entry['score']))
+    return ranked[:size]
+
+
+def training_split(store, task, features, target):
+    X = store.features(features)
+    if task == 'classification':
+        y = LabelEncoder().fit_transform(categorize_production(store.column(target)))
+        params = CLASSIFICATION_PARAMS
+    else:
+        y = np.asarray(store.column(target), dtype=np.float64)
+        params = REGRESSION_PARAMS
+    # The same split the tab's pipeline uses, so the test rows stay unseen
+    X_train, _, y_train, _ = train_test_split(
+        X, y, test_size=params['test_size'], random_state=params['random_state']
+    )
+    return X_train, y_train
+
+
+def run_search(store, task, features, target, space, method='grid', time_budget=TIME_BUDGET,
+               n_iter=RANDOM_CANDIDATES, progress=None, stages=None, max_workers=None):
+    with _stage(stages, "encode"):
+        X, y = training_split(store, task, features, target)
+
+    pool_candidates = candidates(space, method, n_iter)
+    deadline = time.monotonic() + time_budget if time_budget else None
+    entries = []
+    timed_out = False
+
+    if method == 'halving':
+        rounds = _halving_rounds(len(pool_candidates), len(X))
+    else:
+        rounds = [(len(pool_candidates), None)]
+
+    # spawn keeps the workers independent of the Tk process state
+    max_workers = max_workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker, initargs=(task, X, y)
+    )
+    try:
+        with _stage(stages, "search"):
+            active = list(enumerate(pool_candidates))
+            for round_number, (keep, n_rows) in enumerate(rounds):
+                active = active[:max(keep, 1)] if round_number else active
+                rows = _subsample(len(X), n_rows)
+                _report(progress, f"Round {round_number + 1}/{len(rounds)}: {len(active)} candidate(s)"
+                                  + (f" on {len(rows):,} rows" if rows is not None else ""))
+
+                round_entries, timed_out = _run_round(pool, max_workers, active, rows, entries, deadline, progress)
+                if timed_out or not round_entries:
+                    break
+                # Successive halving keeps the best 1/factor for the next, larger round
+                ranked = leaderboard(round_entries, size=len(round_entries))
+                active = [(entry['index'], entry['params']) for entry in ranked if entry['status'] == 'done']
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    final = [entry for entry in entries if entry['rows'] is None] or entries
+    finished = [entry for entry in final if entry['status'] == 'done']
+    if not finished:
+        raise RuntimeError("No candidate finished within the time budget.")
+    best = leaderboard(finished, size=1)[0]
+
+    _report(progress, f"Refitting the best candidate: {format_params(best['params'])}")
+    with _stage(stages, "refit"):
+        if task == 'classification':
+            result = run_classification(store, features, target, model_params=best['params'])
+        else:
+            result = run_regression(store, features, target, model_params=best['params'])
+
+    return {
+        'task': task,
+        'method': method,
+        'best_params': best['params'],
+        'best_score': best['score'],
+        'leaderboard': leaderboard(final),
+        'evaluated': len(entries),
+        'timed_out': timed_out,
+        'result': result,
+    }
+
+
+def _run_round(pool, max_workers, active, rows, entries, deadline, progress):
+    n_rows = None if rows is None else len(rows)
+    finished = [entry for entry in entries if entry['status'] == 'done' and entry['rows'] == n_rows]
+    best = max(finished, key=lambda entry: entry['score'], default=None)
+    pending = {}
+    round_entries = []
+
+    queue = list(active)
+    # Keep the pool just full, so later submissions see the best score so far
+    while queue or pending:
+        while queue and len(pending) < max_workers:
+            index, params = queue.pop(0)
+            pending[pool.submit(_evaluate, index, params, rows, best and best['fold_scores'])] = index
+
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if remaining is not None and remaining <= 0:
+            for future in pending:
+                future.cancel()
+            return round_entries, True
+
+        done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            pending.pop(future)
+            entry = future.result()
+            entries.append(entry)
+            round_entries.append(entry)
+            if entry['status'] == 'done' and (best is None or entry['score'] > best['score']):
+                best = entry
+            # Also raises JobCancelled under the job runner, which shuts the pool down
+            if progress is not None:
+                progress({'leaderboard': leaderboard(round_entries), 'done': len(round_entries),
+                          'total': len(active)})
+    return round_entries, False
+
+
+def _halving_rounds(n_candidates, n_rows):
+    # (candidates kept, rows used) per round; the last round uses every row
+    n_rounds = max(1, math.ceil(math.log(max(n_candidates, 1), HALVING_FACTOR)) + 1)
+    rounds = []
+    for r in range(n_rounds):
+        keep = max(1, math.ceil(n_candidates / HALVING_FACTOR ** r))
+        n_used = n_rows // HALVING_FACTOR ** (n_rounds - 1 - r)
+        # Rounds too small to split into folds are skipped
+        if n_used >= SEARCH_FOLDS * 10 or r == n_rounds - 1:
+            rounds.append((keep, None if r == n_rounds - 1 else n_used))
+    return rounds
+
+
+def _subsample(n, n_rows):
+    if n_rows is None or n_rows >= n:
+        return None
+    return np.sort(np.random.default_rng(42).choice(n, size=n_rows, replace=False))
+
+
+def format_params(params):
+    return ', '.join(f"{name}={value}" for name, value in sorted(params.items()))
@@ -0,0 +1,153 @@
+import re
+import threading
+import numpy as np
+import pandas as pd
+
+# Long-format view of the wide fisheries tables. Every "YYYY Quarter N" and
+# "YYYY Annual" cell becomes one row keyed by Geolocation, Species, year and
+# quarter (0 for the reported annual figure). The reshape runs once; the
+# aggregation queries are cached, so repeated reads never rescan the frame.
+
+PERIOD_PATTERN = re.compile(r"^\s*(\d{4})\s+(?:Quarter\s*([1-4])|Annual)\s*$", re.IGNORECASE)
+
+# Species rows that are already sums of the other rows
+TOTAL_LABELS = ['TOTAL']
+
+ANNUAL = 0
+
+
+def parse_period(col):
+    # (year, quarter) for a period column, quarter 0 for Annual; None for anything else
+    match = PERIOD_PATTERN.match(str(col))
+    if match is None:
+        return None
+    return int(match.group(1)), int(match.group(2) or ANNUAL)
+
+
+def period_columns(columns, quarter=None):
+    # [(column, year, quarter)] in column order, optionally for one quarter (0 = Annual)
+    periods = []
+    for col in columns:
+        period = parse_period(col)
+        if period is not None and (quarter is None or period[1] == quarter):
+            periods.append((col, *period))
+    return periods
+
+
+def period_label(year, quarter):
+    return f"{year} Annual" if quarter == ANNUAL else f"{year} Q{quarter}"
+
+
+class SeriesStore:
+    def __init__(self, long):
+        self.long = long
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_wide(cls, df):
+        periods = period_columns(df.columns)
+        if not periods:
+            raise ValueError("No 'YYYY Quarter N' or 'YYYY Annual' columns found.")
+
+        n = len(df)
+        geolocation = _category(df, 'Geolocation', n)
+        species = _category(df, 'Species', n)
+        values = df[[col for col, _, _ in periods]].to_numpy(dtype=np.float64, na_value=np.nan)
+
+        # Column-major ravel puts each period's rows together
+        long = pd.DataFrame({
+            'Geolocation': pd.Categorical.from_codes(np.tile(geolocation.codes, len(periods)), geolocation.categories),
+            'Species': pd.Categorical.from_codes(np.tile(species.codes, len(periods)), species.categories),
+            'year': np.repeat(np.array([year for _, year, _ in periods], dtype=np.int16), n),
+            'quarter': np.repeat(np.array([quarter for _, _, quarter in periods], dtype=np.int8), n),
+            'value': values.ravel(order='F'),
+        })
+        long = long[long['value'].notna()]
+        long = long.sort_values(['year', 'quarter', 'Geolocation', 'Species'], kind='stable', ignore_index=True)
+        return cls(long)
+
+    def _cached(self, key, compute):
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+        value = compute()
+        with self._lock:
+            self._cache[key] = value
+        return value
+
+    @property
+    def years(self):
+        return sorted(self.long['year'].unique().tolist())
+
+    @property
+    def regions(self):
+        return list(self.long['Geolocation'].cat.categories)
+
+    @property
+    def species(self):
+        return [name for name in self.long['Species'].cat.categories if name not in TOTAL_LABELS]
+
+    def _detail(self):
+        # Rows that are not totals of other rows
+        return self._cached('detail', lambda: self.long[~self.long['Species'].isin(TOTAL_LABELS)])
+
+    def annual(self):
+        # One value per (Geolocation, Species, year): the reported annual figure,
+        # or the sum of the quarters where a file has no annual column
+        def compute():
+            detail = self._detail()
+            reported = detail[detail['quarter'] == ANNUAL]
+            quarters = detail[detail['quarter'] != ANNUAL]
+            summed = quarters.groupby(['Geolocation', 'Species', 'year'], observed=True)['value'].sum()
+            annual = reported.set_index(['Geolocation', 'Species', 'year'])['value']
+            return annual.combine_first(summed).sort_index()
+        return self._cached('annual', compute)
+
+    def annual_totals(self, by='Geolocation'):
+        # Years as columns, one row per region or species
+        return self._cached(('annual_totals', by), lambda: (
+            self.annual().groupby([by, 'year'], observed=True).sum().unstack('year')
+        ))
+
+    def region_totals(self, year=None):
+        totals = self.annual_totals('Geolocation')
+        year = year if year is not None else totals.columns.max()
+        return totals[year].dropna().sort_values(ascending=False)
+
+    def yoy_growth(self, by='Geolocation'):
+        # Percentage change on the previous year
+        def compute():
+            totals = self.annual_totals(by) if by is not None else self.annual().groupby('year').sum().to_frame('All').T
+            # By year label, not position: with no figures for the year before, growth is NaN
+            previous = totals.reindex(columns=[year - 1 for year in totals.columns])
+            previous.columns = totals.columns
+            return (totals - previous) / previous.where(previous != 0) * 100
+        return self._cached(('yoy_growth', by), compute)
+
+    def quarterly(self, species=None, region=None):
+        # Quarterly production summed over the selection, indexed by (year, quarter)
+        def compute():
+            detail = self._detail()
+            rows = detail[detail['quarter'] != ANNUAL]
+            if species is not None:
+                rows = rows[rows['Species'] == species]
+            if region is not None:
+                rows = rows[rows['Geolocation'] == region]
+            return rows.groupby(['year', 'quarter'])['value'].sum()
+        return self._cached(('quarterly', species, region), compute)
+
+    def species_trend(self, species):
+        series = self.quarterly(species=species)
+        return pd.Series(series.to_numpy(), index=[period_label(year, quarter) for year, quarter in series.index])
+
+    def top_species(self, year=None, n=10):
+        totals = self.annual_totals('Species')
+        year = year if year is not None else totals.columns.max()
+        return totals[year].dropna().nlargest(n)
+
+
+def _category(df, col, n):
+    if col in df.columns:
+        return pd.Categorical(df[col].astype(str).where(df[col].notna(), None))
+    return pd.Categorical(np.full(n, 'All', dtype=object))
@@ -0,0 +1,171 @@
+import os
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+from utils.loader import CHUNK_SIZE, NA_VALUES
+from utils.pipelines import REGRESSION_PARAMS, _report, _stage
+from utils.plots import MAX_SCATTER_POINTS
+
+# Out-of-core linear regression. The source file is read in chunks and only
+# running statistics are kept: the means and centred cross-products of
+# [X, y] for the training rows, and the residual sums for the held-out rows.
+# Memory depends on the chunk size and feature count, never on the row count.
+
+
+class Moments:
+    # Means and centred cross-product matrix of the columns of a stream,
+    # merged chunk by chunk with Chan's parallel update
+    def __init__(self, n_columns):
+        self.n = 0
+        self.mean = np.zeros(n_columns)
+        self.comoment = np.zeros((n_columns, n_columns))
+
+    def update(self, values):
+        n_chunk = len(values)
+        if n_chunk == 0:
+            return
+        chunk_mean = values.mean(axis=0)
+        centred = values - chunk_mean
+        chunk_comoment = centred.T @ centred
+
+        n = self.n + n_chunk
+        delta = chunk_mean - self.mean
+        self.comoment += chunk_comoment + np.outer(delta, delta) * (self.n * n_chunk / n)
+        self.mean += delta * (n_chunk / n)
+        self.n = n
+
+    def variance(self, ddof=0):
+        return np.diag(self.comoment) / max(self.n - ddof, 1)
+
+
+class StreamingRegressionMetrics:
+    # The same numbers as pipelines.regression_metrics, accumulated over a stream
+    def __init__(self):
+        self.moments = Moments(2)
+        self.abs_error = 0.0
+
+    def update(self, y, predictions):
+        self.moments.update(np.column_stack([y, predictions]))
+        self.abs_error += float(np.abs(y - predictions).sum())
+
+    def result(self):
+        m = self.moments
+        n = max(m.n, 1)
+        var_y, var_p = m.variance()
+        cov = m.comoment[0, 1] / n
+        mean_error = m.mean[0] - m.mean[1]
+        # E[(y - p)²] = Var(y) + Var(p) - 2 Cov(y, p) + (ȳ - p̄)²
+        mse = max(var_y + var_p - 2 * cov + mean_error ** 2, 0.0)
+        mae = self.abs_error / n
+        rmse = mse ** 0.5
+        return {
+            'mse': mse,
+            'r2': 1 - mse / var_y if var_y > 0 else float('nan'),
+            'mae': mae,
+            'rmse': rmse,
+            'corr_coeff': cov / np.sqrt(var_y * var_p) if var_y > 0 and var_p > 0 else float('nan'),
+            'rae': (mae / m.mean[0]) * 100,
+            'rrse': (rmse / np.sqrt(m.variance(ddof=1)[0])) * 100,
+            'n': m.n,
+        }
+
+
+class PointSample:
+    # Fixed-size uniform sample of a stream of (y, prediction) pairs, for plotting
+    def __init__(self, size=MAX_SCATTER_POINTS, seed=0):
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.keys = np.empty(0)
+        self.y = np.empty(0)
+        self.predictions = np.empty(0)
+
+    def update(self, y, predictions):
+        keys = np.concatenate([self.keys, self.rng.random(len(y))])
+        y = np.concatenate([self.y, y])
+        predictions = np.concatenate([self.predictions, predictions])
+        if len(keys) > self.size:
+            keep = np.argpartition(keys, self.size)[:self.size]
+            keys, y, predictions = keys[keep], y[keep], predictions[keep]
+        self.keys, self.y, self.predictions = keys, y, predictions
+
+
+def iter_chunks(path, columns, chunksize=CHUNK_SIZE):
+    if os.path.splitext(path)[-1].lower() != '.csv':
+        raise ValueError("Streaming regression reads CSV files.")
+
+    total_bytes = max(os.path.getsize(path), 1)
+    with open(path, 'rb') as handle:
+        for chunk in pd.read_csv(handle, chunksize=chunksize, usecols=columns, na_values=NA_VALUES):
+            yield chunk, min(handle.tell() / total_bytes, 1.0)
+
+
+def chunk_values(chunk, columns):
+    non_numeric = [col for col in columns if not pd.api.types.is_numeric_dtype(chunk[col])]
+    if non_numeric:
+        raise ValueError(f"Streaming regression needs numeric columns: {', '.join(non_numeric)}")
+    values = chunk[columns].to_numpy(dtype=np.float64)
+    complete = ~np.isnan(values).any(axis=1)
+    return values[complete], int((~complete).sum())
+
+
+def holdout_mask(n_rows, chunk_number):
+    # Each chunk draws from its own seeded generator, so both passes agree on the held-out rows
+    rng = np.random.default_rng([REGRESSION_PARAMS['random_state'], chunk_number])
+    return rng.random(n_rows) < REGRESSION_PARAMS['test_size']
+
+
+def run_streaming_regression(path, features, target, progress=None, stages=None, chunksize=CHUNK_SIZE):
+    columns = list(features) + [target]
+    n_features = len(features)
+    skipped = 0
+
+    # Pass 1: centred sufficient statistics of the training rows
+    moments = Moments(n_features + 1)
+    with _stage(stages, "fit"):
+        for number, (chunk, fraction) in enumerate(iter_chunks(path, columns, chunksize)):
+            values, dropped = chunk_values(chunk, columns)
+            skipped += dropped
+            train = ~holdout_mask(len(values), number)
+            moments.update(values[train])
+            _report(progress, f"Fitting: {fraction * 100:.0f}% of the file read...")
+
+    if moments.n <= n_features:
+        raise ValueError("Not enough complete rows to fit the regression.")
+
+    # Normal equations on the centred statistics: Sxx β = Sxy, intercept from the means
+    Sxx = moments.comoment[:n_features, :n_features]
+    Sxy = moments.comoment[:n_features, n_features]
+    coef = np.linalg.lstsq(Sxx, Sxy, rcond=None)[0]
+    intercept = moments.mean[n_features] - moments.mean[:n_features] @ coef
+
+    model = LinearRegression()
+    model.coef_ = coef
+    model.intercept_ = intercept
+    model.n_features_in_ = n_features
+
+    # Pass 2: metrics over the held-out rows
+    metrics = StreamingRegressionMetrics()
+    sample = PointSample()
+    with _stage(stages, "metrics"):
+        for number, (chunk, fraction) in enumerate(iter_chunks(path, columns, chunksize)):
+            values, _ = chunk_values(chunk, columns)
+            held_out = values[holdout_mask(len(values), number)]
+            y = held_out[:, n_features]
+            predictions = held_out[:, :n_features] @ coef + intercept
+            metrics.update(y, predictions)
+            sample.update(y, predictions)
+            _report(progress, f"Scoring held-out rows: {fraction * 100:.0f}% of the file read...")
+
+    return {
+        'features': list(features),
+        'target': target,
+        'model': model,
+        'model_params': None,
+        'streamed': True,
+        'n_train': moments.n,
+        'rows_skipped': skipped,
+        # A bounded sample of the held-out points is enough for the plot
+        'y_test': sample.y,
+        'predictions': sample.predictions,
+        **metrics.result(),
+    }